@@ -11,7 +11,6 @@ import queue
 import threading
 import time
 import wave
-import numpy as np
 from pathlib import Path
 from typing import Optional, Callable, Dict, Any, Tuple, List
 import io
@@ -30,6 +29,8 @@ except ImportError:
 
 from .errors import AudioError, MicrophoneError, SpeakerError, InitializationError
 from .logging_cfg import PerformanceTimer
+from .vad import SpeechSegmenter
+from .audio_frame import AudioFrame
 
 
 class AudioDevice:
@@ -113,6 +114,7 @@ class AudioStream:
                     channels=self.channels,
                     samplerate=self.sample_rate,
                     blocksize=self.chunk_size,
+                    dtype='int16',
                     callback=self._sounddevice_callback
                 )
                 self.stream.start()
@@ -162,36 +164,32 @@ class AudioStream:
             self.logger.warning(f"Audio callback status: {status}")
         
         if self.is_streaming:
-            try:
-                self.audio_queue.put(in_data, block=False)
-            except queue.Full:
-                # Drop oldest frame if buffer is full
-                try:
-                    self.audio_queue.get_nowait()
-                    self.audio_queue.put(in_data, block=False)
-                except:
-                    pass
+            self._enqueue(AudioFrame.from_bytes(in_data, self.sample_rate, self.channels, time.time()))
         
         return (in_data, pyaudio.paContinue)
     
-    def _sounddevice_callback(self, indata, frames, time, status):
+    def _sounddevice_callback(self, indata, frames, time_info, status):
         """SoundDevice callback for audio input."""
         if status:
             self.logger.warning(f"Audio callback status: {status}")
         
         if self.is_streaming:
+            # sounddevice reuses indata after the callback returns
+            samples = indata.reshape(-1).copy()
+            self._enqueue(AudioFrame(samples, self.sample_rate, self.channels, time.time()))
+    
+    def _enqueue(self, frame: AudioFrame) -> None:
+        """Queue a captured frame, dropping the oldest one if the buffer is full."""
+        try:
+            self.audio_queue.put(frame, block=False)
+        except queue.Full:
             try:
-                audio_bytes = indata.tobytes()
-                self.audio_queue.put(audio_bytes, block=False)
-            except queue.Full:
-                # Drop oldest frame if buffer is full
-                try:
-                    self.audio_queue.get_nowait()
-                    self.audio_queue.put(audio_bytes, block=False)
-                except:
-                    pass
+                self.audio_queue.get_nowait()
+                self.audio_queue.put(frame, block=False)
+            except (queue.Empty, queue.Full):
+                pass
     
-    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+    def read(self, timeout: Optional[float] = None) -> Optional[AudioFrame]:
         """
         Read audio data from the stream.
         
@@ -199,7 +197,7 @@ class AudioStream:
             timeout: Optional timeout in seconds
             
         Returns:
-            Audio data bytes or None if timeout
+            Captured AudioFrame or None if timeout
         """
         try:
             return self.audio_queue.get(timeout=timeout)
@@ -245,6 +243,20 @@ class AudioManager:
         self.volume_threshold = config.audio.volume_threshold
         self.silence_timeout = config.audio.silence_timeout
         
+        # Voice activity trimming before STT
+        self.vad_trim_enabled = config.audio.vad_trim_enabled
+        self.segmenter = SpeechSegmenter(
+            sample_rate=self.sample_rate,
+            aggressiveness=config.audio.vad_aggressiveness,
+            frame_ms=config.audio.vad_frame_ms,
+            padding_ms=config.audio.vad_padding_ms,
+            min_speech_ms=config.audio.vad_min_speech_ms,
+            split_pause_ms=config.audio.vad_split_pause_ms,
+            max_segment_seconds=config.audio.vad_max_segment_seconds,
+            volume_threshold=self.volume_threshold
+        )
+        self.last_capture_vad_flags: List[bool] = []
+        
         # Mock mode for testing
         self.mock_mode = config.audio.mock_mode
         
@@ -422,12 +434,12 @@ class AudioManager:
             if not output_valid:
                 raise SpeakerError(f"Invalid output device index: {self.output_device_index}")
     
-    def set_audio_callback(self, callback: Callable[[bytes], None]) -> None:
+    def set_audio_callback(self, callback: Callable[[AudioFrame], None]) -> None:
         """
         Set callback for audio data.
         
         Args:
-            callback: Function to call with audio data chunks
+            callback: Function to call with each captured AudioFrame
         """
         self.audio_callback = callback
     
@@ -470,51 +482,49 @@ class AudioManager:
         while self.audio_stream and self.audio_stream.is_streaming:
             try:
                 # Read audio data
-                audio_data = self.audio_stream.read(timeout=0.1)
-                if audio_data:
+                frame = self.audio_stream.read(timeout=0.1)
+                if frame is not None and len(frame):
                     # Apply audio processing if enabled
                     if self.noise_suppression or self.echo_cancellation:
-                        audio_data = self._process_audio(audio_data)
+                        frame = self._process_audio(frame)
                     
                     # Send to callback if set
                     if self.audio_callback:
-                        self.audio_callback(audio_data)
+                        self.audio_callback(frame)
                     
                     # Store in recording buffer if recording
                     if self.is_recording:
-                        self.recording_buffer.append(audio_data)
+                        self.recording_buffer.append(frame)
+                        
+                        # Classify VAD frames while capturing so trimming is free later
+                        if self.vad_trim_enabled and self.channels == 1:
+                            self.segmenter.feed(frame)
                         
             except Exception as e:
                 self.logger.error(f"Error in audio processing loop: {e}")
     
-    def _process_audio(self, audio_data: bytes) -> bytes:
+    def _process_audio(self, frame: AudioFrame) -> AudioFrame:
         """
         Apply audio processing (noise suppression, echo cancellation).
         
         Args:
-            audio_data: Raw audio bytes
+            frame: Captured audio frame
             
         Returns:
-            Processed audio bytes
+            Processed audio frame
         """
-        # Convert to numpy array
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        
         # Simple noise gate
-        if self.noise_suppression:
-            # Calculate RMS
-            rms = np.sqrt(np.mean(audio_array ** 2))
-            if rms < self.volume_threshold * 32768:  # Scale threshold to int16 range
-                # Below threshold, reduce to near silence
-                audio_array = audio_array * 0.1
+        if self.noise_suppression and frame.rms < self.volume_threshold:
+            # Below threshold, reduce to near silence
+            frame = frame.scaled(0.1)
         
         # TODO: Implement more sophisticated noise suppression and echo cancellation
         # For now, this is a placeholder
         
-        return audio_array.tobytes()
+        return frame
     
     async def record_speech(self, timeout: float = 5.0, 
-                          silence_duration: float = 2.0) -> Optional[bytes]:
+                          silence_duration: float = 2.0) -> Optional[AudioFrame]:
         """
         Record speech until silence is detected.
         
@@ -523,15 +533,16 @@ class AudioManager:
             silence_duration: Duration of silence to stop recording
             
         Returns:
-            Recorded audio data or None if no speech detected
+            Recorded audio or None if no speech detected
         """
         if self.mock_mode:
             # Return mock audio data for testing
             await asyncio.sleep(2)
-            return b"mock_audio_data"
+            return AudioFrame.silence(1.0, self.sample_rate, self.channels)
         
         self.logger.info("Starting speech recording...")
         self.recording_buffer = []
+        self.segmenter.start_capture()
         self.is_recording = True
         
         start_time = time.time()
@@ -542,11 +553,7 @@ class AudioManager:
             while time.time() - start_time < timeout:
                 if self.recording_buffer:
                     # Check latest audio chunk for speech
-                    latest_audio = self.recording_buffer[-1]
-                    audio_array = np.frombuffer(latest_audio, dtype=np.int16)
-                    rms = np.sqrt(np.mean(audio_array ** 2))
-                    
-                    if rms > self.volume_threshold * 32768:
+                    if self.recording_buffer[-1].rms > self.volume_threshold:
                         last_speech_time = time.time()
                         speech_detected = True
                     elif speech_detected and time.time() - last_speech_time > silence_duration:
@@ -562,10 +569,11 @@ class AudioManager:
                 return None
             
             # Combine all audio chunks
-            audio_data = b''.join(self.recording_buffer)
-            self.logger.info(f"Recorded {len(audio_data)} bytes of audio")
+            recording = AudioFrame.concatenate(self.recording_buffer)
+            self.last_capture_vad_flags = self.segmenter.capture_flags
+            self.logger.info(f"Recorded {recording.duration:.2f}s of audio")
             
-            return audio_data
+            return recording
             
         except Exception as e:
             self.is_recording = False
@@ -573,12 +581,39 @@ class AudioManager:
         finally:
             self.recording_buffer = []
     
-    async def play_audio(self, audio_data: bytes) -> None:
+    def segment_speech(self, recording: AudioFrame) -> List[AudioFrame]:
+        """
+        Trim non-speech from a recording and split it at pauses.
+        
+        Uses the VAD flags computed while the audio was captured when they
+        are available.
+        
+        Args:
+            recording: Recorded audio
+            
+        Returns:
+            Speech segments to transcribe, empty if there is no speech
+        """
+        if self.mock_mode or not self.vad_trim_enabled or recording.channels != 1:
+            return [recording] if len(recording) else []
+        
+        with PerformanceTimer("vad_segmentation", self.logger):
+            segments = self.segmenter.segment(recording, self.last_capture_vad_flags)
+        
+        self.last_capture_vad_flags = []
+        self.logger.info(
+            f"Kept {len(segments)} speech segment(s), trimmed "
+            f"{self.segmenter.last_trimmed_seconds:.2f}s of non-speech"
+        )
+        
+        return segments
+    
+    async def play_audio(self, frame: AudioFrame) -> None:
         """
         Play audio data.
         
         Args:
-            audio_data: Audio data to play
+            frame: Audio to play; resampled if its rate differs from the output rate
         """
         if self.mock_mode:
             self.logger.info("Mock mode: simulating audio playback")
@@ -587,38 +622,43 @@ class AudioManager:
         
         try:
             with PerformanceTimer("audio_playback", self.logger):
-                if PYAUDIO_AVAILABLE:
-                    pa = pyaudio.PyAudio()
-                    stream = pa.open(
-                        format=pyaudio.paInt16,
-                        channels=self.channels,
-                        rate=self.sample_rate,
-                        output=True,
-                        output_device_index=self.output_device_index
-                    )
-                    
-                    # Play audio in chunks
-                    chunk_size = self.chunk_size * 2  # bytes
-                    for i in range(0, len(audio_data), chunk_size):
-                        chunk = audio_data[i:i + chunk_size]
-                        stream.write(chunk)
-                    
-                    stream.stop_stream()
-                    stream.close()
-                    pa.terminate()
-                    
-                elif SOUNDDEVICE_AVAILABLE:
-                    # Convert bytes to numpy array
-                    audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                    audio_float = audio_array.astype(np.float32) / 32768.0
-                    
-                    # Play using sounddevice
-                    sd.play(audio_float, self.sample_rate, device=self.output_device_index)
-                    sd.wait()  # Wait until playback is finished
+                # Blocking device writes run off the event loop so other
+                # work (e.g. synthesizing the next sentence) can proceed
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._play_blocking, frame.resampled(self.sample_rate))
                     
         except Exception as e:
             raise SpeakerError(f"Audio playback failed: {e}")
     
+    def _play_blocking(self, frame: AudioFrame) -> None:
+        """Write a frame to the output device and wait for it to finish."""
+        if PYAUDIO_AVAILABLE:
+            audio_data = frame.to_bytes()
+            pa = pyaudio.PyAudio()
+            stream = pa.open(
+                format=pyaudio.paInt16,
+                channels=frame.channels,
+                rate=self.sample_rate,
+                output=True,
+                output_device_index=self.output_device_index
+            )
+            
+            # Play audio in chunks
+            chunk_size = self.chunk_size * 2 * frame.channels  # bytes
+            for i in range(0, len(audio_data), chunk_size):
+                chunk = audio_data[i:i + chunk_size]
+                stream.write(chunk)
+            
+            stream.stop_stream()
+            stream.close()
+            pa.terminate()
+            
+        elif SOUNDDEVICE_AVAILABLE:
+            # sounddevice takes int16 samples directly
+            samples = frame.samples.reshape(-1, frame.channels)
+            sd.play(samples, frame.sample_rate, device=self.output_device_index)
+            sd.wait()  # Wait until playback is finished
+    
     async def play_wav_file(self, file_path: str) -> None:
         """
         Play a WAV file.
@@ -638,31 +678,27 @@ class AudioManager:
                 if sample_width != 2:  # Not 16-bit
                     raise AudioError("Only 16-bit WAV files are supported")
                 
-                if channels != self.channels or framerate != self.sample_rate:
+                if channels != self.channels:
                     self.logger.warning(
-                        f"WAV file format mismatch: {channels}ch @ {framerate}Hz "
-                        f"(expected {self.channels}ch @ {self.sample_rate}Hz)"
+                        f"WAV file channel mismatch: {channels}ch (expected {self.channels}ch)"
                     )
                 
-                await self.play_audio(frames)
+                # Sample rate differences are handled by play_audio
+                await self.play_audio(AudioFrame.from_bytes(frames, framerate, channels))
                 
         except Exception as e:
             raise AudioError(f"Failed to play WAV file: {e}")
     
-    def save_audio(self, audio_data: bytes, file_path: str) -> None:
+    def save_audio(self, frame: AudioFrame, file_path: str) -> None:
         """
         Save audio data to a WAV file.
         
         Args:
-            audio_data: Audio data to save
+            frame: Audio to save
             file_path: Path to save the WAV file
         """
         try:
-            with wave.open(file_path, 'wb') as wav_file:
-                wav_file.setnchannels(self.channels)
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_data)
+            frame.write_wav(file_path)
             
             self.logger.info(f"Audio saved to {file_path}")
             
@@ -699,7 +735,8 @@ class AudioManager:
                 'sample_rate': output_device.sample_rate if output_device else 0
             } if output_device else None,
             'available_input_devices': len(self.input_devices),
-            'available_output_devices': len(self.output_devices)
+            'available_output_devices': len(self.output_devices),
+            'speech_segmentation': self.segmenter.get_statistics()
         }
     
     async def health_check(self) -> bool:
@@ -0,0 +1,374 @@
+"""
+Athina Audio Post-Processing
+
+Streaming DSP stages for synthesized speech: WSOLA time-stretching,
+pitch shifting and a gain stage with a peak limiter. Every stage keeps
+its own state between ``process`` calls, so audio can be fed in blocks
+with bounded latency, and all per-sample work is vectorized in NumPy.
+"""
+
+import logging
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+
+class WSOLATimeStretcher:
+    """
+    Waveform-similarity overlap-add time stretcher.
+
+    Changes tempo without changing pitch. Analysis frames are taken every
+    ``hop * rate`` input samples, nudged within a small tolerance to the
+    position that best continues the previous frame, and overlap-added
+    with a Hann window every ``hop`` output samples.
+    """
+
+    def __init__(self, sample_rate: int, rate: float, frame_ms: float = 20.0,
+                 tolerance_ms: float = 5.0):
+        """
+        Initialize WSOLATimeStretcher.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            rate: Tempo factor (> 1 speeds up, < 1 slows down)
+            frame_ms: Analysis frame length in milliseconds
+            tolerance_ms: Maximum shift of an analysis frame when searching for similarity
+        """
+        self.rate = rate
+        self.frame_size = 2 * max(16, int(sample_rate * frame_ms / 2000))
+        self.hop = self.frame_size // 2
+        self.tolerance = max(1, int(sample_rate * tolerance_ms / 1000))
+        self.window = np.hanning(self.frame_size + 1)[:-1].astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear stream state."""
+        # Leading zeros let the first real frame start at full weight;
+        # the output they produce is discarded
+        self._buffer = np.zeros(self.hop, dtype=np.float32)
+        self._offset = 0  # Absolute index of _buffer[0]
+        self._frames = 0
+        self._prev_pos: Optional[int] = None
+        self._tail = np.zeros(self.hop, dtype=np.float32)
+        self._discard = self.hop
+        self._total_in = 0
+        self._total_out = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Stretch the next block of audio.
+
+        Args:
+            samples: Float32 mono samples
+
+        Returns:
+            Stretched samples available so far
+        """
+        self._buffer = np.concatenate([self._buffer, samples.astype(np.float32, copy=False)])
+        self._total_in += len(samples)
+        return self._emit(self._run())
+
+    def flush(self) -> np.ndarray:
+        """Drain buffered audio at the end of a stream."""
+        self._buffer = np.concatenate([self._buffer, np.zeros(self.frame_size + self.tolerance, dtype=np.float32)])
+        output = self._emit(np.concatenate([self._run(), self._tail]))
+
+        # Trim the zero padding so the stream has its exact stretched length
+        excess = self._total_out - int(round(self._total_in / self.rate))
+        if excess > 0:
+            output = output[:max(0, len(output) - excess)]
+
+        self.reset()
+        return output
+
+    def _emit(self, output: np.ndarray) -> np.ndarray:
+        """Drop the start-up output and count what is returned."""
+        if self._discard:
+            dropped = min(self._discard, len(output))
+            output = output[dropped:]
+            self._discard -= dropped
+        self._total_out += len(output)
+        return output
+
+    def _run(self) -> np.ndarray:
+        """Overlap-add every frame that the buffered input allows."""
+        blocks = []
+        n = self.frame_size
+
+        while True:
+            ideal = int(round(self._frames * self.hop * self.rate))
+            if self._prev_pos is None:
+                needed = ideal + n
+            else:
+                needed = max(ideal + self.tolerance, self._prev_pos + self.hop) + n
+            if needed - self._offset > len(self._buffer):
+                break
+
+            if self._prev_pos is None:
+                pos = ideal
+            else:
+                # Natural continuation of the previous frame
+                natural_start = self._prev_pos + self.hop - self._offset
+                natural = self._buffer[natural_start:natural_start + n]
+
+                lo = max(self._offset, ideal - self.tolerance)
+                hi = ideal + self.tolerance
+                region = self._buffer[lo - self._offset:hi - self._offset + n]
+                similarity = np.correlate(region, natural, mode='valid')
+                pos = lo + int(np.argmax(similarity))
+
+            frame = self._buffer[pos - self._offset:pos - self._offset + n] * self.window
+            frame[:self.hop] += self._tail
+            blocks.append(frame[:self.hop])
+            self._tail = frame[self.hop:].copy()
+
+            self._prev_pos = pos
+            self._frames += 1
+
+        # Forget input that no future frame can reach
+        if self._prev_pos is not None:
+            next_ideal = int(round(self._frames * self.hop * self.rate))
+            keep_from = min(self._prev_pos + self.hop, next_ideal - self.tolerance)
+            drop = max(0, keep_from - self._offset)
+            if drop:
+                self._buffer = self._buffer[drop:]
+                self._offset += drop
+
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
+
+class StreamingResampler:
+    """Linear-interpolation resampler that keeps its phase across blocks."""
+
+    def __init__(self, ratio: float):
+        """
+        Initialize StreamingResampler.
+
+        Args:
+            ratio: Output length divided by input length
+        """
+        self.step = 1.0 / ratio
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear stream state."""
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._pos = 0.0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next block of audio.
+
+        Args:
+            samples: Float32 mono samples
+
+        Returns:
+            Resampled samples
+        """
+        x = np.concatenate([self._carry, samples])
+        last = len(x) - 1
+        if last < self._pos:
+            self._carry = x
+            return np.zeros(0, dtype=np.float32)
+
+        count = int((last - self._pos) / self.step) + 1
+        positions = self._pos + np.arange(count) * self.step
+        output = np.interp(positions, np.arange(len(x)), x).astype(np.float32)
+
+        # Re-base the next position onto the carried last sample
+        self._pos = positions[-1] + self.step - last
+        self._carry = x[-1:]
+        return output
+
+
+class GainLimiter:
+    """
+    Gain stage followed by a block-wise peak limiter.
+
+    Gain reduction is applied to the whole block as soon as it would
+    exceed the threshold and released gradually afterwards, ramped
+    across each block to avoid zipper noise.
+    """
+
+    def __init__(self, sample_rate: int, gain: float = 1.0, threshold: float = 0.95,
+                 release_ms: float = 150.0):
+        """
+        Initialize GainLimiter.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            gain: Linear gain
+            threshold: Peak level (full scale = 1.0) the output is limited to
+            release_ms: Time constant for recovering from gain reduction
+        """
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.threshold = threshold
+        self.release_samples = max(1.0, sample_rate * release_ms / 1000)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear stream state."""
+        self._reduction = 1.0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Apply gain and limiting to the next block.
+
+        Args:
+            samples: Float32 mono samples
+
+        Returns:
+            Processed samples, never exceeding full scale
+        """
+        if len(samples) == 0:
+            return samples
+
+        output = samples * self.gain
+        peak = float(np.max(np.abs(output)))
+        target = min(1.0, self.threshold / peak) if peak > 0 else 1.0
+
+        if target < self._reduction:
+            # Attack: the whole block is reduced, so no sample overshoots
+            output *= target
+            self._reduction = target
+        else:
+            release = 1.0 - np.exp(-len(samples) / self.release_samples)
+            reduction = self._reduction + (target - self._reduction) * release
+            output *= np.linspace(self._reduction, reduction, len(samples), dtype=np.float32)
+            self._reduction = reduction
+
+        return np.clip(output, -1.0, 1.0)
+
+
+class SpeechPostProcessor:
+    """
+    Speed, pitch and volume chain for synthesized speech.
+
+    Speed and pitch share one WSOLA stretch followed by a resample:
+    shifting pitch by a factor p stretches by ``p / speed`` and then
+    resamples by ``1 / p``. Stages that would have no effect are
+    skipped, and with none active the audio is passed through untouched.
+    """
+
+    def __init__(self, sample_rate: int, speed: float = 1.0, semitones: float = 0.0,
+                 gain: float = 1.0, block_size: int = 2048):
+        """
+        Initialize SpeechPostProcessor.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            speed: Tempo factor (> 1 is faster)
+            semitones: Pitch shift in semitones
+            gain: Linear output gain
+            block_size: Samples processed per block, bounding per-block latency
+        """
+        self.logger = logging.getLogger(__name__)
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+
+        pitch_factor = 2.0 ** (semitones / 12.0)
+        stretch_rate = speed / pitch_factor
+
+        self.stretcher = (WSOLATimeStretcher(sample_rate, stretch_rate)
+                          if abs(stretch_rate - 1.0) > 1e-3 else None)
+        self.resampler = (StreamingResampler(1.0 / pitch_factor)
+                          if abs(pitch_factor - 1.0) > 1e-3 else None)
+        self.limiter = GainLimiter(sample_rate, gain) if abs(gain - 1.0) > 1e-3 else None
+
+        self.total_blocks = 0
+
+    @property
+    def is_passthrough(self) -> bool:
+        """Whether the chain leaves audio unchanged."""
+        return self.stretcher is None and self.resampler is None and self.limiter is None
+
+    def reset(self) -> None:
+        """Clear the state of every stage."""
+        for stage in (self.stretcher, self.resampler, self.limiter):
+            if stage is not None:
+                stage.reset()
+
+    def process(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Process the next chunk of 16-bit audio.
+
+        Args:
+            audio_data: Int16 mono samples
+
+        Returns:
+            Processed int16 samples available so far
+        """
+        if self.is_passthrough:
+            return audio_data
+
+        samples = audio_data.astype(np.float32) / 32768.0
+        blocks = [
+            self._process_block(samples[i:i + self.block_size])
+            for i in range(0, len(samples), self.block_size)
+        ]
+        return self._to_int16(blocks)
+
+    def flush(self) -> np.ndarray:
+        """
+        Drain buffered audio at the end of an utterance.
+
+        Returns:
+            Remaining int16 samples
+        """
+        if self.is_passthrough:
+            return np.zeros(0, dtype=np.int16)
+
+        tail = self.stretcher.flush() if self.stretcher is not None else np.zeros(0, dtype=np.float32)
+        if self.resampler is not None:
+            tail = self.resampler.process(tail)
+            self.resampler.reset()
+        if self.limiter is not None:
+            tail = self.limiter.process(tail)
+            self.limiter.reset()
+        return self._to_int16([tail])
+
+    def process_utterance(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Process a complete utterance from a clean state.
+
+        Args:
+            audio_data: Int16 mono samples
+
+        Returns:
+            Processed int16 samples
+        """
+        if self.is_passthrough:
+            return audio_data
+
+        self.reset()
+        return np.concatenate([self.process(audio_data), self.flush()])
+
+    def _process_block(self, block: np.ndarray) -> np.ndarray:
+        """Run one block through the active stages."""
+        self.total_blocks += 1
+        if self.stretcher is not None:
+            block = self.stretcher.process(block)
+        if self.resampler is not None:
+            block = self.resampler.process(block)
+        if self.limiter is not None:
+            block = self.limiter.process(block)
+        return block
+
+    @staticmethod
+    def _to_int16(blocks) -> np.ndarray:
+        """Join float blocks and convert to int16."""
+        if not blocks:
+            return np.zeros(0, dtype=np.int16)
+        samples = np.concatenate(blocks)
+        return (np.clip(samples, -1.0, 32767 / 32768) * 32768).astype(np.int16)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get post-processing statistics."""
+        return {
+            'passthrough': self.is_passthrough,
+            'time_stretch_rate': self.stretcher.rate if self.stretcher else 1.0,
+            'pitch_resample_step': self.resampler.step if self.resampler else 1.0,
+            'gain': self.limiter.gain if self.limiter else 1.0,
+            'total_blocks': self.total_blocks
+        }
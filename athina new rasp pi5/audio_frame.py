@@ -0,0 +1,227 @@
+"""
+Athina Audio Frames
+
+A small typed container for 16-bit PCM audio that carries its sample
+rate, channel count and capture timestamp with the samples. Components
+pass frames to each other and convert to bytes or floats only where a
+library requires it.
+"""
+
+import io
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Optional, Iterable
+
+import numpy as np
+
+
+@dataclass
+class AudioFrame:
+    """
+    Block of interleaved 16-bit PCM audio.
+
+    ``samples`` is a 1-D int16 array (interleaved when ``channels`` > 1).
+    Frames built from bytes share the underlying buffer, and slicing
+    returns views, so passing frames around does not copy audio.
+    """
+    samples: np.ndarray
+    sample_rate: int
+    channels: int = 1
+    timestamp: float = 0.0  # time.time() when the first sample was captured or produced
+    _rms: Optional[float] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, sample_rate: int, channels: int = 1,
+                   timestamp: Optional[float] = None) -> 'AudioFrame':
+        """
+        Wrap 16-bit PCM bytes without copying.
+
+        Args:
+            data: Raw little-endian 16-bit PCM
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+            timestamp: Capture time; defaults to now
+
+        Returns:
+            AudioFrame viewing ``data``
+        """
+        usable = len(data) - (len(data) % 2)
+        return cls(
+            samples=np.frombuffer(data, dtype=np.int16, count=usable // 2),
+            sample_rate=sample_rate,
+            channels=channels,
+            timestamp=time.time() if timestamp is None else timestamp
+        )
+
+    @classmethod
+    def from_wav_bytes(cls, data: bytes, timestamp: Optional[float] = None) -> 'AudioFrame':
+        """
+        Decode an in-memory 16-bit WAV file.
+
+        Args:
+            data: Complete RIFF/WAV file contents
+            timestamp: Optional timestamp for the frame
+
+        Returns:
+            AudioFrame with the file's rate and channel count
+        """
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ValueError("Only 16-bit WAV audio is supported")
+            return cls.from_bytes(
+                wav_file.readframes(wav_file.getnframes()),
+                wav_file.getframerate(),
+                wav_file.getnchannels(),
+                timestamp
+            )
+
+    @classmethod
+    def from_float(cls, samples: np.ndarray, sample_rate: int, channels: int = 1,
+                   timestamp: Optional[float] = None) -> 'AudioFrame':
+        """
+        Build a frame from float samples in [-1, 1].
+
+        Args:
+            samples: Float samples (interleaved when multi-channel)
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+            timestamp: Capture time; defaults to now
+
+        Returns:
+            AudioFrame with clipped int16 samples
+        """
+        scaled = np.clip(np.asarray(samples, dtype=np.float32).reshape(-1), -1.0, 32767 / 32768) * 32768
+        return cls(
+            samples=scaled.astype(np.int16),
+            sample_rate=sample_rate,
+            channels=channels,
+            timestamp=time.time() if timestamp is None else timestamp
+        )
+
+    @classmethod
+    def silence(cls, seconds: float, sample_rate: int, channels: int = 1) -> 'AudioFrame':
+        """Frame of digital silence."""
+        return cls(np.zeros(int(seconds * sample_rate) * channels, dtype=np.int16), sample_rate, channels)
+
+    @classmethod
+    def concatenate(cls, frames: Iterable['AudioFrame']) -> 'AudioFrame':
+        """
+        Join frames of the same format into one.
+
+        Args:
+            frames: Frames in order
+
+        Returns:
+            Single frame timestamped with the first frame
+
+        Raises:
+            ValueError: If the frames are empty or their formats differ
+        """
+        frames = list(frames)
+        if not frames:
+            raise ValueError("Cannot concatenate an empty list of frames")
+
+        first = frames[0]
+        if any(f.sample_rate != first.sample_rate or f.channels != first.channels for f in frames):
+            raise ValueError("Cannot concatenate frames with different formats")
+
+        if len(frames) == 1:
+            return first
+
+        return cls(np.concatenate([f.samples for f in frames]), first.sample_rate, first.channels, first.timestamp)
+
+    def __len__(self) -> int:
+        """Number of samples per channel."""
+        return len(self.samples) // self.channels
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return len(self) / float(self.sample_rate) if self.sample_rate else 0.0
+
+    @property
+    def rms(self) -> float:
+        """Root-mean-square level, normalized to full scale (0-1)."""
+        if self._rms is None:
+            if len(self.samples) == 0:
+                self._rms = 0.0
+            else:
+                values = self.samples.astype(np.float32)
+                self._rms = float(np.sqrt(np.mean(values * values))) / 32768.0
+        return self._rms
+
+    def slice(self, start: int, end: Optional[int] = None) -> 'AudioFrame':
+        """
+        View a range of samples (per channel).
+
+        Args:
+            start: First sample index
+            end: End sample index (exclusive); defaults to the end
+
+        Returns:
+            AudioFrame sharing this frame's buffer
+        """
+        end = len(self) if end is None else min(end, len(self))
+        return AudioFrame(
+            self.samples[start * self.channels:end * self.channels],
+            self.sample_rate,
+            self.channels,
+            self.timestamp + start / float(self.sample_rate)
+        )
+
+    def with_samples(self, samples: np.ndarray) -> 'AudioFrame':
+        """New frame with the same format and timestamp but different samples."""
+        return AudioFrame(samples, self.sample_rate, self.channels, self.timestamp)
+
+    def scaled(self, gain: float) -> 'AudioFrame':
+        """Frame with a linear gain applied (clipped to int16)."""
+        values = self.samples.astype(np.float32) * gain
+        return self.with_samples(np.clip(values, -32768, 32767).astype(np.int16))
+
+    def to_mono(self) -> 'AudioFrame':
+        """Average interleaved channels down to mono."""
+        if self.channels == 1:
+            return self
+        mixed = self.samples.reshape(-1, self.channels).astype(np.float32).mean(axis=1)
+        return AudioFrame(mixed.astype(np.int16), self.sample_rate, 1, self.timestamp)
+
+    def resampled(self, sample_rate: int) -> 'AudioFrame':
+        """
+        Linearly resample to another rate.
+
+        Args:
+            sample_rate: Target sample rate in Hz
+
+        Returns:
+            This frame if the rate already matches, otherwise a new frame
+        """
+        if sample_rate == self.sample_rate or len(self.samples) == 0:
+            return self
+
+        mono = self.to_mono()
+        target_length = int(len(mono) * sample_rate / mono.sample_rate)
+        positions = np.linspace(0, len(mono) - 1, target_length)
+        resampled = np.interp(positions, np.arange(len(mono)), mono.samples)
+        return AudioFrame(resampled.astype(np.int16), sample_rate, 1, self.timestamp)
+
+    def to_bytes(self) -> bytes:
+        """Raw 16-bit PCM bytes (for byte-oriented libraries and devices)."""
+        return self.samples.tobytes()
+
+    def to_float32(self) -> np.ndarray:
+        """Float32 samples in [-1, 1] (for float-oriented libraries)."""
+        return self.samples.astype(np.float32) / 32768.0
+
+    def write_wav(self, file_obj) -> None:
+        """
+        Write the frame as a 16-bit WAV file.
+
+        Args:
+            file_obj: Path or writable binary file object
+        """
+        with wave.open(file_obj, 'wb') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(self.samples.tobytes())
@@ -0,0 +1,222 @@
+"""
+Athina Command Spotting
+
+Small-vocabulary recognizer that runs on a captured utterance before
+speech-to-text. Each command is an openWakeWord keyword model sharing the
+wake word feature front-end; a confident hit is dispatched straight to the
+matching skill and full Whisper transcription is skipped.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .errors import InitializationError
+from .logging_cfg import PerformanceTimer, STARTUP_PROFILER
+from .lazy_imports import is_available, load
+from .audio_frame import AudioFrame
+
+OPENWAKEWORD_AVAILABLE = is_available('openwakeword')
+
+# openWakeWord processes audio in 80 ms frames at 16 kHz
+OWW_SAMPLE_RATE = 16000
+OWW_FRAME_SAMPLES = 1280
+
+
+@dataclass
+class CommandHit:
+    """A confidently spotted command."""
+    command: str
+    skill: str
+    utterance: str
+    confidence: float
+    spot_time: float
+
+
+class CommandSpotter:
+    """
+    Keyword-head command spotter on the openWakeWord feature front-end.
+
+    Scores an utterance against every configured command model and
+    reports a hit only when the best command is above the threshold and
+    clearly ahead of the runner-up.
+    """
+
+    def __init__(self, config):
+        """
+        Initialize CommandSpotter.
+
+        Args:
+            config: Configuration object with command spotting settings
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+
+        # Spotting configuration
+        self.enabled = config.command_spotting.enabled
+        self.threshold = config.command_spotting.threshold
+        self.margin = config.command_spotting.margin
+        self.commands = config.command_spotting.commands
+        self.inference_framework = config.wake_word.inference_framework
+        self.models_dir = Path(config.system.model_cache_dir) / "commands"
+
+        # State
+        self.model = None
+        self.model_commands: Dict[str, str] = {}  # openWakeWord model key -> command
+        self.is_initialized = False
+
+        # Statistics
+        self.total_attempts = 0
+        self.total_hits = 0
+        self.hits_per_command: Dict[str, int] = {}
+        self.average_spot_time = 0.0
+        self.total_latency_saved = 0.0
+
+    async def initialize(self) -> None:
+        """Load the command keyword models."""
+        if self.is_initialized or not self.enabled:
+            return
+
+        try:
+            if not OPENWAKEWORD_AVAILABLE:
+                raise InitializationError(
+                    "openWakeWord not available. Install with: pip install openwakeword"
+                )
+
+            model_paths = []
+            for command, spec in self.commands.items():
+                missing = [key for key in ('skill', 'utterance')
+                           if not isinstance(spec, dict) or not isinstance(spec.get(key), str) or not spec[key]]
+                if missing:
+                    self.logger.warning(f"Command '{command}' has no {' or '.join(missing)}, skipping")
+                    continue
+
+                model_path = Path(spec.get('model_path') or self.models_dir / f"{command}.onnx")
+                if not model_path.exists():
+                    self.logger.warning(f"Command model not found, skipping '{command}': {model_path}")
+                    continue
+
+                model_paths.append(str(model_path))
+                self.model_commands[model_path.stem] = command
+
+            if not model_paths:
+                self.logger.warning("No command models available, command spotting disabled")
+                self.enabled = False
+                return
+
+            Model = load('openwakeword.model', 'command_spotting').Model
+            with STARTUP_PROFILER.measure('command_spotting', 'load model'):
+                self.model = Model(
+                    wakeword_models=model_paths,
+                    inference_framework=self.inference_framework
+                )
+
+            self.is_initialized = True
+            self.logger.info(f"Command spotter loaded {len(model_paths)} command models")
+
+        except Exception as e:
+            self.logger.warning(f"Command spotting unavailable: {e}")
+            self.enabled = False
+
+    async def spot(self, utterance: AudioFrame) -> Optional[CommandHit]:
+        """
+        Score an utterance against the command vocabulary.
+
+        Inference runs in the default executor, keeping the event loop free.
+
+        Args:
+            utterance: Captured mono speech (resampled to 16 kHz if needed)
+
+        Returns:
+            CommandHit if a command was spotted confidently, None otherwise
+        """
+        if not self.is_initialized or utterance is None or not len(utterance):
+            return None
+
+        start_time = time.perf_counter()
+        self.total_attempts += 1
+
+        try:
+            with PerformanceTimer("command_spotting", self.logger):
+                loop = asyncio.get_running_loop()
+                scores = await loop.run_in_executor(None, self._score, utterance)
+        except Exception as e:
+            self.logger.error(f"Command spotting failed: {e}")
+            return None
+
+        spot_time = time.perf_counter() - start_time
+        self.average_spot_time += (spot_time - self.average_spot_time) / self.total_attempts
+
+        if not scores:
+            return None
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        command, confidence = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        if confidence < self.threshold or confidence - runner_up < self.margin:
+            self.logger.debug(f"No confident command (best '{command}' at {confidence:.3f})")
+            return None
+
+        spec = self.commands[command]
+        return CommandHit(
+            command=command,
+            skill=spec['skill'],
+            utterance=spec['utterance'],
+            confidence=confidence,
+            spot_time=spot_time
+        )
+
+    def _score(self, utterance: AudioFrame) -> Dict[str, float]:
+        """Run all command heads over the utterance and keep each peak score."""
+        samples = utterance.resampled(OWW_SAMPLE_RATE).samples
+        self.model.reset()
+
+        peaks: Dict[str, float] = {}
+        for i in range(0, len(samples) - OWW_FRAME_SAMPLES + 1, OWW_FRAME_SAMPLES):
+            predictions = self.model.predict(samples[i:i + OWW_FRAME_SAMPLES])
+            for key, score in predictions.items():
+                command = self.model_commands.get(key)
+                if command is not None:
+                    peaks[command] = max(peaks.get(command, 0.0), float(score))
+
+        return peaks
+
+    def record_hit(self, hit: CommandHit, expected_stt_time: float) -> None:
+        """
+        Record a dispatched hit and the transcription time it avoided.
+
+        Args:
+            hit: The command that was dispatched
+            expected_stt_time: Transcription time that would have been spent
+        """
+        self.total_hits += 1
+        self.hits_per_command[hit.command] = self.hits_per_command.get(hit.command, 0) + 1
+        self.total_latency_saved += max(0.0, expected_stt_time - hit.spot_time)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get command spotting statistics."""
+        return {
+            'is_initialized': self.is_initialized,
+            'enabled': self.enabled,
+            'commands': len(self.model_commands),
+            'total_attempts': self.total_attempts,
+            'total_hits': self.total_hits,
+            'hit_rate': (self.total_hits / self.total_attempts) * 100 if self.total_attempts else 0.0,
+            'hits_per_command': dict(self.hits_per_command),
+            'average_spot_time_seconds': self.average_spot_time,
+            'total_latency_saved_seconds': self.total_latency_saved,
+            'average_latency_saved_seconds': (
+                self.total_latency_saved / self.total_hits if self.total_hits else 0.0
+            )
+        }
+
+    async def shutdown(self) -> None:
+        """Release the command models."""
+        self.model = None
+        self.model_commands = {}
+        self.is_initialized = False
+        self.logger.info("Command spotter shutdown complete")
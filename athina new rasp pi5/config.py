@@ -21,6 +21,7 @@ except ImportError:
     DOTENV_AVAILABLE = False
 
 from .errors import ConfigurationError
+from .stt_models import parse_model_name, MODEL_SIZES
 
 
 @dataclass
@@ -38,6 +39,13 @@ class AudioConfig:
     echo_cancellation: bool = True
     volume_threshold: float = 0.01
     silence_timeout: float = 2.0
+    vad_trim_enabled: bool = True  # Trim non-speech before STT
+    vad_aggressiveness: int = 2  # WebRTC VAD aggressiveness (0-3)
+    vad_frame_ms: int = 30  # VAD frame length (10, 20 or 30 ms)
+    vad_padding_ms: int = 200  # Audio kept around each speech segment
+    vad_min_speech_ms: int = 120  # Shorter speech runs are treated as noise
+    vad_split_pause_ms: int = 1000  # Pause that splits a capture into segments
+    vad_max_segment_seconds: float = 15.0  # Longer segments are split at pauses
     mock_mode: bool = False  # Enable mock audio for testing
 
 
@@ -72,9 +80,30 @@ class STTConfig:
     compression_ratio_threshold: float = 2.4
     logprob_threshold: float = -1.0
     no_speech_threshold: float = 0.6
+    backend: str = "auto"  # auto, whispercpp or whisper
+    n_threads: int = 0  # 0 = system.cpu_threads, then all cores
+    accuracy_tier: Optional[str] = None  # tiny/base/small/medium: use fastest resident model at this tier
+    model_sha256: Optional[str] = None  # Expected checksum of a downloaded model
+    verify_model_checksum: bool = False  # Re-hash the model file against the manifest on load
     mock_mode: bool = False  # Enable mock STT for testing
 
 
+@dataclass
+class CommandSpottingConfig:
+    """Small-vocabulary command spotting that can bypass full STT."""
+    enabled: bool = False
+    threshold: float = 0.7  # Minimum keyword score for a hit
+    margin: float = 0.2  # Required lead over the second-best command
+    commands: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
+        # model_path defaults to <model_cache_dir>/commands/<command>.onnx
+        "what_time": {"skill": "datetime", "utterance": "what time is it"},
+        "what_date": {"skill": "datetime", "utterance": "what's the date today"},
+        "what_day": {"skill": "datetime", "utterance": "what day is it"},
+        "stop": {"skill": "farewell", "utterance": "stop"},
+        "goodbye": {"skill": "farewell", "utterance": "goodbye"}
+    })
+
+
 @dataclass
 class TTSConfig:
     """Text-to-Speech configuration."""
@@ -87,9 +116,19 @@ class TTSConfig:
     length_scale: float = 1.0
     noise_scale: float = 0.667
     noise_scale_w: float = 0.8
+    speed_via_length_scale: bool = True  # Let Piper render voice_speed; False time-stretches with WSOLA
     streaming: bool = True
     mock_mode: bool = False  # Enable mock TTS for testing
     sentence_silence: float = 0.2
+    stream_queue_size: int = 2  # Synthesized sentences buffered ahead of playback
+    max_chunk_chars: int = 160  # Longer sentences are split at clause boundaries
+    cache_enabled: bool = True  # Reuse synthesized audio for repeated text
+    cache_memory_mb: int = 32
+    cache_persistent: bool = True  # Keep cached audio in <model_cache_dir>/tts_cache
+    cache_disk_mb: int = 256
+    cache_prewarm: bool = True  # Pre-synthesize fixed persona phrases when idle
+    backend: str = "auto"  # auto, python (in-process PiperVoice) or worker (long-lived piper CLI)
+    worker_timeout: float = 10.0  # Seconds the piper worker may take per sentence before it is restarted
 
 
 @dataclass
@@ -122,6 +161,22 @@ class PersonaConfig:
         "Could you please repeat that?",
         "I'm having trouble understanding. Please try again."
     ])
+    acknowledgement_messages: list = field(default_factory=lambda: [
+        "One moment.",
+        "Let me check.",
+        "Just a moment, please.",
+        "Certainly, one moment."
+    ])
+
+
+@dataclass
+class SkillsConfig:
+    """Skill plugin loading and execution."""
+    load_plugins: bool = True  # Discover plugins registered under the "athina.skills" entry point group
+    default_timeout: float = 5.0  # Seconds a handler may run before it is abandoned
+    timeouts: Dict[str, float] = field(default_factory=dict)  # Per-skill timeout overrides
+    disabled: list = field(default_factory=list)  # Skills that are never registered
+    max_workers: int = 2  # Threads for synchronous skill handlers
 
 
 @dataclass
@@ -142,6 +197,9 @@ class PipelineConfig:
     response_timeout: float = 10.0
     max_interaction_time: float = 30.0
     wake_sound_enabled: bool = True
+    acknowledgement_enabled: bool = True  # Say a short cached phrase while a slow response is pending
+    acknowledgement_deadline: float = 0.8  # Seconds after the transcript before acknowledging
+    stream_responses: bool = True  # Speak the first sentence while the rest is still generated
 
 
 @dataclass
@@ -151,7 +209,7 @@ class OpenAIConfig:
     api_key_env_var: str = "OPENAI_API_KEY"
     base_url: str = "https://api.openai.com/v1"
     timeout: int = 30
-    max_retries: int = 3
+    max_retries: int = 0  # The circuit breaker and the local fallback handle failures
     models: Dict[str, str] = field(default_factory=lambda: {
         "chat": "gpt-3.5-turbo",
         "chat_fallback": "gpt-3.5-turbo-instruct",
@@ -172,7 +230,8 @@ class OpenAIConfig:
         "api_timeout": 10,
         "retry_on_failure": True,
         "retry_delay": 1,
-        "local_confidence_threshold": 0.7
+        "local_confidence_threshold": 0.7,
+        "latency_budget": 2.5
     })
     smart_routing: Dict[str, Any] = field(default_factory=lambda: {
         "complex_keywords": [
@@ -190,6 +249,71 @@ class OpenAIConfig:
         "add_personality": True,
         "improve_quality": True
     })
+    connectivity: Dict[str, float] = field(default_factory=lambda: {
+        "probe_timeout": 2.0,
+        "online_interval": 30.0,
+        "offline_min_interval": 2.0,
+        "offline_max_interval": 60.0,
+        "failure_threshold": 3,
+        "max_backoff": 300.0,
+        "jitter": 0.2
+    })
+    context: Dict[str, Any] = field(default_factory=lambda: {
+        "token_budget": 3000,
+        "min_completion_tokens": 150,
+        "max_turns": 40,
+        "summary_tokens": 200
+    })
+    connection_pool: Dict[str, Any] = field(default_factory=lambda: {
+        "warm_up": True,  # Open a connection in the background once listening
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "keepalive_expiry": 120.0
+    })
+    cache: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": True,
+        "ttl_seconds": 3600,
+        "max_entries": 500,
+        "max_memory_kb": 512,
+        "persistent": True,  # Keep answers in <model_cache_dir>/response_cache.sqlite3
+        "max_disk_entries": 5000
+    })
+    prefetch: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": True,  # Needs the response cache
+        "idle_seconds": 60.0,
+        "check_interval": 30.0,
+        "daily_requests": 50,
+        "daily_tokens": 20000,
+        "min_occurrences": 2,
+        "history_size": 200,
+        "ttl_seconds": 86400.0,
+        "refresh_before_expiry": 3600.0
+    })
+    routing_policy: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": True,  # Used in smart fallback mode
+        "latency_cost_per_second": 0.2,
+        "cloud_gain_complex": 1.0,
+        "cloud_gain_simple": 0.2,
+        "local_llm_gain": 0.5,
+        "smoothing": 0.2,
+        "prior_success": 0.9,
+        "estimate_half_life": 600.0
+    })
+
+
+@dataclass
+class LocalLLMConfig:
+    """In-process language model for open-ended questions without the cloud."""
+    enabled: bool = True  # Used only if the model file and its backend are installed
+    backend: str = "auto"  # auto (by model path), llama_cpp or onnx
+    model_name: str = "qwen2.5-0.5b-instruct-q4_k_m.gguf"
+    model_path: Optional[str] = None  # Defaults to <model_cache_dir>/llm/<model_name>
+    context_tokens: int = 2048
+    max_tokens: int = 160  # Spoken answers are short
+    temperature: float = 0.7
+    threads: int = 0  # 0 = system.cpu_threads
+    history_turns: int = 6  # Recent turns included in the prompt
+    expected_latency: float = 0.8  # Seconds to the first token assumed until measured
 
 
 @dataclass
@@ -236,9 +360,12 @@ class Config:
         self.audio: AudioConfig = AudioConfig()
         self.wake_word: WakeWordConfig = WakeWordConfig()
         self.stt: STTConfig = STTConfig()
+        self.command_spotting: CommandSpottingConfig = CommandSpottingConfig()
         self.tts: TTSConfig = TTSConfig()
         self.persona: PersonaConfig = PersonaConfig()
+        self.skills: SkillsConfig = SkillsConfig()
         self.openai: OpenAIConfig = OpenAIConfig()
+        self.local_llm: LocalLLMConfig = LocalLLMConfig()
         self.system: SystemConfig = SystemConfig()
         self.logging: LoggingConfig = LoggingConfig()
         self.pipeline: PipelineConfig = PipelineConfig()
@@ -342,6 +469,13 @@ class Config:
                     if hasattr(self.stt, key):
                         setattr(self.stt, key, value)
             
+            # Command spotting configuration
+            if 'command_spotting' in self.config_data:
+                spotting_data = self.config_data['command_spotting']
+                for key, value in spotting_data.items():
+                    if hasattr(self.command_spotting, key):
+                        setattr(self.command_spotting, key, value)
+            
             # TTS configuration
             if 'tts' in self.config_data:
                 tts_data = self.config_data['tts']
@@ -356,6 +490,20 @@ class Config:
                     if hasattr(self.persona, key):
                         setattr(self.persona, key, value)
             
+            # Skills configuration
+            if 'skills' in self.config_data:
+                skills_data = self.config_data['skills']
+                for key, value in skills_data.items():
+                    if hasattr(self.skills, key):
+                        setattr(self.skills, key, value)
+            
+            # Pipeline configuration
+            if 'pipeline' in self.config_data:
+                pipeline_data = self.config_data['pipeline']
+                for key, value in pipeline_data.items():
+                    if hasattr(self.pipeline, key):
+                        setattr(self.pipeline, key, value)
+            
             # System configuration
             if 'system' in self.config_data:
                 system_data = self.config_data['system']
@@ -369,6 +517,13 @@ class Config:
                 for key, value in openai_data.items():
                     if hasattr(self.openai, key):
                         setattr(self.openai, key, value)
+            
+            # Local LLM configuration
+            if 'local_llm' in self.config_data:
+                local_llm_data = self.config_data['local_llm']
+                for key, value in local_llm_data.items():
+                    if hasattr(self.local_llm, key):
+                        setattr(self.local_llm, key, value)
                         
         except Exception as e:
             raise ConfigurationError(f"Failed to apply configuration data: {e}")
@@ -435,19 +590,144 @@ class Config:
             if self.audio.channels not in [1, 2]:
                 raise ConfigurationError(f"Invalid channel count: {self.audio.channels}")
             
+            if self.audio.vad_frame_ms not in [10, 20, 30]:
+                raise ConfigurationError(f"VAD frame length must be 10, 20 or 30 ms: {self.audio.vad_frame_ms}")
+            
             # Validate wake word configuration
             if not 0.0 <= self.wake_word.sensitivity <= 1.0:
                 raise ConfigurationError(f"Wake word sensitivity must be 0.0-1.0: {self.wake_word.sensitivity}")
             
             # Validate STT configuration
-            valid_models = ['tiny', 'tiny.en', 'base', 'base.en', 'small', 'small.en']
-            if self.stt.model_name not in valid_models:
-                self.logger.warning(f"STT model '{self.stt.model_name}' not in recommended list: {valid_models}")
+            if parse_model_name(self.stt.model_name) is None:
+                self.logger.warning(
+                    f"STT model '{self.stt.model_name}' not recognised; expected e.g. "
+                    f"'tiny.en', 'base' or a quantized variant such as 'base.en-q5_1'"
+                )
+            
+            if self.stt.accuracy_tier is not None and self.stt.accuracy_tier not in MODEL_SIZES:
+                raise ConfigurationError(f"Invalid STT accuracy tier: {self.stt.accuracy_tier}")
+            
+            if self.stt.backend not in ['auto', 'whispercpp', 'whisper']:
+                raise ConfigurationError(f"Invalid STT backend: {self.stt.backend}")
+            
+            # Validate skills configuration
+            if self.skills.default_timeout <= 0:
+                raise ConfigurationError(f"Skill timeout must be positive: {self.skills.default_timeout}")
+            
+            for skill, timeout in self.skills.timeouts.items():
+                if timeout <= 0:
+                    raise ConfigurationError(f"Timeout for skill '{skill}' must be positive: {timeout}")
+            
+            if self.skills.max_workers < 1:
+                raise ConfigurationError(f"Skill worker count must be at least 1: {self.skills.max_workers}")
+            
+            # Validate usage limits (0 disables a rate limit window)
+            for key, limit in self.openai.usage_limits.items():
+                if limit < 0:
+                    raise ConfigurationError(f"OpenAI usage limit {key} must be non-negative: {limit}")
+            
+            if self.openai.usage_limits.get('max_tokens_per_request', 1000) <= 0:
+                raise ConfigurationError(
+                    f"OpenAI max_tokens_per_request must be positive: {self.openai.usage_limits['max_tokens_per_request']}"
+                )
+            
+            # Validate hedged routing budget
+            latency_budget = self.openai.fallback.get('latency_budget')
+            if latency_budget is not None and latency_budget < 0:
+                raise ConfigurationError(f"OpenAI latency budget must be non-negative: {latency_budget}")
+            
+            # Validate connectivity monitoring
+            connectivity = self.openai.connectivity
+            for key in ('probe_timeout', 'online_interval', 'offline_min_interval', 'offline_max_interval'):
+                if connectivity.get(key, 1.0) <= 0:
+                    raise ConfigurationError(f"OpenAI connectivity {key} must be positive: {connectivity[key]}")
+            
+            if connectivity.get('failure_threshold', 3) < 1:
+                raise ConfigurationError(
+                    f"Circuit breaker failure threshold must be at least 1: {connectivity['failure_threshold']}"
+                )
+            
+            if not 0.0 <= connectivity.get('jitter', 0.2) < 1.0:
+                raise ConfigurationError(f"Circuit breaker jitter must be 0.0-1.0: {connectivity['jitter']}")
+            
+            # Validate connection pool
+            pool = self.openai.connection_pool
+            for key in ('max_connections', 'max_keepalive_connections', 'keepalive_expiry'):
+                if pool.get(key, 1) <= 0:
+                    raise ConfigurationError(f"OpenAI connection pool {key} must be positive: {pool[key]}")
+            
+            # Validate conversation context budget
+            context = self.openai.context
+            if context.get('min_completion_tokens', 150) >= context.get('token_budget', 3000):
+                raise ConfigurationError(
+                    f"OpenAI context token budget must exceed the tokens reserved for the reply: {context}"
+                )
+            
+            if context.get('max_turns', 40) < 0 or context.get('summary_tokens', 200) < 0:
+                raise ConfigurationError(f"OpenAI context turn and summary limits must be non-negative: {context}")
+            
+            # Validate response cache
+            cache = self.openai.cache
+            for key in ('ttl_seconds', 'max_entries', 'max_memory_kb'):
+                if cache.get(key, 1) <= 0:
+                    raise ConfigurationError(f"OpenAI response cache {key} must be positive: {cache[key]}")
+            
+            if cache.get('max_disk_entries', 5000) < 0:
+                raise ConfigurationError(
+                    f"OpenAI response cache max_disk_entries must be non-negative: {cache['max_disk_entries']}"
+                )
+            
+            # Validate answer prefetching
+            prefetch = self.openai.prefetch
+            for key in ('idle_seconds', 'check_interval', 'ttl_seconds', 'history_size', 'min_occurrences'):
+                if prefetch.get(key, 1) <= 0:
+                    raise ConfigurationError(f"OpenAI prefetch {key} must be positive: {prefetch[key]}")
+            
+            for key in ('daily_requests', 'daily_tokens', 'refresh_before_expiry'):
+                if prefetch.get(key, 0) < 0:
+                    raise ConfigurationError(f"OpenAI prefetch {key} must be non-negative: {prefetch[key]}")
+            
+            # Validate routing policy
+            policy = self.openai.routing_policy
+            for key in ('latency_cost_per_second', 'cloud_gain_complex', 'cloud_gain_simple',
+                        'local_llm_gain', 'estimate_half_life'):
+                if policy.get(key, 0) < 0:
+                    raise ConfigurationError(f"OpenAI routing policy {key} must be non-negative: {policy[key]}")
+            
+            for key in ('smoothing', 'prior_success'):
+                if not 0 < policy.get(key, 0.5) <= 1:
+                    raise ConfigurationError(f"OpenAI routing policy {key} must be in (0, 1]: {policy[key]}")
+            
+            # Validate local LLM configuration
+            if self.local_llm.backend not in ['auto', 'llama_cpp', 'onnx']:
+                raise ConfigurationError(f"Invalid local LLM backend: {self.local_llm.backend}")
+            
+            if not 0 < self.local_llm.max_tokens < self.local_llm.context_tokens:
+                raise ConfigurationError(
+                    f"Local LLM max_tokens must be positive and below context_tokens: {self.local_llm.max_tokens}"
+                )
             
             # Validate TTS configuration
+            if self.pipeline.acknowledgement_deadline < 0:
+                raise ConfigurationError(
+                    f"Acknowledgement deadline must be non-negative: {self.pipeline.acknowledgement_deadline}"
+                )
+            
             if not 0.1 <= self.tts.voice_speed <= 3.0:
                 raise ConfigurationError(f"TTS voice speed must be 0.1-3.0: {self.tts.voice_speed}")
             
+            if not -12.0 <= self.tts.voice_pitch <= 12.0:
+                raise ConfigurationError(f"TTS voice pitch must be -12 to 12 semitones: {self.tts.voice_pitch}")
+            
+            if not 0.0 <= self.tts.voice_volume <= 4.0:
+                raise ConfigurationError(f"TTS voice volume must be 0.0-4.0: {self.tts.voice_volume}")
+            
+            if self.tts.backend not in ['auto', 'python', 'worker']:
+                raise ConfigurationError(f"Invalid TTS backend: {self.tts.backend}")
+            
+            if self.tts.worker_timeout <= 0:
+                raise ConfigurationError(f"TTS worker timeout must be positive: {self.tts.worker_timeout}")
+            
             # Validate system configuration
             if self.system.max_memory_usage_mb < 512:
                 raise ConfigurationError(f"Max memory usage too low: {self.system.max_memory_usage_mb}MB")
@@ -515,9 +795,13 @@ class Config:
             'audio': self.audio.__dict__,
             'wake_word': self.wake_word.__dict__,
             'stt': self.stt.__dict__,
+            'command_spotting': self.command_spotting.__dict__,
             'tts': self.tts.__dict__,
             'persona': self.persona.__dict__,
+            'skills': self.skills.__dict__,
+            'pipeline': self.pipeline.__dict__,
             'openai': self.openai.__dict__,
+            'local_llm': self.local_llm.__dict__,
             'system': self.system.__dict__,
         }
         
@@ -0,0 +1,365 @@
+"""
+Athina Conversation Context
+
+Keeps the conversation as a bounded deque of turns whose token counts are
+measured once, when each turn is appended, and assembles the messages for
+a chat request within a token budget: the system prompt and the current
+prompt always fit, as much recent history as the budget allows follows,
+and older turns are folded into a short extractive summary. The tokens
+left over set ``max_tokens`` for the request.
+
+Tokens are counted with tiktoken once its encoding has been loaded by
+``TokenCounter.warm_up`` (off the event loop, as it may be downloaded);
+until then, or without tiktoken, a four-characters-per-token estimate is
+used.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Deque, Tuple
+
+from .lazy_imports import is_available, load
+
+TIKTOKEN_AVAILABLE = is_available('tiktoken')
+
+# Chat format overhead: tokens wrapping every message, and the primer for the reply
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMER_TOKENS = 3
+
+# Encoding used when tiktoken does not know the configured model
+DEFAULT_ENCODING = "cl100k_base"
+
+# Words kept from a turn when it is folded into the summary
+SUMMARY_WORDS_PER_TURN = 16
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+class TokenCounter:
+    """
+    Token counts for chat messages, exact with tiktoken and estimated without.
+
+    The encoding is never loaded on the counting path: loading may fetch
+    the BPE file over the network, so ``warm_up`` loads it in the default
+    executor and counts are estimated until it is ready.
+    """
+
+    def __init__(self, model: str = "gpt-3.5-turbo"):
+        """
+        Initialize TokenCounter.
+
+        Args:
+            model: Chat model whose tokenizer is used
+        """
+        self.logger = logging.getLogger(__name__)
+        self.model = model
+        self._encoding = None
+        self._loading: Optional[asyncio.Future] = None
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from the model's tokenizer."""
+        return self._encoding is not None
+
+    async def warm_up(self) -> None:
+        """Load the tiktoken encoding in the default executor; safe to call repeatedly."""
+        if not TIKTOKEN_AVAILABLE:
+            self.logger.info("tiktoken not available, estimating token counts")
+            return
+
+        if self._loading is None:
+            loop = asyncio.get_running_loop()
+            self._loading = loop.run_in_executor(None, self._load)
+        await asyncio.shield(self._loading)
+
+    def _load(self) -> None:
+        """Load the tiktoken encoding (blocking)."""
+        try:
+            tiktoken = load('tiktoken', 'conversation_context')
+            try:
+                encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+            self._encoding = encoding
+        except Exception as e:
+            # The encoding file is downloaded on first use, which fails offline
+            self.logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+    def message_tokens(self, content: str) -> int:
+        """Tokens a chat message with this content takes up, including its framing."""
+        return self.count(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class Turn:
+    """One message of the conversation with its measured size."""
+    role: str
+    content: str
+    tokens: int
+    timestamp: datetime = field(default_factory=datetime.now)
+    _summary: Optional[Tuple[str, int]] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary form used in routing contexts."""
+        return {'role': self.role, 'content': self.content, 'timestamp': self.timestamp}
+
+
+@dataclass
+class ContextWindow:
+    """Messages for one chat request and the completion budget left for it."""
+    messages: List[Dict[str, str]]
+    prompt_tokens: int
+    max_tokens: int
+    turns_included: int
+    turns_summarized: int
+
+
+class ConversationContext:
+    """
+    Token-budgeted conversation history.
+
+    Turns beyond ``max_turns`` leave the deque and are folded into the
+    running summary; turns still in the deque that do not fit a request's
+    budget are summarized for that request only.
+    """
+
+    def __init__(self, token_budget: int = 3000, max_completion_tokens: int = 1000,
+                 min_completion_tokens: int = 150, max_turns: int = 40,
+                 summary_tokens: int = 200, model: str = "gpt-3.5-turbo",
+                 counter: Optional[TokenCounter] = None):
+        """
+        Initialize ConversationContext.
+
+        Args:
+            token_budget: Tokens per request, prompt and completion together
+            max_completion_tokens: Upper limit for a request's max_tokens
+            min_completion_tokens: Tokens always kept free for the completion
+            max_turns: Turns kept verbatim before folding into the summary
+            summary_tokens: Size limit of the summary of older turns
+            model: Chat model whose tokenizer is used
+            counter: Shared token counter; one is created for ``model`` if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.token_budget = token_budget
+        self.max_completion_tokens = max_completion_tokens
+        self.min_completion_tokens = min_completion_tokens
+        self.max_turns = max_turns
+        self.summary_tokens = summary_tokens
+        self.counter = counter or TokenCounter(model)
+
+        self.turns: Deque[Turn] = deque()
+        self._summary: Deque[Tuple[str, int]] = deque()  # (line, tokens) of folded turns
+        self._summary_total = 0
+
+        # Statistics
+        self.folded_turns = 0
+        self.total_builds = 0
+        self.average_prompt_tokens = 0.0
+        self.average_build_time = 0.0
+
+    @classmethod
+    def from_config(cls, openai_config, counter: Optional[TokenCounter] = None) -> 'ConversationContext':
+        """
+        Create a context from the OpenAI configuration.
+
+        Args:
+            openai_config: OpenAIConfig with ``context``, ``usage_limits`` and ``models``
+            counter: Optional shared token counter
+
+        Returns:
+            ConversationContext
+        """
+        settings = openai_config.context
+        return cls(
+            token_budget=settings.get('token_budget', 3000),
+            max_completion_tokens=openai_config.usage_limits.get('max_tokens_per_request', 1000),
+            min_completion_tokens=settings.get('min_completion_tokens', 150),
+            max_turns=settings.get('max_turns', 40),
+            summary_tokens=settings.get('summary_tokens', 200),
+            model=openai_config.models.get('chat', "gpt-3.5-turbo"),
+            counter=counter
+        )
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def append(self, role: str, content: str, timestamp: Optional[datetime] = None) -> Turn:
+        """
+        Add a turn, folding the oldest turn into the summary when the deque is full.
+
+        Args:
+            role: "user" or "assistant"
+            content: Message text
+            timestamp: When the turn happened; defaults to now
+
+        Returns:
+            The appended turn
+        """
+        while len(self.turns) >= self.max_turns > 0:
+            self._fold(self.turns.popleft())
+
+        turn = Turn(role, content, self.counter.message_tokens(content), timestamp or datetime.now())
+        self.turns.append(turn)
+        return turn
+
+    def extend(self, history: List[Dict[str, Any]]) -> None:
+        """Append turns given as ``{'role', 'content'}`` dictionaries."""
+        for entry in history:
+            self.append(entry['role'], entry['content'], entry.get('timestamp'))
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """The last ``count`` turns as dictionaries."""
+        if count <= 0:
+            return []
+        return [turn.to_dict() for turn in list(self.turns)[-count:]]
+
+    def clear(self) -> None:
+        """Forget the conversation and its summary."""
+        self.turns.clear()
+        self._summary.clear()
+        self._summary_total = 0
+
+    def _summary_line(self, turn: Turn) -> Tuple[str, int]:
+        """Compact one-line form of a turn and its token count."""
+        if turn._summary is None:
+            first_sentence = _SENTENCE_END.split(turn.content.strip(), maxsplit=1)[0]
+            words = first_sentence.split()
+            text = ' '.join(words[:SUMMARY_WORDS_PER_TURN])
+            if len(words) > SUMMARY_WORDS_PER_TURN:
+                text += '...'
+            speaker = "User" if turn.role == 'user' else "Assistant"
+            line = f"{speaker}: {text}"
+            turn._summary = (line, self.counter.count(line) + 1)  # +1 for the separator
+        return turn._summary
+
+    def _fold(self, turn: Turn) -> None:
+        """Move a turn that left the deque into the running summary."""
+        line = self._summary_line(turn)
+        self._summary.append(line)
+        self._summary_total += line[1]
+        self.folded_turns += 1
+
+        while self._summary_total > self.summary_tokens and self._summary:
+            _, tokens = self._summary.popleft()
+            self._summary_total -= tokens
+
+    def build(self, system_prompt: str, user_input: Optional[str] = None) -> ContextWindow:
+        """
+        Assemble the messages for a chat request.
+
+        Args:
+            system_prompt: System message
+            user_input: Current prompt; if the newest turn is this user
+                message it is not repeated from the history
+
+        Returns:
+            ContextWindow with the messages and the request's max_tokens
+        """
+        start_time = time.perf_counter()
+
+        history = list(self.turns)
+        if (user_input is not None and history and history[-1].role == 'user'
+                and history[-1].content == user_input):
+            history.pop()
+
+        fixed = REPLY_PRIMER_TOKENS + self.counter.message_tokens(system_prompt)
+        if user_input is not None:
+            fixed += self.counter.message_tokens(user_input)
+        available = self.token_budget - self.min_completion_tokens - fixed
+
+        included = self._fit(history, available)
+        summary_lines: List[Tuple[str, int]] = []
+        if len(included) < len(history) or self._summary:
+            # Make room for the summary and fit the history again
+            reserve = self.summary_tokens + MESSAGE_OVERHEAD_TOKENS + self.counter.count(SUMMARY_PREFIX)
+            included = self._fit(history, available - reserve)
+            older = [self._summary_line(turn) for turn in history[:len(history) - len(included)]]
+            summary_lines = self._newest_lines(list(self._summary) + older, self.summary_tokens)
+
+        messages = [{"role": "system", "content": system_prompt}]
+        prompt_tokens = fixed
+        if summary_lines:
+            summary = SUMMARY_PREFIX + '; '.join(line for line, _ in summary_lines)
+            messages.append({"role": "system", "content": summary})
+            prompt_tokens += self.counter.message_tokens(summary)
+        for turn in included:
+            messages.append({"role": turn.role, "content": turn.content})
+            prompt_tokens += turn.tokens
+        if user_input is not None:
+            messages.append({"role": "user", "content": user_input})
+
+        max_tokens = min(self.max_completion_tokens, self.token_budget - prompt_tokens)
+        if max_tokens < self.min_completion_tokens:
+            self.logger.warning(
+                f"Prompt of {prompt_tokens} tokens leaves less than {self.min_completion_tokens} "
+                f"of the {self.token_budget} token budget for the reply"
+            )
+            max_tokens = self.min_completion_tokens
+
+        self.total_builds += 1
+        self.average_prompt_tokens += (prompt_tokens - self.average_prompt_tokens) / self.total_builds
+        elapsed = time.perf_counter() - start_time
+        self.average_build_time += (elapsed - self.average_build_time) / self.total_builds
+
+        return ContextWindow(
+            messages=messages,
+            prompt_tokens=prompt_tokens,
+            max_tokens=max_tokens,
+            turns_included=len(included),
+            turns_summarized=len(summary_lines)
+        )
+
+    @staticmethod
+    def _fit(history: List[Turn], available: int) -> List[Turn]:
+        """Longest run of the newest turns that fits the available tokens, oldest first."""
+        used = 0
+        count = 0
+        for turn in reversed(history):
+            if used + turn.tokens > available:
+                break
+            used += turn.tokens
+            count += 1
+        return history[len(history) - count:]
+
+    @staticmethod
+    def _newest_lines(lines: List[Tuple[str, int]], limit: int) -> List[Tuple[str, int]]:
+        """Newest summary lines within the token limit, oldest first."""
+        kept: List[Tuple[str, int]] = []
+        used = 0
+        for line in reversed(lines):
+            if used + line[1] > limit:
+                break
+            used += line[1]
+            kept.append(line)
+        kept.reverse()
+        return kept
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get conversation context statistics."""
+        return {
+            'turns': len(self.turns),
+            'history_tokens': sum(turn.tokens for turn in self.turns),
+            'summary_lines': len(self._summary),
+            'summary_tokens': self._summary_total,
+            'folded_turns': self.folded_turns,
+            'token_budget': self.token_budget,
+            'exact_token_counts': self.counter.is_exact,
+            'total_builds': self.total_builds,
+            'average_prompt_tokens': self.average_prompt_tokens,
+            'average_build_time_ms': self.average_build_time * 1000
+        }
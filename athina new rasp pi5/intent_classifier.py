@@ -0,0 +1,281 @@
+"""
+Athina Intent Classifier
+
+Offline nearest-centroid intent model over hashed character n-gram
+TF-IDF features. It is trained in milliseconds from the example phrases
+skills register, scores a transcript with a sparse dot product against
+the skill centroids, and turns the similarities into a calibrated
+confidence that the NLP router compares with its local-confidence
+threshold. Transcripts closest to a centroid of out-of-domain phrases,
+or too far from or too evenly between skills, are rejected.
+"""
+
+import logging
+import math
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+# Requests no built-in skill handles, trained as a rejection class. Many
+# share words with a skill ("time in tokyo", "what day is christmas") and
+# would otherwise be scored as that skill.
+OUT_OF_DOMAIN_EXAMPLES = [
+    "what time is it in tokyo", "what's the time in new york", "time zone in london",
+    "what day is christmas", "when is easter this year", "how many days until my birthday",
+    "what is the capital of france", "how tall is mount everest", "who wrote hamlet",
+    "explain quantum computing", "how does photosynthesis work", "translate hello into spanish",
+    "tell me a joke", "play some music", "set a timer for five minutes", "turn on the lights",
+    "what is the weather on mars", "who is the president", "how do I cook rice",
+    "what is two plus two"
+]
+
+
+@dataclass
+class IntentPrediction:
+    """Most likely skill for a transcript; skill is None when rejected as out of domain."""
+    skill: Optional[str]
+    confidence: float
+    similarity: float
+    probabilities: Dict[str, float] = field(default_factory=dict)
+
+
+class IntentClassifier:
+    """
+    Hashed character n-gram TF-IDF with nearest-centroid scoring.
+
+    Confidence combines two calibrated parts: a softmax over centroid
+    similarities whose temperature is fitted on leave-one-out predictions
+    of the training examples, and the top similarity relative to the
+    similarity typical for in-domain examples, so text unlike any skill
+    gets low confidence even when one skill is relatively closest.
+
+    A prediction is rejected (skill None, confidence 0) when the
+    out-of-domain class is closest, when the top similarity is below
+    ``min_similarity_ratio`` of the in-domain reference, or when the two
+    most likely skills are within ``min_margin`` of each other.
+    """
+
+    def __init__(self, n_features: int = 2 ** 13, ngram_range: Tuple[int, int] = (2, 4),
+                 min_similarity_ratio: float = 0.5, min_margin: float = 0.2):
+        """
+        Initialize IntentClassifier.
+
+        Args:
+            n_features: Size of the hashed feature space
+            ngram_range: Smallest and largest character n-gram length
+            min_similarity_ratio: Top similarity, relative to the in-domain
+                reference, below which a transcript is out of domain
+            min_margin: Smallest lead of the top skill's probability over
+                the runner-up for a prediction to count
+        """
+        self.logger = logging.getLogger(__name__)
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.min_similarity_ratio = min_similarity_ratio
+        self.min_margin = min_margin
+
+        self.skills: List[str] = []
+        self.has_rejection_class = False
+        self.idf = np.ones(n_features, dtype=np.float32)
+        self.centroids = np.zeros((0, n_features), dtype=np.float32)
+        self.temperature = 0.1
+        self.reference_similarity = 1.0
+        self.is_trained = False
+
+        # Statistics
+        self.training_examples = 0
+        self.training_time = 0.0
+        self.total_predictions = 0
+        self.rejections = 0
+        self.average_predict_time = 0.0
+
+    def _hash_ngrams(self, text: str) -> np.ndarray:
+        """Feature indices of every character n-gram in normalized text."""
+        padded = f" {' '.join(text.lower().split())} "
+        low, high = self.ngram_range
+        grams = [
+            padded[i:i + n]
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ]
+        return np.fromiter(
+            (zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint32, count=len(grams)
+        ) % self.n_features
+
+    def _vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse L2-normalized TF-IDF vector.
+
+        Returns:
+            Tuple of (feature indices, weights)
+        """
+        indices, counts = np.unique(self._hash_ngrams(text), return_counts=True)
+        weights = (1.0 + np.log(counts)).astype(np.float32) * self.idf[indices]
+        norm = np.linalg.norm(weights)
+        if norm > 0:
+            weights /= norm
+        return indices, weights
+
+    def fit(self, examples: Dict[str, List[str]], out_of_domain: Optional[List[str]] = None) -> None:
+        """
+        Train centroids, IDF weights and calibration from skill examples.
+
+        Args:
+            examples: Example phrases per skill; skills without examples are ignored
+            out_of_domain: Phrases no skill should claim, trained as a
+                rejection class; defaults to OUT_OF_DOMAIN_EXAMPLES
+        """
+        start_time = time.perf_counter()
+        examples = {skill: [e for e in texts if e.strip()] for skill, texts in examples.items()}
+        examples = {skill: texts for skill, texts in examples.items() if texts}
+
+        self.skills = list(examples)
+        if not self.skills:
+            self.is_trained = False
+            return
+
+        # The rejection class is the last centroid row, after the skills
+        rejected = [e for e in (OUT_OF_DOMAIN_EXAMPLES if out_of_domain is None else out_of_domain) if e.strip()]
+        self.has_rejection_class = bool(rejected)
+        classes = [examples[skill] for skill in self.skills] + ([rejected] if rejected else [])
+
+        texts = [text for class_texts in classes for text in class_texts]
+        labels = np.array([k for k, class_texts in enumerate(classes) for _ in class_texts])
+
+        # Smoothed IDF over the training phrases
+        df = np.zeros(self.n_features, dtype=np.float32)
+        for text in texts:
+            df[np.unique(self._hash_ngrams(text))] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+        vectors = [self._vectorize(text) for text in texts]
+
+        sums = np.zeros((len(classes), self.n_features), dtype=np.float32)
+        for (indices, weights), label in zip(vectors, labels):
+            sums[label, indices] += weights
+        self.centroids = self._normalize_rows(sums)
+
+        self._calibrate(vectors, labels, sums)
+
+        self.training_examples = len(texts)
+        self.training_time = time.perf_counter() - start_time
+        self.is_trained = True
+
+        self.logger.debug(
+            f"Intent classifier trained on {len(texts)} examples for {len(self.skills)} skills "
+            f"in {self.training_time * 1000:.1f} ms (temperature {self.temperature:.3f})"
+        )
+
+    def _calibrate(self, vectors: List[Tuple[np.ndarray, np.ndarray]], labels: np.ndarray,
+                   sums: np.ndarray) -> None:
+        """Fit the softmax temperature and reference similarity on leave-one-out predictions."""
+        counts = np.bincount(labels, minlength=len(self.centroids))
+        sum_norms_sq = (sums * sums).sum(axis=1)
+
+        rows, truth = [], []
+        for (indices, weights), label in zip(vectors, labels):
+            if counts[label] < 2:
+                continue  # No held-out centroid for single-example skills
+
+            similarities = self.centroids[:, indices] @ weights
+
+            # Similarity to the own-skill centroid with this example removed
+            overlap = float(sums[label, indices] @ weights)
+            held_out_sq = sum_norms_sq[label] - 2 * overlap + float(weights @ weights)
+            similarities[label] = (overlap - float(weights @ weights)) / math.sqrt(max(held_out_sq, 1e-12))
+
+            rows.append(similarities)
+            truth.append(label)
+
+        if not rows:
+            return
+
+        similarities = np.stack(rows)
+        truth = np.array(truth)
+
+        # Temperature minimizing held-out negative log-likelihood
+        best_nll = math.inf
+        for temperature in np.geomspace(0.01, 1.0, 30):
+            logits = similarities / temperature
+            logits -= logits.max(axis=1, keepdims=True)
+            log_probs = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+            nll = -log_probs[np.arange(len(truth)), truth].mean()
+            if nll < best_nll:
+                best_nll, self.temperature = nll, float(temperature)
+
+        # Typical similarity of a correctly classified in-domain phrase
+        correct = (similarities.argmax(axis=1) == truth) & (truth < len(self.skills))
+        if correct.any():
+            self.reference_similarity = float(np.median(similarities[correct].max(axis=1)))
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def predict(self, text: str) -> IntentPrediction:
+        """
+        Pick the most likely skill for a transcript.
+
+        Args:
+            text: Transcript
+
+        Returns:
+            IntentPrediction; skill is None when the model is untrained,
+            the text has no features or it is rejected as out of domain
+        """
+        if not self.is_trained or not text.strip():
+            return IntentPrediction(skill=None, confidence=0.0, similarity=0.0)
+
+        start_time = time.perf_counter()
+
+        indices, weights = self._vectorize(text)
+        similarities = self.centroids[:, indices] @ weights
+
+        logits = similarities / self.temperature
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+
+        best = int(np.argmax(similarities))
+        top_similarity = float(similarities[best])
+        in_domain = min(1.0, max(0.0, top_similarity / self.reference_similarity))
+        confidence = float(probabilities[best]) * in_domain
+
+        runner_up = float(np.partition(probabilities, -2)[-2]) if len(probabilities) > 1 else 0.0
+        rejected = (
+            best >= len(self.skills)
+            or in_domain < self.min_similarity_ratio
+            or float(probabilities[best]) - runner_up < self.min_margin
+        )
+
+        self.total_predictions += 1
+        if rejected:
+            self.rejections += 1
+        elapsed = time.perf_counter() - start_time
+        self.average_predict_time += (elapsed - self.average_predict_time) / self.total_predictions
+
+        return IntentPrediction(
+            skill=None if rejected else self.skills[best],
+            confidence=0.0 if rejected else confidence,
+            similarity=top_similarity,
+            probabilities={skill: float(p) for skill, p in zip(self.skills, probabilities)}
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get classifier statistics."""
+        return {
+            'is_trained': self.is_trained,
+            'skills': len(self.skills),
+            'rejection_class': self.has_rejection_class,
+            'training_examples': self.training_examples,
+            'training_time_ms': self.training_time * 1000,
+            'temperature': self.temperature,
+            'reference_similarity': self.reference_similarity,
+            'total_predictions': self.total_predictions,
+            'rejections': self.rejections,
+            'average_predict_time_ms': self.average_predict_time * 1000
+        }
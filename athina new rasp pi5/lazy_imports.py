@@ -0,0 +1,55 @@
+"""
+Athina Lazy Backend Imports
+
+Heavy optional libraries (Whisper/torch, Piper, openWakeWord, OpenAI) are
+only imported once a component's ``initialize()`` selects them. Availability
+is checked without importing, and every import is timed by the startup
+profiler.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+from .logging_cfg import STARTUP_PROFILER
+
+
+def is_available(module_name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it.
+    
+    Args:
+        module_name: Top-level module name (e.g. "whisper")
+        
+    Returns:
+        True if the module is installed
+    """
+    if module_name in sys.modules:
+        return True
+    
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load(module_name: str, component: str) -> ModuleType:
+    """
+    Import a module on first use and record the import time.
+    
+    Args:
+        module_name: Module to import (may be dotted)
+        component: Component requesting the import, for startup profiling
+        
+    Returns:
+        The imported module
+        
+    Raises:
+        ImportError: If the module cannot be imported
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    
+    with STARTUP_PROFILER.measure(component, f"import {module_name}"):
+        return importlib.import_module(module_name)
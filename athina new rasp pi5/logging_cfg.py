@@ -355,4 +355,108 @@ PERFORMANCE_MONITORS = {
     'speech_recognition': PerformanceMonitor('speech_recognition'),
     'text_synthesis': PerformanceMonitor('text_synthesis'),
     'full_interaction': PerformanceMonitor('full_interaction'),
-}
\ No newline at end of file
+}
+
+
+class StartupProfiler:
+    """Collect import and model-load timings per component during startup."""
+    
+    def __init__(self):
+        """Initialize StartupProfiler."""
+        self.origin = time.perf_counter()
+        self.events = []
+        self.logger = logging.getLogger("athina.performance.startup")
+    
+    @contextmanager
+    def measure(self, component: str, stage: str):
+        """
+        Time a startup stage of a component.
+        
+        Args:
+            component: Component name (e.g. "stt", "tts")
+            stage: Stage name (e.g. "import whisper", "load model")
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                'component': component,
+                'stage': stage,
+                'start': start - self.origin,
+                'duration': end - start
+            })
+            self.logger.debug(f"{component}: {stage} took {end - start:.3f}s")
+    
+    def mark(self, component: str, stage: str) -> None:
+        """
+        Record a point-in-time milestone (e.g. "ready").
+        
+        Args:
+            component: Component name
+            stage: Milestone name
+        """
+        self.events.append({
+            'component': component,
+            'stage': stage,
+            'start': time.perf_counter() - self.origin,
+            'duration': 0.0
+        })
+    
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Get startup timings grouped by component.
+        
+        Returns:
+            Dictionary with per-component import, model-load and total times
+            plus the raw timeline
+        """
+        components = {}
+        for event in self.events:
+            stats = components.setdefault(event['component'], {
+                'import_seconds': 0.0,
+                'model_load_seconds': 0.0,
+                'initialize_seconds': 0.0
+            })
+            if event['stage'].startswith('import '):
+                stats['import_seconds'] += event['duration']
+            elif event['stage'] == 'load model':
+                stats['model_load_seconds'] += event['duration']
+            elif event['stage'] == 'initialize':
+                stats['initialize_seconds'] += event['duration']
+        
+        return {
+            'components': components,
+            'timeline': sorted(self.events, key=lambda e: e['start'])
+        }
+    
+    def format_report(self) -> str:
+        """Format startup timings as a table."""
+        report = self.get_report()
+        lines = [
+            f"{'component':<12} {'import (s)':>11} {'model (s)':>10} {'init (s)':>9}",
+            "-" * 45
+        ]
+        for name, stats in report['components'].items():
+            lines.append(
+                f"{name:<12} {stats['import_seconds']:>11.3f} "
+                f"{stats['model_load_seconds']:>10.3f} {stats['initialize_seconds']:>9.3f}"
+            )
+        
+        lines.append("")
+        lines.append("timeline:")
+        for event in report['timeline']:
+            duration = f" ({event['duration']:.3f}s)" if event['duration'] else ""
+            lines.append(f"  {event['start']:8.3f}s  {event['component']}: {event['stage']}{duration}")
+        
+        return "\n".join(lines)
+    
+    def reset(self) -> None:
+        """Clear recorded events and restart the clock."""
+        self.origin = time.perf_counter()
+        self.events = []
+
+
+# Global startup profiler
+STARTUP_PROFILER = StartupProfiler()
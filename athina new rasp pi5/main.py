@@ -6,22 +6,34 @@ Integrates all voice processing components into a cohesive pipeline for
 real-time voice interaction on Raspberry Pi 5.
 """
 
+import argparse
 import asyncio
+import json
 import logging
+import random
 import signal
 import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Tuple
 from pathlib import Path
 
 from .config import Config
 from .audio import AudioManager
+from .audio_frame import AudioFrame
 from .wake_word import WakeWordDetector
 from .speech_to_text import SpeechToTextEngine
+from .command_spotter import CommandSpotter
 from .text_to_speech import TextToSpeechEngine
 from .skills_persona import SkillsPersonaEngine as PersonaManager
 from .errors import AthinaError, AudioError, WakeWordError, STTError, TTSError
-from .logging_cfg import setup_logging, PerformanceTimer
+from .logging_cfg import setup_logging, PerformanceTimer, STARTUP_PROFILER
+
+
+# Fixed pipeline prompts (also pre-synthesized into the TTS cache)
+NO_SPEECH_RESPONSE = "I didn't hear anything. Please try again."
+NOT_UNDERSTOOD_RESPONSE = "I couldn't understand what you said. Please try again."
+ERROR_RESPONSE = "I'm sorry, I encountered an error. Please try again."
+UNKNOWN_RESPONSE = "I'm sorry, I don't know how to respond to that."
 
 
 class AthinaPipeline:
@@ -50,6 +62,7 @@ class AthinaPipeline:
         self.audio_manager = AudioManager(self.config)
         self.wake_word_detector = WakeWordDetector(self.config)
         self.stt_engine = SpeechToTextEngine(self.config)
+        self.command_spotter = CommandSpotter(self.config)
         self.tts_engine = TextToSpeechEngine(self.config)
         self.persona_manager = PersonaManager(self.config)
         
@@ -65,9 +78,24 @@ class AthinaPipeline:
         self.successful_interactions = 0
         self.average_response_time = 0.0
         
+        # Latency from transcript to first audio: perceived includes
+        # acknowledgements, true only counts the actual answer
+        self.latency_samples = 0
+        self.average_perceived_latency = 0.0
+        self.average_true_latency = 0.0
+        self.acknowledgements_played = 0
+        
+        # Latency from transcript to the first piece of response text
+        self.first_token_samples = 0
+        self.average_time_to_first_token = 0.0
+        
         # Shutdown handling
         self.shutdown_event = asyncio.Event()
         
+        # Background TTS cache and network connection warm-up
+        self.prewarm_task = None
+        self.network_warmup_task = None
+        
         self.logger.info("Athina pipeline initialized")
     
     async def initialize(self) -> None:
@@ -92,6 +120,7 @@ class AthinaPipeline:
             
             self.is_initialized = True
             self.session_start_time = time.time()
+            STARTUP_PROFILER.mark('pipeline', 'initialized')
             
             self.logger.info("Athina voice assistant initialized successfully")
             
@@ -103,7 +132,8 @@ class AthinaPipeline:
         """Initialize audio manager."""
         try:
             self.logger.info("Initializing audio system...")
-            await self.audio_manager.initialize()
+            with STARTUP_PROFILER.measure('audio', 'initialize'):
+                await self.audio_manager.initialize()
             
             # Set up audio callback for wake word detection
             self.audio_manager.set_audio_callback(self._audio_callback)
@@ -115,7 +145,8 @@ class AthinaPipeline:
         """Initialize wake word detector."""
         try:
             self.logger.info("Initializing wake word detection...")
-            await self.wake_word_detector.initialize()
+            with STARTUP_PROFILER.measure('wake_word', 'initialize'):
+                await self.wake_word_detector.initialize()
             
             # Set up wake word detection callback
             self.wake_word_detector.set_detection_callback(self._wake_word_callback)
@@ -127,16 +158,22 @@ class AthinaPipeline:
         """Initialize speech-to-text engine."""
         try:
             self.logger.info("Initializing speech-to-text...")
-            await self.stt_engine.initialize()
+            with STARTUP_PROFILER.measure('stt', 'initialize'):
+                await self.stt_engine.initialize()
             
         except Exception as e:
             raise STTError(f"STT initialization failed: {e}") from e
+        
+        # Command spotting is optional and never blocks startup
+        with STARTUP_PROFILER.measure('command_spotting', 'initialize'):
+            await self.command_spotter.initialize()
     
     async def _initialize_tts(self) -> None:
         """Initialize text-to-speech engine."""
         try:
             self.logger.info("Initializing text-to-speech...")
-            await self.tts_engine.initialize()
+            with STARTUP_PROFILER.measure('tts', 'initialize'):
+                await self.tts_engine.initialize()
             
         except Exception as e:
             raise TTSError(f"TTS initialization failed: {e}") from e
@@ -145,7 +182,8 @@ class AthinaPipeline:
         """Initialize persona manager."""
         try:
             self.logger.info("Initializing persona...")
-            await self.persona_manager.initialize()
+            with STARTUP_PROFILER.measure('persona', 'initialize'):
+                await self.persona_manager.initialize()
             
         except Exception as e:
             self.logger.warning(f"Persona initialization failed: {e}")
@@ -170,12 +208,12 @@ class AthinaPipeline:
         self.logger.info("Shutdown signal received")
         self.shutdown_event.set()
     
-    def _audio_callback(self, audio_data) -> None:
+    def _audio_callback(self, frame: AudioFrame) -> None:
         """
         Callback for incoming audio data.
         
         Args:
-            audio_data: Audio chunk from microphone
+            frame: Audio chunk from microphone
         """
         if not self.is_listening or self.is_processing:
             return
@@ -183,21 +221,21 @@ class AthinaPipeline:
         try:
             # Process audio for wake word detection
             # This runs in the audio thread, so we need to be fast
-            asyncio.create_task(self._process_audio_chunk(audio_data))
+            asyncio.create_task(self._process_audio_chunk(frame))
             
         except Exception as e:
             self.logger.error(f"Audio callback error: {e}")
     
-    async def _process_audio_chunk(self, audio_data) -> None:
+    async def _process_audio_chunk(self, frame: AudioFrame) -> None:
         """
         Process audio chunk for wake word detection.
         
         Args:
-            audio_data: Audio chunk to process
+            frame: Audio chunk to process
         """
         try:
             # Detect wake word
-            detected = await self.wake_word_detector.detect(audio_data)
+            detected = await self.wake_word_detector.detect(frame)
             
             # Wake word callback will handle the detection
             
@@ -238,37 +276,60 @@ class AthinaPipeline:
                 
                 # Record speech
                 self.logger.info("Listening for speech...")
-                audio_data = await self.audio_manager.record_speech(
+                recording = await self.audio_manager.record_speech(
                     timeout=self.config.pipeline.speech_timeout
                 )
                 
-                if audio_data is None:
+                if recording is None:
                     self.logger.info("No speech detected")
-                    await self._speak_response("I didn't hear anything. Please try again.")
+                    await self._speak_response(NO_SPEECH_RESPONSE)
                     return
                 
-                # Transcribe speech
-                self.logger.info("Transcribing speech...")
-                transcript = await self.stt_engine.transcribe(audio_data)
+                # Drop leading/trailing silence and split at pauses
+                segments = self.audio_manager.segment_speech(recording)
                 
-                if not transcript:
-                    self.logger.info("No speech recognized")
-                    await self._speak_response("I couldn't understand what you said. Please try again.")
+                if not segments:
+                    self.logger.info("No speech in recording, skipping transcription")
+                    await self._speak_response(NO_SPEECH_RESPONSE)
                     return
                 
-                self.logger.info(f"User said: '{transcript}'")
-                
-                # Process with persona
-                self.logger.info("Generating response...")
-                response = await self.persona_manager.process_input(transcript)
+                # Fast path: spot common commands without running Whisper
+                hit = await self.command_spotter.spot(AudioFrame.concatenate(segments))
                 
-                if not response:
-                    response = "I'm sorry, I don't know how to respond to that."
-                
-                self.logger.info(f"Response: '{response}'")
+                if hit:
+                    self.logger.info(
+                        f"Command '{hit.command}' spotted (confidence: {hit.confidence:.3f}), "
+                        f"skipping transcription"
+                    )
+                    self.command_spotter.record_hit(
+                        hit, self.stt_engine.average_transcription_time * len(segments)
+                    )
+                    request_time = time.time()
+                    response_stream = self._generate_response(hit.utterance, skill_name=hit.skill)
+                else:
+                    # Transcribe speech
+                    self.logger.info(f"Transcribing {len(segments)} speech segment(s)...")
+                    transcripts = []
+                    for segment in segments:
+                        text = await self.stt_engine.transcribe(segment)
+                        if text:
+                            transcripts.append(text)
+                    transcript = ' '.join(transcripts)
+                    
+                    if not transcript:
+                        self.logger.info("No speech recognized")
+                        await self._speak_response(NOT_UNDERSTOOD_RESPONSE)
+                        return
+                    
+                    self.logger.info(f"User said: '{transcript}'")
+                    
+                    # Process with persona
+                    self.logger.info("Generating response...")
+                    request_time = time.time()
+                    response_stream = self._generate_response(transcript)
                 
-                # Speak response
-                await self._speak_response(response)
+                # Speak response, acknowledging first if it is slow to arrive
+                await self._respond(response_stream, request_time)
                 
                 # Update statistics
                 self.total_interactions += 1
@@ -287,22 +348,159 @@ class AthinaPipeline:
             self.total_interactions += 1
             
             try:
-                await self._speak_response("I'm sorry, I encountered an error. Please try again.")
+                await self._speak_response(ERROR_RESPONSE)
             except:
                 pass  # Don't fail on error response
                 
         finally:
             self.is_processing = False
     
-    async def _speak_response(self, text: str) -> None:
+    def _generate_response(self, text: str, skill_name: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Start generating the response to an utterance.
+        
+        Args:
+            text: Transcript or spotted command utterance
+            skill_name: Optional skill to dispatch to directly
+            
+        Returns:
+            Async iterator of response text pieces; a single piece unless
+            streaming responses are enabled
+        """
+        if self.config.pipeline.stream_responses:
+            return self.persona_manager.process_input_stream(text, skill_name=skill_name)
+        return self._single_piece(self.persona_manager.process_input(text, skill_name=skill_name))
+    
+    @staticmethod
+    async def _single_piece(response: Awaitable[str]) -> AsyncIterator[str]:
+        """Deliver a complete response as a one-piece stream."""
+        yield await response
+    
+    @staticmethod
+    async def _first_piece(stream: AsyncIterator[str]) -> str:
+        """First piece of a response stream, or an empty string if it has none."""
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return ''
+    
+    async def _respond(self, response_stream: AsyncIterator[str], request_time: float) -> None:
+        """
+        Speak a response as it is generated, masking a slow start with a short acknowledgement.
+        
+        If no response text has arrived within the acknowledgement deadline,
+        a pre-synthesized acknowledgement is played while waiting, and the
+        answer starts as soon as the acknowledgement finishes. Streamed
+        responses are spoken sentence by sentence while the rest is generated.
+        
+        Args:
+            response_stream: Async iterator producing the response text
+            request_time: When the request was handed to the persona engine
+        """
+        first_task = asyncio.create_task(self._first_piece(response_stream))
+        ack_task, ack_started = await self._acknowledge_if_slow(first_task)
+        
+        try:
+            first = await first_task
+        except Exception:
+            if ack_task:
+                await ack_task
+            raise
+        
+        self._record_time_to_first_token(time.time() - request_time)
+        
+        if first:
+            async def pieces() -> AsyncIterator[str]:
+                yield first
+                async for piece in response_stream:
+                    yield piece
+            
+            try:
+                response = await self.tts_engine.speak_stream(pieces(), after=ack_task)
+                self.logger.info(f"Response: '{response}'")
+            except Exception as e:
+                self.logger.error(f"Failed to speak response: {e}")
+        else:
+            await response_stream.aclose()
+            self.logger.info(f"Response: '{UNKNOWN_RESPONSE}'")
+            await self._speak_response(UNKNOWN_RESPONSE, after=ack_task)
+        
+        if ack_task and not ack_task.done():
+            await ack_task
+        
+        self._record_latency(request_time, ack_started)
+    
+    async def _acknowledge_if_slow(self, response_task: asyncio.Task) -> Tuple[Optional[asyncio.Task], Optional[float]]:
+        """
+        Start an acknowledgement if the response misses the acknowledgement deadline.
+        
+        Args:
+            response_task: Task completing when the response starts
+            
+        Returns:
+            Tuple of (acknowledgement task or None, time it started or None)
+        """
+        if not self.config.pipeline.acknowledgement_enabled:
+            return None, None
+        
+        done, _ = await asyncio.wait(
+            {response_task}, timeout=self.config.pipeline.acknowledgement_deadline
+        )
+        acknowledgement = None if done else self._pick_acknowledgement()
+        if not acknowledgement:
+            return None, None
+        
+        self.logger.info(f"Response pending, acknowledging: '{acknowledgement}'")
+        ack_started = time.time()
+        ack_task = asyncio.create_task(self._speak_response(acknowledgement))
+        self.acknowledgements_played += 1
+        return ack_task, ack_started
+    
+    def _pick_acknowledgement(self) -> Optional[str]:
+        """Choose an acknowledgement that can be played without synthesis."""
+        candidates = [
+            phrase for phrase in self.persona_manager.acknowledgement_messages
+            if self.tts_engine.is_cached(phrase)
+        ]
+        return random.choice(candidates) if candidates else None
+    
+    def _record_latency(self, request_time: float, ack_started: Optional[float]) -> None:
+        """Record perceived and true response latency for one interaction."""
+        answer_started = self.tts_engine.last_first_audio_at
+        if answer_started < request_time:
+            return  # Nothing was played
+        
+        true_latency = answer_started - request_time
+        perceived_latency = (ack_started - request_time) if ack_started else true_latency
+        
+        self.latency_samples += 1
+        self.average_true_latency += (true_latency - self.average_true_latency) / self.latency_samples
+        self.average_perceived_latency += (
+            (perceived_latency - self.average_perceived_latency) / self.latency_samples
+        )
+        
+        self.logger.debug(
+            f"Response latency: perceived {perceived_latency:.2f}s, true {true_latency:.2f}s"
+        )
+    
+    def _record_time_to_first_token(self, latency: float) -> None:
+        """Record the delay between the transcript and the first piece of response text."""
+        self.first_token_samples += 1
+        self.average_time_to_first_token += (
+            (latency - self.average_time_to_first_token) / self.first_token_samples
+        )
+        self.logger.debug(f"Time to first response text: {latency:.2f}s")
+    
+    async def _speak_response(self, text: str, after: Optional[asyncio.Task] = None) -> None:
         """
         Speak a response using TTS.
         
         Args:
             text: Text to speak
+            after: Optional task (e.g. an acknowledgement) to finish before playback
         """
         try:
-            await self.tts_engine.speak(text)
+            await self.tts_engine.speak(text, after=after)
         except Exception as e:
             self.logger.error(f"Failed to speak response: {e}")
     
@@ -324,9 +522,17 @@ class AthinaPipeline:
             # Start listening
             self.is_listening = True
             self.is_running = True
+            STARTUP_PROFILER.mark('pipeline', 'listening')
             
             self.logger.info("Athina voice assistant started - listening for wake word...")
             
+            # Pre-synthesize fixed phrases while no interaction is running
+            if self.config.tts.cache_prewarm:
+                self.prewarm_task = asyncio.create_task(self._prewarm_tts_cache())
+            
+            # Network setup happens after the assistant is ready, never before
+            self.network_warmup_task = asyncio.create_task(self._warm_up_network())
+            
             # Main loop - wait for shutdown
             await self.shutdown_event.wait()
             
@@ -336,6 +542,23 @@ class AthinaPipeline:
         finally:
             await self.stop()
     
+    async def _prewarm_tts_cache(self) -> None:
+        """Fill the TTS cache with fixed persona and pipeline phrases."""
+        phrases = self.persona_manager.get_fixed_phrases()
+        phrases.extend([NO_SPEECH_RESPONSE, NOT_UNDERSTOOD_RESPONSE, ERROR_RESPONSE])
+        
+        try:
+            await self.tts_engine.prewarm(phrases, idle=lambda: not self.is_processing)
+        except Exception as e:
+            self.logger.warning(f"TTS cache warm-up failed: {e}")
+    
+    async def _warm_up_network(self) -> None:
+        """Create API clients and open pooled connections."""
+        try:
+            await self.persona_manager.warm_up()
+        except Exception as e:
+            self.logger.warning(f"Network warm-up failed: {e}")
+    
     async def stop(self) -> None:
         """Stop the voice assistant pipeline."""
         if not self.is_running:
@@ -347,6 +570,10 @@ class AthinaPipeline:
             self.is_running = False
             self.is_listening = False
             
+            for task in (self.prewarm_task, self.network_warmup_task):
+                if task and not task.done():
+                    task.cancel()
+            
             # Wait for any ongoing processing to complete
             max_wait = 5.0  # 5 seconds
             wait_start = time.time()
@@ -396,6 +623,9 @@ class AthinaPipeline:
                 'stats': stt_stats
             }
             
+            # Command spotting is optional, so it never affects overall health
+            health_status['command_spotting'] = self.command_spotter.get_statistics()
+            
             # Check TTS engine
             tts_stats = self.tts_engine.get_statistics()
             health_status['components']['tts'] = {
@@ -426,6 +656,10 @@ class AthinaPipeline:
                 'successful_interactions': self.successful_interactions,
                 'success_rate': (self.successful_interactions / max(self.total_interactions, 1)) * 100,
                 'average_response_time': self.average_response_time,
+                'average_perceived_latency': self.average_perceived_latency,
+                'average_true_latency': self.average_true_latency,
+                'acknowledgements_played': self.acknowledgements_played,
+                'average_time_to_first_token': self.average_time_to_first_token,
             }
             
         except Exception as e:
@@ -450,6 +684,9 @@ class AthinaPipeline:
             if hasattr(self, 'tts_engine'):
                 await self.tts_engine.shutdown()
             
+            if hasattr(self, 'command_spotter'):
+                await self.command_spotter.shutdown()
+            
             if hasattr(self, 'stt_engine'):
                 await self.stt_engine.shutdown()
             
@@ -467,15 +704,38 @@ class AthinaPipeline:
             self.logger.error(f"Error during shutdown: {e}")
 
 
-async def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Athina Voice Assistant")
+    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Initialize all components, report import and model-load "
+                             "times per component, then exit")
+    parser.add_argument("--profile-output",
+                        help="Also write the startup profile as JSON to this file")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
     """Main entry point for the Athina voice assistant."""
+    args = parse_args(argv)
     pipeline = None
     
     try:
         # Initialize pipeline
-        pipeline = AthinaPipeline()
+        pipeline = AthinaPipeline(args.config)
         await pipeline.initialize()
         
+        if args.profile_startup:
+            # Shown after "pipeline: initialized" to confirm the network is off the boot path
+            await pipeline._warm_up_network()
+            print(STARTUP_PROFILER.format_report())
+            if args.profile_output:
+                Path(args.profile_output).write_text(
+                    json.dumps(STARTUP_PROFILER.get_report(), indent=2)
+                )
+            return
+        
         # Start the assistant
         await pipeline.start()
         
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Athina Mock OpenAI Server
+
+A local stand-in for the part of the OpenAI API Athina uses: chat
+completions, streamed (server-sent events) or not, and model lookups. Its
+timing and failures are configurable and seeded, so NLPRouter, the
+circuit breaker, the rate limiter and streaming TTS can be benchmarked
+deterministically on a machine without network access.
+
+Usage:
+    python -m athina.mock_openai_server --port 8080 --ttft 0.4 \\
+        --ttft-spread 0.1 --tokens-per-second 30 --error-rate 0.05
+
+    OPENAI_BASE_URL=http://127.0.0.1:8080/v1 OPENAI_API_KEY=test python main.py
+
+In-process, for scripts and tests::
+
+    async with MockOpenAIServer(ServerProfile(ttft=LatencyDistribution(2.0))) as server:
+        config.openai.base_url = server.base_url
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Set
+
+logger = logging.getLogger(__name__)
+
+# Latency distribution kinds
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+DEFAULT_REPLY = (
+    "Here is a mock answer from the local test server. It is long enough to span "
+    "several sentences, so streaming speech has something to split. The end."
+)
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class LatencyDistribution:
+    """Random delay in seconds, never negative."""
+    mean: float = 0.0
+    spread: float = 0.0  # Half-width for uniform, standard deviation for normal, sigma for lognormal
+    kind: str = "fixed"
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay."""
+        if self.kind == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "normal":
+            value = rng.gauss(self.mean, self.spread)
+        elif self.kind == "lognormal":
+            # Median at the mean, with a long tail like real network latency
+            value = self.mean * rng.lognormvariate(0.0, self.spread) if self.mean > 0 else 0.0
+        else:
+            value = self.mean
+        return max(0.0, value)
+
+
+@dataclass
+class ServerProfile:
+    """How the mock server behaves."""
+    ttft: LatencyDistribution = field(default_factory=lambda: LatencyDistribution(0.3))
+    tokens_per_second: float = 40.0  # 0 = the whole reply at once
+    error_rate: float = 0.0  # Fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # Fraction of requests answered with HTTP 429
+    retry_after: float = 1.0  # Retry-After seconds sent with 429s
+    stall_rate: float = 0.0  # Fraction of requests that pause mid-response
+    stall_seconds: float = 30.0
+    reply: str = DEFAULT_REPLY
+    echo_prompt: bool = False  # Start the reply with the last user message
+    seed: Optional[int] = 0  # None for non-deterministic behaviour
+
+
+@dataclass
+class _Request:
+    """A parsed HTTP request."""
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+
+class MockOpenAIServer:
+    """
+    Asyncio HTTP/1.1 server implementing chat completions and model lookups.
+
+    Connections are kept alive like the real API's, and streamed replies
+    use chunked transfer encoding with server-sent events.
+    """
+
+    def __init__(self, profile: Optional[ServerProfile] = None):
+        """
+        Initialize MockOpenAIServer.
+
+        Args:
+            profile: Behaviour settings; defaults to a healthy, fast server
+        """
+        self.profile = profile or ServerProfile()
+        self.rng = random.Random(self.profile.seed)
+        self.host = "127.0.0.1"
+        self.port = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connection_tasks: Set[asyncio.Task] = set()
+
+        # Statistics
+        self.requests = 0
+        self.outcomes: Dict[str, int] = {}
+        self.connections = 0
+
+    @property
+    def base_url(self) -> str:
+        """API base URL to configure as openai.base_url."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Start listening.
+
+        Args:
+            host: Interface to bind
+            port: TCP port, 0 for any free port
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self.host = host
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock OpenAI server listening on {self.base_url}")
+
+    async def stop(self) -> None:
+        """Stop listening, close open keep-alive connections and close the server."""
+        if self._server is not None:
+            self._server.close()
+            tasks = list(self._connection_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> 'MockOpenAIServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _count(self, outcome: str) -> None:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        self.connections += 1
+        task = asyncio.current_task()
+        self._connection_tasks.add(task)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                keep_alive = request.headers.get('connection', '').lower() != 'close'
+                await self._dispatch(request, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Closed by stop(); ending normally keeps the stream callback
+            # from logging the cancellation as an error
+            pass
+        except Exception as e:
+            logger.error(f"Mock server error: {e}")
+        finally:
+            self._connection_tasks.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[_Request]:
+        """Read one request, or None when the client closed the connection."""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0) or 0)
+        body = await reader.readexactly(length) if length else b''
+        return _Request(method, path.split('?', 1)[0], headers, body)
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter) -> None:
+        """Route a request to its endpoint."""
+        self.requests += 1
+        path = request.path.rstrip('/')
+
+        if request.method == 'POST' and path.endswith('/chat/completions'):
+            await self._chat_completions(request, writer)
+        elif request.method == 'GET' and '/models' in path:
+            model = path.rsplit('/models', 1)[1].lstrip('/')
+            self._count('models')
+            if model:
+                body = {'id': model, 'object': 'model', 'created': 0, 'owned_by': 'mock'}
+            else:
+                body = {'object': 'list', 'data': []}
+            await self._send_json(writer, 200, body)
+        else:
+            self._count('not_found')
+            await self._send_error(writer, 404, f"Unknown endpoint {request.method} {request.path}", 'not_found')
+
+    async def _chat_completions(self, request: _Request, writer: asyncio.StreamWriter) -> None:
+        """POST /v1/chat/completions."""
+        try:
+            payload = json.loads(request.body or b'{}')
+            messages = payload['messages']
+        except (ValueError, KeyError) as e:
+            self._count('bad_request')
+            await self._send_error(writer, 400, f"Invalid request: {e}", 'invalid_request_error')
+            return
+
+        profile = self.profile
+        roll = self.rng.random()
+        ttft = profile.ttft.sample(self.rng)
+        stall = self.rng.random() < profile.stall_rate
+
+        if roll < profile.rate_limit_rate:
+            self._count('rate_limited')
+            await asyncio.sleep(ttft)
+            await self._send_error(writer, 429, "Rate limit reached (mock)", 'rate_limit_exceeded',
+                                   {'retry-after': f"{profile.retry_after:g}"})
+            return
+
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            self._count('server_error')
+            await asyncio.sleep(ttft)
+            await self._send_error(writer, 500, "Internal error (mock)", 'server_error')
+            return
+
+        model = payload.get('model', 'mock-model')
+        pieces = self._reply_pieces(messages, payload.get('max_tokens'))
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages) // 4 + 1
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(pieces),
+            'total_tokens': prompt_tokens + len(pieces)
+        }
+
+        if payload.get('stream'):
+            include_usage = bool((payload.get('stream_options') or {}).get('include_usage'))
+            await self._stream_reply(writer, model, pieces, ttft, stall, usage if include_usage else None)
+        else:
+            delay = ttft + (len(pieces) / profile.tokens_per_second if profile.tokens_per_second > 0 else 0)
+            if stall:
+                delay += profile.stall_seconds
+                self._count('stalled')
+            await asyncio.sleep(delay)
+            await self._send_json(writer, 200, {
+                'id': f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': ''.join(pieces)},
+                    'finish_reason': 'stop'
+                }],
+                'usage': usage
+            })
+        self._count('ok')
+
+    def _reply_pieces(self, messages: List[Dict[str, Any]], max_tokens: Optional[int]) -> List[str]:
+        """Reply text split into word-sized tokens."""
+        reply = self.profile.reply
+        if self.profile.echo_prompt:
+            last_user = next((m.get('content') or '' for m in reversed(messages) if m.get('role') == 'user'), '')
+            reply = f"You said: {last_user}. {reply}"
+
+        words = reply.split(' ')
+        pieces = [word + ' ' for word in words[:-1]] + [words[-1]]
+        return pieces[:max_tokens] if max_tokens else pieces
+
+    async def _stream_reply(self, writer: asyncio.StreamWriter, model: str, pieces: List[str],
+                            ttft: float, stall: bool, usage: Optional[Dict[str, int]]) -> None:
+        """Send a reply as server-sent events at the profile's pace."""
+        profile = self.profile
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        interval = 1.0 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        stall_at = self.rng.randrange(len(pieces)) if stall and pieces else None
+
+        def chunk(delta: Dict[str, str], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+            }
+
+        writer.write(self._head(200, {
+            'content-type': 'text/event-stream',
+            'cache-control': 'no-cache',
+            'transfer-encoding': 'chunked'
+        }))
+        await writer.drain()
+
+        await asyncio.sleep(ttft)
+        await self._send_event(writer, chunk({'role': 'assistant', 'content': ''}))
+
+        for index, piece in enumerate(pieces):
+            if index == stall_at:
+                self._count('stalled')
+                await asyncio.sleep(profile.stall_seconds)
+            elif index and interval:
+                await asyncio.sleep(interval)
+            await self._send_event(writer, chunk({'content': piece}))
+
+        await self._send_event(writer, chunk({}, 'stop'))
+        if usage is not None:
+            final = chunk({})
+            final['choices'] = []
+            final['usage'] = usage
+            await self._send_event(writer, final)
+
+        await self._send_chunk(writer, b"data: [DONE]\n\n")
+        await self._send_chunk(writer, b"")  # Terminating chunk
+
+    async def _send_event(self, writer: asyncio.StreamWriter, data: Dict[str, Any]) -> None:
+        """Send one server-sent event."""
+        await self._send_chunk(writer, f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+
+    @staticmethod
+    async def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        """Send one chunk of a chunked response; empty data ends the response."""
+        writer.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _head(status: int, headers: Dict[str, str]) -> bytes:
+        """Status line and headers."""
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, body: Dict[str, Any],
+                         headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a complete JSON response."""
+        data = json.dumps(body).encode('utf-8')
+        writer.write(self._head(status, {
+            'content-type': 'application/json',
+            'content-length': str(len(data)),
+            **(headers or {})
+        }) + data)
+        await writer.drain()
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str, code: str,
+                          headers: Optional[Dict[str, str]] = None) -> None:
+        """Send an error in the API's format."""
+        await self._send_json(writer, status, {
+            'error': {'message': message, 'type': code, 'param': None, 'code': code}
+        }, headers)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get server statistics."""
+        return {
+            'base_url': self.base_url,
+            'requests': self.requests,
+            'connections': self.connections,
+            'outcomes': dict(self.outcomes),
+            'profile': asdict(self.profile)
+        }
+
+
+def _distribution(kind: str, mean: float, spread: float) -> LatencyDistribution:
+    return LatencyDistribution(mean=mean, spread=spread, kind=kind)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Mean seconds to the first token")
+    parser.add_argument("--ttft-spread", type=float, default=0.0)
+    parser.add_argument("--ttft-distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Fraction that pause mid-response")
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--echo-prompt", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the server until interrupted."""
+    profile = ServerProfile(
+        ttft=_distribution(args.ttft_distribution, args.ttft, args.ttft_spread),
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        reply=args.reply,
+        echo_prompt=args.echo_prompt,
+        seed=args.seed
+    )
+    server = MockOpenAIServer(profile)
+    await server.start(args.host, args.port)
+    print(f"Mock OpenAI API at {server.base_url} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(json.dumps(server.get_statistics()['outcomes']))
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,20 +2,69 @@
 """
 NLP Router for Athina Voice Assistant
 
-Intelligent routing system that decides between local processing and OpenAI API
-based on query complexity, network availability, and configuration settings.
+Intelligent routing system that decides between local processing, an
+in-process language model and the OpenAI API based on query complexity,
+network availability, estimated latency and configuration settings.
 """
 
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from dataclasses import dataclass
 
+from .providers.base import LLMProvider, ROUTE_CLOUD, ROUTE_LOCAL_LLM, ROUTE_LOCAL, ROUTE_SKILL
+from .providers.connectivity import NETWORK_OFFLINE
 from .providers.openai_provider import OpenAIProvider
+from .providers.response_cache import depends_on_conversation
+from .routing_policy import RoutingPolicy
 from .errors import AthinaError
 
 
+# Marks the end of a read-ahead stream
+_END = object()
+
+
+class _ReadAhead:
+    """
+    Reads an async text stream ahead in a task, so a hedge keeps generating
+    before anyone consumes it. Iterating yields the buffered deltas first.
+    """
+    
+    def __init__(self, source: AsyncIterator[str]):
+        self.source = source
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump())
+    
+    async def _pump(self) -> None:
+        try:
+            async for delta in self.source:
+                self.queue.put_nowait(delta)
+        except Exception as e:
+            self.queue.put_nowait(e)
+        finally:
+            self.queue.put_nowait(_END)
+    
+    def __aiter__(self) -> '_ReadAhead':
+        return self
+    
+    async def __anext__(self) -> str:
+        item = await self.queue.get()
+        if item is _END:
+            self.queue.put_nowait(_END)  # Stay exhausted
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+    
+    async def aclose(self) -> None:
+        """Stop reading and close the source stream."""
+        if not self.task.done():
+            self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        await self.source.aclose()
+
+
 @dataclass
 class RoutingDecision:
     """Represents a routing decision with metadata."""
@@ -24,42 +73,70 @@ class RoutingDecision:
     reason: str
     fallback_available: bool
     processing_time: float = 0.0
+    time_to_first_token: float = 0.0  # Set for streamed responses
+    latency_budget: Optional[float] = None  # Seconds the cloud answer was given
+    route: str = ROUTE_LOCAL  # ROUTE_CLOUD, ROUTE_LOCAL_LLM or ROUTE_LOCAL
+    network_state: str = NETWORK_OFFLINE  # When the decision was made
 
 
 class NLPRouter:
     """
     Intelligent NLP routing system for offline-first operation.
     
-    Routes queries between local processing and OpenAI API based on:
+    Routes queries between canned local answers, a local language model
+    and OpenAI API based on:
     - Query complexity and type
-    - Network availability
+    - Network availability, and latency and success rates measured per
+      route and network state
     - Local processing confidence
     - Rate limits and usage quotas
     - User preferences and configuration
     """
     
-    def __init__(self, config: Dict[str, Any], openai_provider: Optional[OpenAIProvider] = None):
+    def __init__(self, config: Dict[str, Any], openai_provider: Optional[OpenAIProvider] = None,
+                 local_provider: Optional[LLMProvider] = None):
         """
         Initialize NLP router.
         
         Args:
             config: Router configuration
-            openai_provider: OpenAI provider instance
+            openai_provider: OpenAI provider instance (cloud route)
+            local_provider: In-process language model provider (local LLM route)
         """
         self.logger = logging.getLogger(__name__)
         self.config = config
         self.openai_provider = openai_provider
+        self.local_provider = local_provider
+        
+        # Seconds a cloud answer may take before the local answer is used
+        fallback = config.get('fallback', {}) if isinstance(config, dict) else getattr(config, 'fallback', {})
+        self.latency_budget = fallback.get('latency_budget', 2.5)
+        
+        # Expected-utility route choice from measured per-route performance
+        policy = config.get('routing_policy', {}) if isinstance(config, dict) else getattr(config, 'routing_policy', {})
+        self.policy = RoutingPolicy(policy)
+        
+        # Learns which questions to prefetch answers for while idle
+        self.prefetcher = getattr(openai_provider, 'prefetcher', None)
         
         # Routing statistics
         self.total_queries = 0
         self.openai_queries = 0
         self.local_queries = 0
+        self.local_llm_queries = 0
         self.fallback_queries = 0
+        self.cached_answers = 0  # Served from the response cache instead of the canned answer
         self.failed_queries = 0
         
         # Performance tracking
         self.average_local_time = 0.0
         self.average_openai_time = 0.0
+        self.average_local_llm_time = 0.0
+        
+        # Hedged cloud requests: answered within budget, missed it, or failed first
+        self.budget_hits = 0
+        self.budget_misses = 0
+        self.cloud_failures = 0
         
         self.logger.info("NLP Router initialized")
     
@@ -78,48 +155,24 @@ class NLPRouter:
         context = context or {}
         
         self.total_queries += 1
+        if self.prefetcher:
+            self.prefetcher.record_query(user_input, first_turn=not self._has_prior_turns(user_input, context))
         
         try:
             # Make routing decision
             decision = await self._make_routing_decision(user_input, context)
             
-            response = None
-            
-            if decision.use_openai and self.openai_provider:
-                # Try OpenAI first
-                response = await self._process_with_openai(user_input, context)
-                
-                if response:
-                    self.openai_queries += 1
-                    decision.processing_time = time.time() - start_time
-                    self.average_openai_time = self._update_average(
-                        self.average_openai_time, decision.processing_time, self.openai_queries
-                    )
-                else:
-                    # OpenAI failed, try local fallback
-                    self.logger.warning("OpenAI processing failed, falling back to local")
-                    response = await self._process_locally(user_input, context)
-                    if response:
-                        self.fallback_queries += 1
-                        decision.reason += " (OpenAI failed, used local fallback)"
+            if decision.route == ROUTE_CLOUD and self.openai_provider:
+                # Race OpenAI against the local answer within the latency budget
+                response = await self._hedge_with_openai(user_input, context, decision, start_time)
+            else:
+                # A cached cloud answer beats the local model and the canned answer
+                response = self._cached_answer(user_input, context, decision, start_time)
+                if not response and decision.route == ROUTE_LOCAL_LLM:
+                    response = await self._process_with_local_llm(user_input, context, decision, start_time)
             
             if not response:
-                # Use local processing
-                response = await self._process_locally(user_input, context)
-                
-                if response:
-                    self.local_queries += 1
-                    decision.processing_time = time.time() - start_time
-                    self.average_local_time = self._update_average(
-                        self.average_local_time, decision.processing_time, self.local_queries
-                    )
-                    
-                    if not decision.use_openai:
-                        decision.reason = "Local processing (by design)"
-                else:
-                    self.failed_queries += 1
-                    decision.reason = "All processing methods failed"
-                    response = "I'm sorry, I'm having trouble processing your request right now."
+                response = await self._route_locally(user_input, context, decision, start_time)
             
             decision.processing_time = time.time() - start_time
             
@@ -141,56 +194,470 @@ class NLPRouter:
             
             return "I encountered an error processing your request.", decision
     
+    async def route_query_stream(self, user_input: str,
+                                 context: Dict[str, Any] = None) -> Tuple[AsyncIterator[str], RoutingDecision]:
+        """
+        Route a query and stream the response.
+        
+        OpenAI and local model responses are streamed as they are
+        generated; canned local responses arrive as a single piece. If
+        OpenAI fails, or its first token misses the latency budget, the
+        local answer is streamed instead.
+        
+        Args:
+            user_input: User's input text
+            context: Additional context for routing decision
+            
+        Returns:
+            Tuple of (async iterator of text deltas, routing_decision); the
+            decision's timings are filled in as the stream is consumed
+        """
+        start_time = time.time()
+        context = context or {}
+        
+        self.total_queries += 1
+        if self.prefetcher:
+            self.prefetcher.record_query(user_input, first_turn=not self._has_prior_turns(user_input, context))
+        
+        try:
+            decision = await self._make_routing_decision(user_input, context)
+        except Exception as e:
+            self.logger.error(f"Query routing failed: {e}")
+            self.failed_queries += 1
+            decision = RoutingDecision(
+                use_openai=False,
+                confidence=0.0,
+                reason=f"Routing error: {e}",
+                fallback_available=False,
+                processing_time=time.time() - start_time
+            )
+            return self._single("I encountered an error processing your request."), decision
+        
+        if decision.route == ROUTE_CLOUD and self.openai_provider:
+            return self._stream_with_openai(user_input, context, decision, start_time), decision
+        
+        response = self._cached_answer(user_input, context, decision, start_time)
+        if response:
+            decision.time_to_first_token = decision.processing_time
+            return self._single(response), decision
+        
+        if decision.route == ROUTE_LOCAL_LLM:
+            return self._stream_with_local_llm(user_input, context, decision, start_time), decision
+        
+        response = await self._route_locally(user_input, context, decision, start_time)
+        decision.processing_time = decision.time_to_first_token = time.time() - start_time
+        return self._single(response), decision
+    
+    async def _hedge_with_openai(self, user_input: str, context: Dict[str, Any],
+                                 decision: RoutingDecision, start_time: float) -> Optional[str]:
+        """
+        Race OpenAI against local processing within the query's latency budget.
+        
+        The local model starts generating alongside the cloud request. The
+        cloud answer is used if it arrives within the budget; otherwise it
+        is cancelled and the fallback answer is completed from where the
+        local model got to.
+        
+        Returns:
+            The chosen response, or None if neither produced one
+        """
+        budget = self._latency_budget(context)
+        decision.latency_budget = budget
+        
+        cloud_task = asyncio.create_task(self._process_with_provider(self.openai_provider, user_input, context))
+        hedge = self._start_local_hedge(user_input, context)
+        
+        try:
+            done, _ = await asyncio.wait({cloud_task}, timeout=budget)
+            response = cloud_task.result() if done else None
+            
+            if response:
+                self._record_cloud_answer(decision, start_time)
+                return response
+            
+            reason = self._record_cloud_miss(decision, bool(done), budget, start_time)
+            self.fallback_queries += 1
+            decision.reason += f" ({reason})"
+            return ''.join([delta async for delta in self._stream_fallback(user_input, context, decision,
+                                                                           start_time, hedge)])
+            
+        finally:
+            if not cloud_task.done():
+                cloud_task.cancel()
+            if hedge is not None:
+                await hedge.aclose()
+    
+    async def _stream_with_openai(self, user_input: str, context: Dict[str, Any],
+                                  decision: RoutingDecision, start_time: float) -> AsyncIterator[str]:
+        """
+        Stream an OpenAI response if its first token arrives within the latency budget.
+        
+        The local model streams alongside the cloud request into a buffer;
+        when the first cloud token is late or OpenAI fails, the local tokens
+        are streamed instead, starting with those already generated.
+        """
+        budget = self._latency_budget(context)
+        decision.latency_budget = budget
+        
+        deltas = self.openai_provider.stream_conversational_response(user_input, **self._conversation_kwargs(context))
+        first_task = asyncio.create_task(self._first_delta(deltas))
+        hedge = self._start_local_hedge(user_input, context)
+        
+        try:
+            done, _ = await asyncio.wait({first_task}, timeout=budget)
+            first = first_task.result() if done else None
+            
+            if first:
+                if hedge is not None:
+                    await hedge.aclose()
+                decision.time_to_first_token = time.time() - start_time
+                yield first
+                
+                try:
+                    async for delta in deltas:
+                        yield delta
+                except Exception as e:
+                    self.logger.error(f"OpenAI streaming failed: {e}")
+                
+                self._record_cloud_answer(decision, start_time)
+                return
+            
+            reason = self._record_cloud_miss(decision, bool(done), budget, start_time)
+            
+            # Stop the late request before answering locally
+            first_task.cancel()
+            await asyncio.gather(first_task, return_exceptions=True)
+            await deltas.aclose()
+            
+            self.fallback_queries += 1
+            decision.reason += f" ({reason})"
+            async for delta in self._stream_fallback(user_input, context, decision, start_time, hedge):
+                yield delta
+            
+        finally:
+            if not first_task.done():
+                first_task.cancel()
+            # The stream can only be closed once the task reading it has stopped
+            await asyncio.gather(first_task, return_exceptions=True)
+            await deltas.aclose()
+            if hedge is not None:
+                await hedge.aclose()
+    
+    def _start_local_hedge(self, user_input: str, context: Dict[str, Any]) -> Optional['_ReadAhead']:
+        """Start the local model's answer alongside a cloud request, if a local model is loaded."""
+        if not (self.local_provider and self.local_provider.is_available()):
+            return None
+        return _ReadAhead(
+            self.local_provider.stream_conversational_response(user_input, **self._conversation_kwargs(context))
+        )
+    
+    async def _stream_fallback(self, user_input: str, context: Dict[str, Any], decision: RoutingDecision,
+                               start_time: float, hedge: Optional['_ReadAhead']) -> AsyncIterator[str]:
+        """Answer after the cloud missed its budget or failed: cached, the hedged local model, else canned."""
+        cached = self._context_free_answer(user_input, context, local_model_route=hedge is not None)
+        if cached:
+            decision.processing_time = decision.time_to_first_token = time.time() - start_time
+            yield cached
+            return
+        
+        if hedge is not None:
+            async for delta in self._stream_with_local_llm(user_input, context, decision, start_time, hedge):
+                yield delta
+            return
+        
+        response = await self._route_locally(user_input, context, decision, start_time)
+        decision.processing_time = decision.time_to_first_token = time.time() - start_time
+        yield response
+    
+    async def _stream_with_local_llm(self, user_input: str, context: Dict[str, Any],
+                                     decision: RoutingDecision, start_time: float,
+                                     deltas: Optional[AsyncIterator[str]] = None) -> AsyncIterator[str]:
+        """
+        Stream the local model's answer, or the canned local answer if it produces nothing.
+        
+        Args:
+            deltas: Local model stream already started (e.g. as a hedge); a new one if None
+        """
+        if deltas is None:
+            deltas = self.local_provider.stream_conversational_response(
+                user_input, **self._conversation_kwargs(context)
+            )
+        produced = False
+        
+        try:
+            async for delta in deltas:
+                if not produced:
+                    produced = True
+                    decision.time_to_first_token = time.time() - start_time
+                yield delta
+        except Exception as e:
+            self.logger.error(f"Local LLM streaming failed: {e}")
+        finally:
+            await deltas.aclose()
+        
+        if produced:
+            self._record_local_llm_answer(decision, start_time)
+            return
+        
+        self.policy.record(ROUTE_LOCAL_LLM, decision.network_state, time.time() - start_time, success=False)
+        response = await self._route_locally(user_input, context, decision, start_time)
+        decision.processing_time = decision.time_to_first_token = time.time() - start_time
+        yield response
+    
+    async def _first_delta(self, deltas: AsyncIterator[str]) -> Optional[str]:
+        """First text delta of a stream, or None if it ends or fails first."""
+        try:
+            return await deltas.__anext__()
+        except StopAsyncIteration:
+            return None
+        except Exception as e:
+            self.logger.error(f"OpenAI streaming failed: {e}")
+            return None
+    
+    def _latency_budget(self, context: Dict[str, Any]) -> Optional[float]:
+        """Seconds the cloud answer may take for this query; None waits for it."""
+        budget = context.get('latency_budget', self.latency_budget)
+        return budget if budget and budget > 0 else None
+    
+    def _record_cloud_answer(self, decision: RoutingDecision, start_time: float) -> None:
+        """Count an OpenAI answer that arrived within the latency budget."""
+        self.budget_hits += 1
+        self.openai_queries += 1
+        decision.processing_time = time.time() - start_time
+        self.average_openai_time = self._update_average(
+            self.average_openai_time, decision.processing_time, self.openai_queries
+        )
+        self.policy.record(ROUTE_CLOUD, decision.network_state,
+                           decision.time_to_first_token or decision.processing_time)
+    
+    def _record_local_llm_answer(self, decision: RoutingDecision, start_time: float) -> None:
+        """Count an answer from the local model."""
+        self.local_llm_queries += 1
+        decision.processing_time = time.time() - start_time
+        self.average_local_llm_time = self._update_average(
+            self.average_local_llm_time, decision.processing_time, self.local_llm_queries
+        )
+        self.policy.record(ROUTE_LOCAL_LLM, decision.network_state,
+                           decision.time_to_first_token or decision.processing_time)
+    
+    def _record_cloud_miss(self, decision: RoutingDecision, failed: bool, budget: Optional[float],
+                           start_time: float) -> str:
+        """
+        Count an OpenAI request whose answer is not used.
+        
+        Args:
+            decision: The routing decision
+            failed: True if OpenAI failed, False if it missed the budget
+            budget: The latency budget in seconds
+            start_time: When the query arrived
+            
+        Returns:
+            Reason to note on the routing decision
+        """
+        self.policy.record(ROUTE_CLOUD, decision.network_state, time.time() - start_time, success=False)
+        if failed:
+            self.cloud_failures += 1
+            self.logger.warning("OpenAI processing failed, falling back to local")
+            return "OpenAI failed, used local fallback"
+        
+        self.budget_misses += 1
+        self.logger.info(f"OpenAI missed the {budget:.1f}s latency budget, answering locally")
+        return f"OpenAI missed the {budget:.1f}s latency budget, used local answer"
+    
+    async def _route_locally(self, user_input: str, context: Dict[str, Any],
+                             decision: RoutingDecision, start_time: float) -> str:
+        """Answer with local processing, updating the decision and statistics."""
+        local_start = time.time()
+        response = await self._process_locally(user_input, context)
+        
+        if response:
+            self.policy.record(ROUTE_LOCAL, decision.network_state, time.time() - local_start)
+            self.local_queries += 1
+            decision.processing_time = time.time() - start_time
+            self.average_local_time = self._update_average(
+                self.average_local_time, decision.processing_time, self.local_queries
+            )
+            
+            if decision.route == ROUTE_LOCAL:
+                decision.reason = "Local processing (by design)"
+        else:
+            self.failed_queries += 1
+            decision.reason = "All processing methods failed"
+            response = "I'm sorry, I'm having trouble processing your request right now."
+        
+        return response
+    
+    @staticmethod
+    async def _single(text: str) -> AsyncIterator[str]:
+        """Stream a complete response as one piece."""
+        yield text
+    
     async def _make_routing_decision(self, user_input: str, context: Dict[str, Any]) -> RoutingDecision:
-        """Make intelligent routing decision."""
+        """Choose a route and note the network state it was chosen in."""
+        network_state = self._network_state()
+        decision = self._choose_route(user_input, context, network_state)
+        decision.network_state = network_state
+        return decision
+    
+    def _choose_route(self, user_input: str, context: Dict[str, Any], network_state: str) -> RoutingDecision:
+        """
+        Choose the cloud, the local model or the canned local answer.
+        
+        In smart mode the routing policy weighs each route's expected gain
+        for this query against its measured latency and success rate.
+        Otherwise queries that need the cloud go there unless it is
+        expected to miss the latency budget while the local model is
+        expected to be faster; all other queries go to the local model
+        when one is loaded.
+        """
+        local_latency = self.local_provider.expected_latency() if self.local_provider else None
         
         # Check if OpenAI is available
         if not self.openai_provider or not self.openai_provider.is_available():
-            return RoutingDecision(
-                use_openai=False,
-                confidence=1.0,
-                reason="OpenAI not available",
-                fallback_available=True
-            )
+            return self._local_decision("OpenAI not available", local_latency)
+        
+        # Answer locally rather than wait for the rate limits to free up
+        wait = self.openai_provider.time_until_request_allowed()
+        if wait > 0:
+            return self._local_decision(f"OpenAI rate limited for {wait:.0f}s", local_latency)
+        
+        if self.policy.enabled and self.openai_provider.fallback_config['mode'] == 'smart':
+            return self._policy_decision(user_input, context, network_state, local_latency)
         
         # Let OpenAI provider make the decision
-        should_use_openai = self.openai_provider.should_use_openai(user_input, context)
+        if not self.openai_provider.should_use_openai(user_input, context):
+            return self._local_decision("Local processing selected", local_latency, confidence=0.9)
         
-        if should_use_openai:
+        cloud_latency = self.openai_provider.expected_latency()
+        budget = self._latency_budget(context)
+        if (local_latency is not None and cloud_latency is not None and budget
+                and cloud_latency > budget and local_latency < cloud_latency):
             return RoutingDecision(
-                use_openai=True,
+                use_openai=False,
                 confidence=0.8,
-                reason="OpenAI selected by smart routing",
-                fallback_available=True
+                reason=(
+                    f"OpenAI expected {cloud_latency:.1f}s exceeds the {budget:.1f}s budget, "
+                    f"local model expected {local_latency:.1f}s"
+                ),
+                fallback_available=True,
+                route=ROUTE_LOCAL_LLM
             )
-        else:
+        
+        return RoutingDecision(
+            use_openai=True,
+            confidence=0.8,
+            reason="OpenAI selected by smart routing",
+            fallback_available=True,
+            route=ROUTE_CLOUD
+        )
+    
+    def _policy_decision(self, user_input: str, context: Dict[str, Any], network_state: str,
+                         local_latency: Optional[float]) -> RoutingDecision:
+        """Decision of the routing policy; the keyword analysis only sets the cloud's expected gain."""
+        complex_query = self.openai_provider.should_use_openai(user_input, context)
+        route, utilities, explanation = self.policy.choose(
+            network_state, complex_query, self.openai_provider.expected_latency(), local_latency
+        )
+        
+        # Confidence grows with the margin over the runner-up route
+        ranked = sorted(utilities.values(), reverse=True)
+        margin = ranked[0] - ranked[1] if len(ranked) > 1 else 1.0
+        confidence = min(1.0, 0.5 + margin)
+        
+        names = {ROUTE_CLOUD: "OpenAI", ROUTE_LOCAL_LLM: "Local model", ROUTE_LOCAL: "Local processing"}
+        return RoutingDecision(
+            use_openai=route == ROUTE_CLOUD,
+            confidence=confidence,
+            reason=f"{names[route]} selected by {explanation}",
+            fallback_available=True,
+            route=route
+        )
+    
+    @staticmethod
+    def _local_decision(reason: str, local_latency: Optional[float], confidence: float = 1.0) -> RoutingDecision:
+        """Decision for a query answered on the device, by the local model if one is loaded."""
+        if local_latency is not None:
             return RoutingDecision(
                 use_openai=False,
-                confidence=0.9,
-                reason="Local processing selected",
-                fallback_available=self.openai_provider.is_available()
+                confidence=confidence,
+                reason=f"{reason}, using local model",
+                fallback_available=True,
+                route=ROUTE_LOCAL_LLM
             )
+        return RoutingDecision(
+            use_openai=False,
+            confidence=confidence,
+            reason=reason,
+            fallback_available=True,
+            route=ROUTE_LOCAL
+        )
+    
+    @staticmethod
+    def _conversation_kwargs(context: Dict[str, Any]) -> Dict[str, Any]:
+        """Conversation arguments for a provider's conversational reply."""
+        return {
+            'conversation_history': context.get('conversation_history', []),
+            'persona_context': context.get('persona_context', {}),
+            'conversation': context.get('conversation')
+        }
     
-    async def _process_with_openai(self, user_input: str, context: Dict[str, Any]) -> Optional[str]:
-        """Process query with OpenAI."""
+    async def _process_with_provider(self, provider: LLMProvider, user_input: str,
+                                     context: Dict[str, Any]) -> Optional[str]:
+        """Get a conversational reply from a language model provider."""
         try:
-            # Get conversation history and persona context
-            conversation_history = context.get('conversation_history', [])
-            persona_context = context.get('persona_context', {})
-            
-            # Use OpenAI for conversational response
-            response = await self.openai_provider.get_conversational_response(
-                user_input=user_input,
-                conversation_history=conversation_history,
-                persona_context=persona_context
-            )
-            
-            return response
+            return await provider.get_conversational_response(user_input, **self._conversation_kwargs(context))
             
         except Exception as e:
-            self.logger.error(f"OpenAI processing failed: {e}")
+            self.logger.error(f"{provider.name} processing failed: {e}")
             return None
     
+    async def _process_with_local_llm(self, user_input: str, context: Dict[str, Any],
+                                      decision: RoutingDecision, start_time: float) -> Optional[str]:
+        """Answer with the local model, recording the answer if there is one."""
+        response = await self._process_with_provider(self.local_provider, user_input, context)
+        if response:
+            self._record_local_llm_answer(decision, start_time)
+        else:
+            self.policy.record(ROUTE_LOCAL_LLM, decision.network_state, time.time() - start_time, success=False)
+        return response
+    
+    def _cached_answer(self, user_input: str, context: Dict[str, Any], decision: RoutingDecision,
+                       start_time: float) -> Optional[str]:
+        """Cached cloud answer to the question asked on its own, e.g. one prefetched while idle."""
+        response = self._context_free_answer(user_input, context, local_model_route=decision.route == ROUTE_LOCAL_LLM)
+        if response:
+            self.cached_answers += 1
+            decision.processing_time = time.time() - start_time
+            decision.reason += ", answered from the response cache"
+        return response
+    
+    def _context_free_answer(self, user_input: str, context: Dict[str, Any],
+                             local_model_route: bool) -> Optional[str]:
+        """
+        Cached answer to the query asked without conversation context, if it fits here.
+        
+        Mid-conversation, such an answer is only used for queries that do
+        not refer back to earlier turns, and never instead of the local
+        model, which sees the conversation.
+        """
+        if not self.openai_provider:
+            return None
+        if self._has_prior_turns(user_input, context) and (local_model_route or depends_on_conversation(user_input)):
+            return None
+        return self.openai_provider.get_context_free_answer(user_input)
+    
+    @staticmethod
+    def _has_prior_turns(user_input: str, context: Dict[str, Any]) -> bool:
+        """Whether the conversation has turns before this query (which may already be recorded)."""
+        conversation = context.get('conversation')
+        if conversation is not None:
+            turns, last = len(conversation), conversation.recent(1)
+        else:
+            history = context.get('conversation_history', [])
+            turns, last = len(history), history[-1:]
+        current = 1 if last and last[-1].get('role') == 'user' and last[-1].get('content') == user_input else 0
+        return turns > current
+    
     async def _process_locally(self, user_input: str, context: Dict[str, Any]) -> Optional[str]:
         """Process query with local systems."""
         try:
@@ -239,6 +706,21 @@ class NLPRouter:
         else:
             return "I understand you're asking about something, but I'm operating in limited mode right now. Could you try rephrasing your question?"
     
+    def record_skill_answer(self, latency: float) -> None:
+        """
+        Record a query a skill answered before routing.
+        
+        Args:
+            latency: Seconds the skill took
+        """
+        self.policy.record(ROUTE_SKILL, self._network_state(), latency)
+        if self.prefetcher:
+            self.prefetcher.note_activity()
+    
+    def _network_state(self) -> str:
+        """Current network state as seen by the cloud provider."""
+        return self.openai_provider.network_state() if self.openai_provider else NETWORK_OFFLINE
+    
     def _update_average(self, current_avg: float, new_value: float, count: int) -> float:
         """Update running average."""
         if count <= 1:
@@ -285,23 +767,52 @@ class NLPRouter:
             'total_queries': self.total_queries,
             'openai_queries': self.openai_queries,
             'local_queries': self.local_queries,
+            'local_llm_queries': self.local_llm_queries,
             'fallback_queries': self.fallback_queries,
+            'cached_answers': self.cached_answers,
             'failed_queries': self.failed_queries,
             'openai_percentage': (self.openai_queries / total) * 100,
             'local_percentage': (self.local_queries / total) * 100,
+            'local_llm_percentage': (self.local_llm_queries / total) * 100,
             'fallback_percentage': (self.fallback_queries / total) * 100,
             'failure_percentage': (self.failed_queries / total) * 100,
             'average_local_time': self.average_local_time,
             'average_openai_time': self.average_openai_time,
-            'openai_provider_stats': self.openai_provider.get_usage_stats() if self.openai_provider else {}
+            'average_local_llm_time': self.average_local_llm_time,
+            'latency_budget': self.latency_budget,
+            'budget_hits': self.budget_hits,
+            'budget_misses': self.budget_misses,
+            'cloud_failures': self.cloud_failures,
+            'budget_hit_rate': (self.budget_hits / max(self.budget_hits + self.budget_misses, 1)) * 100,
+            'routing_policy': self.policy.get_statistics(),
+            'openai_provider_stats': self.openai_provider.get_usage_stats() if self.openai_provider else {},
+            'local_llm_provider_stats': self.local_provider.get_usage_stats() if self.local_provider else {}
         }
     
+    def _providers(self) -> List[LLMProvider]:
+        """Configured language model providers."""
+        return [provider for provider in (self.openai_provider, self.local_provider) if provider]
+    
+    async def warm_up(self) -> None:
+        """Open provider connections, load local models and tokenizers once the assistant is listening."""
+        counters = [getattr(provider, 'token_counter', None) for provider in self._providers()]
+        await asyncio.gather(
+            *(provider.warm_up() for provider in self._providers()),
+            *(counter.warm_up() for counter in counters if counter is not None)
+        )
+    
+    async def shutdown(self) -> None:
+        """Shut down providers."""
+        for provider in self._providers():
+            await provider.shutdown()
+    
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on router and providers."""
         health_status = {
             'router_healthy': True,
             'local_processing_available': True,
             'openai_available': False,
+            'local_llm_available': False,
             'statistics': self.get_statistics()
         }
         
@@ -310,4 +821,9 @@ class NLPRouter:
             health_status['openai_available'] = openai_health['healthy']
             health_status['openai_health'] = openai_health
         
+        if self.local_provider:
+            local_health = await self.local_provider.health_check()
+            health_status['local_llm_available'] = local_health['healthy']
+            health_status['local_llm_health'] = local_health
+        
         return health_status
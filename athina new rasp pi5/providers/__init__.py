@@ -1,10 +1,13 @@
 """
 Athina Providers Package
 
-Contains provider implementations for external services like OpenAI
-that can enhance Athina's capabilities when online.
+Contains language model providers the NLP router chooses between: OpenAI,
+which enhances Athina's capabilities when online, and an in-process local
+model for open-ended questions without the cloud.
 """
 
+from .base import LLMProvider
 from .openai_provider import OpenAIProvider
+from .local_llm_provider import LocalLLMProvider
 
-__all__ = ['OpenAIProvider']
\ No newline at end of file
+__all__ = ['LLMProvider', 'OpenAIProvider', 'LocalLLMProvider']
@@ -0,0 +1,81 @@
+"""
+Provider Interface for Athina
+
+The NLP router talks to language model providers through this protocol,
+so the cloud provider and the in-process local model are interchangeable
+routes. Providers never raise from ``is_available`` or
+``expected_latency``; both are called on every routing decision and must
+not touch the network.
+"""
+
+from typing import Optional, Dict, Any, List, AsyncIterator, Protocol, runtime_checkable
+
+from ..conversation_context import ConversationContext
+
+# Routes the NLP router chooses between
+ROUTE_CLOUD = "cloud"
+ROUTE_LOCAL_LLM = "local_llm"
+ROUTE_LOCAL = "local"  # Canned persona fallback
+ROUTE_SKILL = "local_skill"  # Answered by a skill before routing
+
+
+@runtime_checkable
+class LLMProvider(Protocol):
+    """Chat, streaming chat, health and usage of a language model provider."""
+
+    name: str
+
+    def is_available(self) -> bool:
+        """Whether a request would be attempted now."""
+        ...
+
+    def expected_latency(self) -> Optional[float]:
+        """Estimated seconds until the first text of a reply, or None if unavailable."""
+        ...
+
+    async def get_conversational_response(self, user_input: str,
+                                          conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                          persona_context: Optional[Dict[str, Any]] = None,
+                                          conversation: Optional[ConversationContext] = None) -> Optional[str]:
+        """Complete reply in the persona's voice, or None if failed."""
+        ...
+
+    def stream_conversational_response(self, user_input: str,
+                                       conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                       persona_context: Optional[Dict[str, Any]] = None,
+                                       conversation: Optional[ConversationContext] = None
+                                       ) -> AsyncIterator[str]:
+        """Reply in the persona's voice as text deltas."""
+        ...
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Health report with at least a 'healthy' flag."""
+        ...
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Usage and latency statistics."""
+        ...
+
+    async def warm_up(self) -> None:
+        """Prepare clients or models in the background once the assistant is listening."""
+        ...
+
+    async def shutdown(self) -> None:
+        """Release clients, models and background tasks."""
+        ...
+
+
+def build_system_prompt(persona_traits: Optional[List[str]] = None) -> str:
+    """
+    System message that gives a model the persona's voice.
+
+    Args:
+        persona_traits: Personality traits of the persona
+
+    Returns:
+        System prompt text
+    """
+    system_prompt = "You are Athina, an elegant and sophisticated voice assistant."
+    if persona_traits:
+        system_prompt += f" Your personality traits: {', '.join(persona_traits)}."
+    return system_prompt
@@ -0,0 +1,405 @@
+"""
+Connectivity Monitoring for Athina Providers
+
+A background probe measures whether the API endpoint is reachable with a
+TCP (and for https, TLS) handshake, probing rarely while online and
+quickly, with growing intervals, while offline. Probe results and request
+outcomes feed a circuit breaker, so that while the network is down routing
+decisions are made instantly instead of waiting on timeouts and retries.
+"""
+
+import asyncio
+import logging
+import random
+import ssl
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Network states, combining probe results and the breaker
+NETWORK_ONLINE = "online"  # Endpoint reachable and the breaker closed
+NETWORK_DEGRADED = "degraded"  # Breaker open or half-open after failed requests
+NETWORK_OFFLINE = "offline"  # Last connectivity probe failed
+
+# Seconds the breaker stays open after its first trip, per error class;
+# repeated trips double this up to the breaker's maximum
+BACKOFF_BASE = {
+    'timeout': 5.0,
+    'connection': 5.0,
+    'server': 10.0,
+    'rate_limited': 30.0,
+    'auth': 300.0,
+    'unknown': 10.0,
+}
+
+# Error classes that open the breaker on the first occurrence
+IMMEDIATE_TRIP = {'rate_limited', 'auth'}
+
+# Error classes a successful connectivity probe can clear
+NETWORK_ERRORS = {'timeout', 'connection'}
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify a request failure for backoff purposes.
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        One of "timeout", "connection", "rate_limited", "auth", "server",
+        "client" or "unknown"; "client" errors are the request's fault and
+        do not count against the endpoint
+    """
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None and isinstance(getattr(error, 'details', None), dict):
+        status_code = error.details.get('status_code')
+
+    if status_code is not None:
+        if status_code == 429:
+            return 'rate_limited'
+        if status_code in (401, 403):
+            return 'auth'
+        if status_code >= 500:
+            return 'server'
+        if 400 <= status_code < 500:
+            return 'client'
+
+    name = type(error).__name__
+    if isinstance(error, asyncio.TimeoutError) or 'Timeout' in name:
+        return 'timeout'
+    if isinstance(error, (ConnectionError, OSError)) or 'Connection' in name:
+        return 'connection'
+    return 'unknown'
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After header), if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker with per-error-class backoff.
+
+    Closed passes requests. After ``failure_threshold`` consecutive
+    failures (or one rate-limit or auth failure) it opens for a backoff
+    period with jitter; when that expires, or a connectivity probe
+    succeeds, it goes half-open and lets one trial request through, whose
+    outcome closes it again or reopens it with a longer backoff.
+    """
+
+    def __init__(self, failure_threshold: int = 3, max_backoff: float = 300.0, jitter: float = 0.2):
+        """
+        Initialize CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            max_backoff: Upper limit for the open period in seconds
+            jitter: Random fraction (+/-) applied to each open period
+        """
+        self.logger = logging.getLogger(__name__)
+        self.failure_threshold = failure_threshold
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_trips = 0
+        self.open_until = 0.0
+        self.last_error_class: Optional[str] = None
+        self._trial_in_flight = False
+
+        # Statistics
+        self.total_trips = 0
+        self.rejected_requests = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an expired open period becomes half-open."""
+        if self._state == OPEN and time.monotonic() >= self.open_until:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def is_available(self) -> bool:
+        """Whether a request would be let through now, without claiming it."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._trial_in_flight)
+
+    def allow_request(self) -> bool:
+        """
+        Claim permission for a request.
+
+        Returns:
+            True if the request may go out; in half-open state only one
+            trial request is allowed at a time
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        self.rejected_requests += 1
+        return False
+
+    def time_until_retry(self) -> float:
+        """Seconds until the breaker lets a trial request through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request or probe trial."""
+        if self._state != CLOSED:
+            self.logger.info("Circuit breaker closed, endpoint reachable again")
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_trips = 0
+        self._trial_in_flight = False
+
+    def record_failure(self, error_class: str = 'unknown', retry_after: Optional[float] = None) -> None:
+        """
+        Count a failed request.
+
+        Args:
+            error_class: Result of classify_error
+            retry_after: Server-requested wait in seconds, if any
+        """
+        if error_class == 'client':
+            # The endpoint answered; the request itself was at fault
+            self._trial_in_flight = False
+            return
+
+        self.last_error_class = error_class
+        self.consecutive_failures += 1
+
+        if (self.state == HALF_OPEN or error_class in IMMEDIATE_TRIP
+                or self.consecutive_failures >= self.failure_threshold):
+            self._trip(error_class, retry_after)
+
+    def release(self) -> None:
+        """Give back a claimed request that ended without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def force_open(self, error_class: str = 'connection') -> None:
+        """
+        Open the breaker immediately, e.g. when a connectivity probe fails.
+
+        A breaker already open keeps the error class it opened for, so a
+        rate-limit or auth trip is not later taken for a network outage
+        and ended early by a successful probe.
+        """
+        if self._state != OPEN:
+            self.last_error_class = error_class
+            self._trip(error_class)
+
+    def probe_succeeded(self) -> None:
+        """Let a trial request through early once the endpoint is reachable again."""
+        # Reachability says nothing about rate limits or credentials
+        if self._state == OPEN and self.last_error_class in NETWORK_ERRORS:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+            self.logger.info("Circuit breaker half-open after successful connectivity probe")
+
+    def _trip(self, error_class: str, retry_after: Optional[float] = None) -> None:
+        """Open the breaker with exponential, jittered backoff."""
+        base = BACKOFF_BASE.get(error_class, BACKOFF_BASE['unknown'])
+        backoff = min(self.max_backoff, base * (2 ** self.consecutive_trips))
+        backoff *= 1.0 + random.uniform(-self.jitter, self.jitter)
+        if retry_after:
+            backoff = max(backoff, retry_after)
+
+        self._state = OPEN
+        self.open_until = time.monotonic() + backoff
+        self.consecutive_trips += 1
+        self.total_trips += 1
+        self._trial_in_flight = False
+
+        self.logger.warning(f"Circuit breaker open for {backoff:.1f}s after {error_class} failure")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics."""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error_class': self.last_error_class,
+            'seconds_until_retry': self.time_until_retry(),
+            'total_trips': self.total_trips,
+            'rejected_requests': self.rejected_requests
+        }
+
+
+class ConnectivityMonitor:
+    """
+    Background reachability probe for an HTTP(S) endpoint.
+
+    Each probe opens a TCP connection to the endpoint's host and port and,
+    for https URLs, completes the TLS handshake; no HTTP request is sent.
+    """
+
+    def __init__(self, url: str, breaker: CircuitBreaker, probe_timeout: float = 2.0,
+                 online_interval: float = 30.0, offline_min_interval: float = 2.0,
+                 offline_max_interval: float = 60.0):
+        """
+        Initialize ConnectivityMonitor.
+
+        Args:
+            url: Endpoint base URL
+            breaker: Circuit breaker fed with probe results
+            probe_timeout: Seconds before a probe counts as failed
+            online_interval: Seconds between probes while reachable
+            offline_min_interval: First retry interval after going offline
+            offline_max_interval: Longest interval between probes while offline
+        """
+        self.logger = logging.getLogger(__name__)
+        self.breaker = breaker
+        self.probe_timeout = probe_timeout
+        self.online_interval = online_interval
+        self.offline_min_interval = offline_min_interval
+        self.offline_max_interval = offline_max_interval
+
+        parsed = urlparse(url)
+        self.use_tls = parsed.scheme == 'https'
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or (443 if self.use_tls else 80)
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+        self.is_online: Optional[bool] = None  # None until the first probe
+        self.last_probe_time = 0.0
+        self.last_probe_latency = 0.0
+        self._offline_interval = offline_min_interval
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.total_probes = 0
+        self.failed_probes = 0
+        self.average_probe_latency = 0.0
+        self.state_changes = 0
+
+    def start(self) -> None:
+        """Start probing in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background probe."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def request_probe(self) -> None:
+        """Probe soon, e.g. after a request failed."""
+        self._wake.set()
+
+    async def probe(self) -> bool:
+        """
+        Check whether the endpoint accepts connections.
+
+        Returns:
+            True if the handshake completed within the probe timeout
+        """
+        start_time = time.perf_counter()
+        writer = None
+        try:
+            ssl_context = None
+            if self.use_tls:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+                ssl_context = self._ssl_context
+
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=ssl_context),
+                timeout=self.probe_timeout
+            )
+            reachable = True
+
+        except (OSError, asyncio.TimeoutError, ssl.SSLError) as e:
+            self.logger.debug(f"Connectivity probe to {self.host}:{self.port} failed: {e}")
+            reachable = False
+
+        finally:
+            if writer is not None:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+
+        self._record_probe(reachable, time.perf_counter() - start_time)
+        return reachable
+
+    def _record_probe(self, reachable: bool, latency: float) -> None:
+        """Update state and the breaker from a probe result."""
+        self.total_probes += 1
+        self.last_probe_time = time.time()
+
+        if reachable:
+            self.last_probe_latency = latency
+            self.average_probe_latency += (latency - self.average_probe_latency) / (
+                self.total_probes - self.failed_probes
+            )
+            self._offline_interval = self.offline_min_interval
+            self.breaker.probe_succeeded()
+        else:
+            self.failed_probes += 1
+            self.breaker.force_open('connection')
+
+        if reachable != self.is_online:
+            if self.is_online is not None:
+                self.state_changes += 1
+                self.logger.info(f"Network {'reachable' if reachable else 'unreachable'} ({self.host})")
+            self.is_online = reachable
+
+    def _next_interval(self) -> float:
+        """Seconds until the next probe: rare while online, backing off while offline."""
+        if self.is_online:
+            interval = self.online_interval
+        else:
+            interval = self._offline_interval
+            self._offline_interval = min(self.offline_max_interval, self._offline_interval * 2)
+        return interval * random.uniform(0.9, 1.1)
+
+    async def _run(self) -> None:
+        """Probe loop."""
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                self.logger.error(f"Connectivity probe error: {e}")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._next_interval())
+            except asyncio.TimeoutError:
+                pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get connectivity statistics."""
+        return {
+            'endpoint': f"{self.host}:{self.port}",
+            'online': self.is_online,
+            'last_probe_time': self.last_probe_time,
+            'last_probe_latency_ms': self.last_probe_latency * 1000,
+            'average_probe_latency_ms': self.average_probe_latency * 1000,
+            'total_probes': self.total_probes,
+            'failed_probes': self.failed_probes,
+            'state_changes': self.state_changes,
+            'running': self._task is not None and not self._task.done()
+        }
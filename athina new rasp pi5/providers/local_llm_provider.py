@@ -0,0 +1,376 @@
+"""
+Local Language Model Provider for Athina
+
+Runs a small quantized chat model in-process, so open-ended questions get
+a real answer when the cloud is slow or unreachable. Two backends are
+supported: llama.cpp (``llama-cpp-python``, GGUF files) and ONNX Runtime
+GenAI (a model directory with ``genai_config.json``). The model is loaded
+in the background once the assistant is listening, and generation runs on
+a dedicated worker thread, one request at a time.
+
+Any object with ``generate(messages, max_tokens, temperature)`` returning
+an iterator of text pieces can be passed as the backend, which is how the
+provider is exercised without a model file.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterator
+
+from .base import ROUTE_LOCAL_LLM, build_system_prompt
+from ..conversation_context import ConversationContext, ContextWindow, TokenCounter
+from ..lazy_imports import is_available, load
+from ..logging_cfg import STARTUP_PROFILER
+
+LLAMA_CPP_AVAILABLE = is_available('llama_cpp')
+ONNX_GENAI_AVAILABLE = is_available('onnxruntime_genai')
+
+# Weight of each new measurement in the running latency estimates
+LATENCY_SMOOTHING = 0.3
+
+# Sentinel returned by the worker when a generation is exhausted
+_DONE = object()
+
+
+class LlamaCppBackend:
+    """GGUF model run with llama.cpp."""
+
+    def __init__(self, model_path: Path, context_tokens: int = 2048, threads: int = 0):
+        """
+        Initialize LlamaCppBackend.
+
+        Args:
+            model_path: GGUF model file
+            context_tokens: Context window of the model
+            threads: CPU threads, 0 for llama.cpp's default
+        """
+        llama_cpp = load('llama_cpp', 'local_llm')
+        kwargs = {'n_threads': threads} if threads > 0 else {}
+        self.model = llama_cpp.Llama(
+            model_path=str(model_path),
+            n_ctx=context_tokens,
+            verbose=False,
+            **kwargs
+        )
+
+    def generate(self, messages: List[Dict[str, str]], max_tokens: int,
+                 temperature: float) -> Iterator[str]:
+        """Text pieces of a chat completion, using the model's chat template."""
+        chunks = self.model.create_chat_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in chunks:
+            delta = chunk['choices'][0]['delta'].get('content')
+            if delta:
+                yield delta
+
+
+class OnnxGenAIBackend:
+    """ONNX Runtime GenAI model directory."""
+
+    def __init__(self, model_path: Path, context_tokens: int = 2048):
+        """
+        Initialize OnnxGenAIBackend.
+
+        Args:
+            model_path: Directory with genai_config.json and the ONNX model
+            context_tokens: Upper limit for prompt and reply together
+        """
+        self.og = load('onnxruntime_genai', 'local_llm')
+        self.model = self.og.Model(str(model_path))
+        self.tokenizer = self.og.Tokenizer(self.model)
+        self.context_tokens = context_tokens
+
+    def _prompt(self, messages: List[Dict[str, str]]) -> str:
+        """Render messages with the model's chat template when the runtime provides one."""
+        if hasattr(self.tokenizer, 'apply_chat_template'):
+            return self.tokenizer.apply_chat_template(json.dumps(messages), add_generation_prompt=True)
+
+        # ChatML, used by most small instruction-tuned models
+        rendered = ''.join(f"<|im_start|>{m['role']}\n{m['content']}<|im_end|>\n" for m in messages)
+        return rendered + "<|im_start|>assistant\n"
+
+    def generate(self, messages: List[Dict[str, str]], max_tokens: int,
+                 temperature: float) -> Iterator[str]:
+        """Text pieces of a chat completion."""
+        tokens = self.tokenizer.encode(self._prompt(messages))
+
+        params = self.og.GeneratorParams(self.model)
+        params.set_search_options(
+            max_length=min(self.context_tokens, len(tokens) + max_tokens),
+            temperature=max(temperature, 1e-3),
+            do_sample=temperature > 0
+        )
+        generator = self.og.Generator(self.model, params)
+        generator.append_tokens(tokens)
+        decoder = self.tokenizer.create_stream()
+
+        while not generator.is_done():
+            generator.generate_next_token()
+            piece = decoder.decode(generator.get_next_tokens()[0])
+            if piece:
+                yield piece
+
+
+class LocalLLMProvider:
+    """
+    In-process chat model implementing the LLMProvider protocol.
+
+    The router uses it as the local LLM route: for queries no skill
+    answers, and as the hedge against a slow cloud answer.
+    """
+
+    name = ROUTE_LOCAL_LLM
+
+    def __init__(self, config, backend=None):
+        """
+        Initialize LocalLLMProvider.
+
+        Args:
+            config: Configuration object with local_llm and system settings
+            backend: Optional ready backend; loaded from the configuration if omitted
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config.local_llm
+        self.enabled = self.config.enabled
+
+        model_path = self.config.model_path
+        self.model_path = Path(model_path) if model_path else (
+            Path(config.system.model_cache_dir) / "llm" / self.config.model_name
+        )
+        self.threads = self.config.threads or config.system.cpu_threads
+
+        self.backend = backend
+        self.backend_name = type(backend).__name__ if backend is not None else None
+        self.load_error: Optional[str] = None
+        self._load_lock = asyncio.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.token_counter = TokenCounter()
+
+        # Latency to the first token and generation speed, smoothed
+        self.latency_estimate = self.config.expected_latency
+        self.tokens_per_second = 0.0
+
+        # Statistics
+        self.total_requests = 0
+        self.failed_requests = 0
+        self.completion_tokens = 0
+        self.load_time = 0.0
+
+    def _select_backend(self) -> Optional[str]:
+        """Backend to load for the configured model, or None if none can."""
+        backend = self.config.backend
+        if backend == 'auto':
+            if self.model_path.is_dir():
+                backend = 'onnx'
+            elif self.model_path.suffix == '.gguf':
+                backend = 'llama_cpp'
+            else:
+                return None
+
+        if backend == 'llama_cpp' and LLAMA_CPP_AVAILABLE and self.model_path.is_file():
+            return backend
+        if backend == 'onnx' and ONNX_GENAI_AVAILABLE and (self.model_path / "genai_config.json").exists():
+            return backend
+        return None
+
+    def _load_backend(self, backend: str):
+        """Load the model (runs on the worker thread)."""
+        if backend == 'llama_cpp':
+            return LlamaCppBackend(self.model_path, self.config.context_tokens, self.threads)
+        return OnnxGenAIBackend(self.model_path, self.config.context_tokens)
+
+    def _worker(self) -> ThreadPoolExecutor:
+        """Single thread that owns the model, so requests run one at a time."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-llm")
+        return self._executor
+
+    async def warm_up(self) -> None:
+        """Load the model in the background once the assistant is listening."""
+        if not self.enabled or self.backend is not None:
+            return
+
+        async with self._load_lock:
+            if self.backend is not None or self.load_error is not None:
+                return
+
+            backend = self._select_backend()
+            if backend is None:
+                self.load_error = f"no usable backend for {self.model_path}"
+                self.logger.info(f"Local LLM unavailable: {self.load_error}")
+                return
+
+            start_time = time.perf_counter()
+            try:
+                with STARTUP_PROFILER.measure('local_llm', 'load model'):
+                    loop = asyncio.get_running_loop()
+                    self.backend = await loop.run_in_executor(self._worker(), self._load_backend, backend)
+                self.backend_name = backend
+                self.load_time = time.perf_counter() - start_time
+                self.logger.info(f"Local LLM loaded with {backend} in {self.load_time:.1f}s ({self.model_path.name})")
+
+            except Exception as e:
+                self.load_error = str(e)
+                self.logger.error(f"Failed to load local LLM {self.model_path}: {e}")
+
+    def is_available(self) -> bool:
+        """Whether the model is loaded."""
+        return self.enabled and self.backend is not None
+
+    def expected_latency(self) -> Optional[float]:
+        """
+        Estimated seconds until the first token.
+
+        Returns:
+            Smoothed measured latency, or None while the model is not loaded
+        """
+        return self.latency_estimate if self.is_available() else None
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Report whether the model is loaded."""
+        return {
+            'healthy': self.is_available(),
+            'enabled': self.enabled,
+            'backend': self.backend_name,
+            'model': str(self.model_path),
+            'load_error': self.load_error
+        }
+
+    def _build_context_window(self, user_input: str,
+                              conversation_history: Optional[List[Dict[str, Any]]],
+                              persona_context: Optional[Dict[str, Any]],
+                              conversation: Optional[ConversationContext]) -> ContextWindow:
+        """Recent turns and the prompt within the local model's context window."""
+        persona_context = persona_context or {}
+        if conversation is not None:
+            conversation_history = conversation.recent(self.config.history_turns)
+
+        local = ConversationContext(
+            token_budget=self.config.context_tokens,
+            max_completion_tokens=self.config.max_tokens,
+            min_completion_tokens=min(64, self.config.max_tokens),
+            max_turns=self.config.history_turns,
+            summary_tokens=0,
+            counter=self.token_counter
+        )
+        local.extend(conversation_history or [])
+
+        # Spoken answers from a small model should stay short
+        system_prompt = build_system_prompt(persona_context.get('personality_traits'))
+        system_prompt += " Answer briefly, in one to three spoken sentences."
+        return local.build(system_prompt, user_input)
+
+    async def stream_conversational_response(self, user_input: str,
+                                             conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                             persona_context: Optional[Dict[str, Any]] = None,
+                                             conversation: Optional[ConversationContext] = None
+                                             ) -> AsyncIterator[str]:
+        """
+        Stream a reply from the local model.
+
+        Each piece is produced on the worker thread; closing the stream
+        stops generation after the current token.
+
+        Yields:
+            Text deltas in order; nothing if the model is not loaded
+        """
+        if not self.is_available():
+            return
+
+        window = self._build_context_window(user_input, conversation_history, persona_context, conversation)
+        loop = asyncio.get_running_loop()
+        worker = self._worker()
+        request_start = time.perf_counter()
+        first_token_time = None
+        pieces = 0
+        pieces_iter = None
+        self.total_requests += 1
+
+        try:
+            pieces_iter = await loop.run_in_executor(
+                worker, lambda: iter(self.backend.generate(window.messages, window.max_tokens,
+                                                           self.config.temperature))
+            )
+            while True:
+                piece = await loop.run_in_executor(worker, next, pieces_iter, _DONE)
+                if piece is _DONE:
+                    break
+                if first_token_time is None:
+                    first_token_time = time.perf_counter() - request_start
+                    self.latency_estimate += LATENCY_SMOOTHING * (first_token_time - self.latency_estimate)
+                pieces += 1
+                yield piece
+
+        except Exception as e:
+            self.failed_requests += 1
+            self.logger.error(f"Local LLM generation failed: {e}")
+
+        finally:
+            close = getattr(pieces_iter, 'close', None) if pieces_iter is not None else None
+            if close is not None:
+                # Runs after any in-flight token on the same thread
+                worker.submit(close)
+
+            self.completion_tokens += pieces
+            if first_token_time is not None and pieces > 1:
+                generation_time = time.perf_counter() - request_start - first_token_time
+                if generation_time > 0:
+                    rate = (pieces - 1) / generation_time
+                    if self.tokens_per_second:
+                        rate = self.tokens_per_second + LATENCY_SMOOTHING * (rate - self.tokens_per_second)
+                    self.tokens_per_second = rate
+
+    async def get_conversational_response(self, user_input: str,
+                                          conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                          persona_context: Optional[Dict[str, Any]] = None,
+                                          conversation: Optional[ConversationContext] = None) -> Optional[str]:
+        """
+        Get a complete reply from the local model.
+
+        Returns:
+            Response text, or None if the model is not loaded or produced nothing
+        """
+        pieces = []
+        stream = self.stream_conversational_response(user_input, conversation_history,
+                                                     persona_context, conversation)
+        try:
+            async for piece in stream:
+                pieces.append(piece)
+        finally:
+            await stream.aclose()
+
+        response = ''.join(pieces).strip()
+        return response or None
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Get local model statistics."""
+        return {
+            'enabled': self.enabled,
+            'loaded': self.backend is not None,
+            'backend': self.backend_name,
+            'model': self.model_path.name,
+            'load_time': self.load_time,
+            'load_error': self.load_error,
+            'total_requests': self.total_requests,
+            'failed_requests': self.failed_requests,
+            'completion_tokens': self.completion_tokens,
+            'expected_latency': self.latency_estimate,
+            'tokens_per_second': self.tokens_per_second
+        }
+
+    async def shutdown(self) -> None:
+        """Stop the worker thread and release the model."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.backend = None
+        self.logger.info("Local LLM provider shutdown complete")
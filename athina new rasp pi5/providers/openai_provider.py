@@ -9,28 +9,39 @@ import asyncio
 import logging
 import time
 import os
-from typing import Optional, Dict, Any, List
+from pathlib import Path
+from typing import Optional, Dict, Any, List, AsyncIterator
 from dataclasses import dataclass
-import json
-
-try:
-    import openai
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
 
+from .base import ROUTE_CLOUD, build_system_prompt
+from .connectivity import (
+    CircuitBreaker, ConnectivityMonitor, NETWORK_ERRORS, CLOSED,
+    NETWORK_ONLINE, NETWORK_DEGRADED, NETWORK_OFFLINE, classify_error, retry_after_seconds
+)
+from .prefetcher import AnswerPrefetcher
+from .rate_limiter import RateLimiter, Reservation
+from .response_cache import ResponseCache, CachedResponse
+from ..conversation_context import ConversationContext, ContextWindow, TokenCounter
 from ..errors import NetworkError, TimeoutError
+from ..lazy_imports import is_available, load
+from ..logging_cfg import STARTUP_PROFILER
+
+# The openai client (httpx, pydantic) is imported when the client is first created
+OPENAI_AVAILABLE = is_available('openai')
+
+# Seconds to a first answer assumed until requests have been measured, and
+# the weight of each new measurement in the running estimate
+DEFAULT_EXPECTED_LATENCY = 1.5
+LATENCY_SMOOTHING = 0.3
 
 
 @dataclass
 class TokenUsage:
-    """Track token usage for rate limiting."""
+    """Cumulative token usage since startup."""
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
     requests: int = 0
-    last_reset: float = 0
 
 
 class OpenAIProvider:
@@ -38,9 +49,12 @@ class OpenAIProvider:
     OpenAI integration provider for enhanced responses.
     
     Provides smart routing, fallback handling, and rate limiting
-    for OpenAI API integration.
+    for OpenAI API integration. Implements the LLMProvider protocol as
+    the router's cloud route.
     """
     
+    name = ROUTE_CLOUD
+    
     def __init__(self, config):
         """
         Initialize OpenAI provider.
@@ -73,20 +87,72 @@ class OpenAIProvider:
         # Enhancement configuration
         self.enhancement_config = self.config.enhancement
         
-        # Initialize client
+        # Token counting for context windows built from plain history lists
+        self.token_counter = TokenCounter(self.models['chat'])
+        
+        # Network state: a background probe and request outcomes drive the breaker
+        connectivity = self.config.connectivity
+        self.breaker = CircuitBreaker(
+            failure_threshold=connectivity.get('failure_threshold', 3),
+            max_backoff=connectivity.get('max_backoff', 300.0),
+            jitter=connectivity.get('jitter', 0.2)
+        )
+        self.connectivity = ConnectivityMonitor(
+            self.base_url,
+            self.breaker,
+            probe_timeout=connectivity.get('probe_timeout', 2.0),
+            online_interval=connectivity.get('online_interval', 30.0),
+            offline_min_interval=connectivity.get('offline_min_interval', 2.0),
+            offline_max_interval=connectivity.get('offline_max_interval', 60.0)
+        )
+        
+        # The client is created on first use or by warm_up(), never during boot
         self.client = None
+        self._client_lock = asyncio.Lock()
+        self.connection_pool = self.config.connection_pool
         self.is_initialized = False
+        self.warmed_up = False
         
-        # Usage tracking
+        # Usage tracking, and request/token budgets that survive restarts
         self.usage = TokenUsage()
-        self.usage.last_reset = time.time()
+        self.rate_limiter = RateLimiter(
+            self.usage_limits,
+            state_path=Path(config.system.model_cache_dir) / "openai_rate_limits.json"
+        )
+        
+        # Response cache: in-memory LRU with an optional SQLite tier
+        cache = self.config.cache
+        self.response_cache = None
+        if cache.get('enabled', True):
+            self.response_cache = ResponseCache(
+                ttl_seconds=cache.get('ttl_seconds', 3600),
+                max_entries=cache.get('max_entries', 500),
+                max_bytes=cache.get('max_memory_kb', 512) * 1024,
+                db_path=Path(config.system.model_cache_dir) / "response_cache.sqlite3"
+                if cache.get('persistent', True) else None,
+                max_disk_entries=cache.get('max_disk_entries', 5000)
+            )
         
-        # Response cache
-        self.response_cache = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Idle-time refresh of cached answers to frequent questions, for offline use
+        self.prefetcher = None
+        if self.response_cache is not None and self.config.prefetch.get('enabled', True):
+            self.prefetcher = AnswerPrefetcher(self, self.config.prefetch, Path(config.system.model_cache_dir))
+        
+        # Latency to the first answer text, smoothed over recent requests
+        self.latency_estimate = DEFAULT_EXPECTED_LATENCY
+        
+        # Streaming latency
+        self.streamed_responses = 0
+        self.average_time_to_first_token = 0.0
+        self.last_time_to_first_token = 0.0
     
     async def initialize(self) -> None:
-        """Initialize the OpenAI provider."""
+        """
+        Initialize the OpenAI provider.
+        
+        Only checks the configuration: the openai package is not imported
+        and no request is made, so boot time does not depend on the network.
+        """
         if self.is_initialized:
             return
         
@@ -105,37 +171,162 @@ class OpenAIProvider:
                 self.enabled = False
                 return
             
-            # Initialize async client
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url,
-                timeout=self.timeout,
-                max_retries=self.max_retries
-            )
-            
-            # Test connection
-            await self._test_connection()
-            
             self.is_initialized = True
-            self.logger.info("OpenAI provider initialized successfully")
+            self.logger.info("OpenAI provider initialized (client created on first use)")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize OpenAI provider: {e}")
             self.enabled = False
     
-    async def _test_connection(self) -> None:
-        """Test OpenAI API connection."""
-        try:
-            # Make a minimal API call to test connectivity
-            response = await self.client.chat.completions.create(
-                model=self.models['chat'],
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=1
-            )
-            self.logger.info("OpenAI API connection successful")
+    def _create_client(self):
+        """Import the openai package and build the client with a keep-alive connection pool."""
+        openai = load('openai', 'openai')
+        
+        kwargs = {}
+        http_client_factory = getattr(openai, 'DefaultAsyncHttpxClient', None)
+        if http_client_factory is not None:
+            # Keep warmed connections around long enough to be reused
+            httpx = load('httpx', 'openai')
+            kwargs['http_client'] = http_client_factory(limits=httpx.Limits(
+                max_connections=self.connection_pool.get('max_connections', 10),
+                max_keepalive_connections=self.connection_pool.get('max_keepalive_connections', 5),
+                keepalive_expiry=self.connection_pool.get('keepalive_expiry', 120.0)
+            ))
+        
+        return openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            **kwargs
+        )
+    
+    async def _get_client(self):
+        """
+        Get the API client, creating it on first use.
+        
+        The import and construction run in the default executor so the
+        event loop keeps serving audio meanwhile.
+        
+        Returns:
+            AsyncOpenAI client, or None if it cannot be created
+        """
+        if self.client is None:
+            async with self._client_lock:
+                if self.client is None and self.enabled:
+                    try:
+                        loop = asyncio.get_running_loop()
+                        self.client = await loop.run_in_executor(None, self._create_client)
+                    except Exception as e:
+                        self.logger.error(f"Failed to create OpenAI client: {e}")
+                        self.enabled = False
+                        return None
+                    
+                    self.connectivity.start()
+        
+        return self.client
+    
+    async def warm_up(self) -> None:
+        """
+        Create the client and open a pooled connection in the background.
+        
+        Meant to run once the assistant is listening. The warm-up request
+        is a model lookup, which costs no tokens; its TCP and TLS handshakes
+        leave a keep-alive connection in the pool for the first real request.
+        """
+        if not self.enabled or not self.is_initialized:
+            return
+        
+        self.connectivity.start()
+        if self.prefetcher is not None:
+            self.prefetcher.start()
+        if not self.connection_pool.get('warm_up', True):
+            return
+        
+        with STARTUP_PROFILER.measure('openai', 'warm up'):
+            client = await self._get_client()
+            if client is None or not self.breaker.allow_request():
+                return
             
-        except Exception as e:
-            raise NetworkError(f"OpenAI API connection failed: {e}")
+            try:
+                await asyncio.wait_for(client.models.retrieve(self.models['chat']), timeout=self.timeout)
+                self.breaker.record_success()
+                self.warmed_up = True
+                self.logger.info("OpenAI connection pool warmed up")
+                
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                self.logger.warning(f"OpenAI connection warm-up failed: {e}")
+                self._record_request_failure(e)
+    
+    def is_available(self) -> bool:
+        """
+        Check whether a request could be sent now.
+        
+        Never touches the network: while the circuit breaker is open this
+        returns False immediately.
+        
+        Returns:
+            True if the provider is enabled, initialized and not backing off
+        """
+        return self.enabled and self.is_initialized and self.breaker.is_available()
+    
+    def network_state(self) -> str:
+        """
+        Current network state, for keeping routing estimates per state.
+        
+        Returns:
+            NETWORK_OFFLINE if the last probe failed, NETWORK_DEGRADED while
+            the circuit breaker is not closed, else NETWORK_ONLINE
+        """
+        if self.connectivity.is_online is False:
+            return NETWORK_OFFLINE
+        if self.breaker.state != CLOSED:
+            return NETWORK_DEGRADED
+        return NETWORK_ONLINE
+    
+    def expected_latency(self) -> Optional[float]:
+        """
+        Estimated seconds until the first text of a reply.
+        
+        Returns:
+            Smoothed measured latency, or None while the provider is
+            unavailable or rate limited
+        """
+        if not self.is_available() or self.time_until_request_allowed() > 0:
+            return None
+        return self.latency_estimate
+    
+    def _record_latency(self, latency: float) -> None:
+        """Fold a measured first-answer latency into the estimate."""
+        self.latency_estimate += LATENCY_SMOOTHING * (latency - self.latency_estimate)
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Probe the endpoint and report provider health.
+        
+        Returns:
+            Dictionary with 'healthy' and connectivity details
+        """
+        online = await self.connectivity.probe() if self.enabled else False
+        return {
+            'healthy': online and self.is_available(),
+            'enabled': self.enabled,
+            'is_initialized': self.is_initialized,
+            'online': online,
+            'circuit_breaker': self.breaker.get_statistics(),
+            'connectivity': self.connectivity.get_statistics()
+        }
+    
+    def _record_request_failure(self, error: BaseException) -> None:
+        """Feed a failed request to the circuit breaker."""
+        error_class = classify_error(error)
+        self.breaker.record_failure(error_class, retry_after_seconds(error))
+        if error_class in NETWORK_ERRORS:
+            # Find out quickly whether the network itself is gone
+            self.connectivity.request_probe()
     
     def should_use_openai(self, query: str, context: Dict[str, Any]) -> bool:
         """
@@ -148,11 +339,11 @@ class OpenAIProvider:
         Returns:
             True if OpenAI should be used
         """
-        if not self.enabled or not self.is_initialized:
+        if not self.is_available():
             return False
         
         # Check if within rate limits
-        if not self._check_rate_limits():
+        if self.time_until_request_allowed() > 0:
             return False
         
         # Check fallback mode
@@ -204,39 +395,49 @@ class OpenAIProvider:
         
         return False
     
-    def _check_rate_limits(self) -> bool:
+    def time_until_request_allowed(self) -> float:
         """
-        Check if within rate limits.
+        Seconds until the rate limiter would admit a request.
+        
+        Never blocks; routing answers locally while this is positive.
         
         Returns:
-            True if within limits
-        """
-        # Reset hourly counters
-        current_time = time.time()
-        if current_time - self.usage.last_reset > 3600:  # 1 hour
-            self.usage.requests = 0
-            self.usage.total_tokens = 0
-            self.usage.last_reset = current_time
-        
-        # Check request limit
-        if self.usage.requests >= self.usage_limits['max_requests_per_hour']:
-            self.logger.warning("OpenAI hourly request limit reached")
-            return False
+            0.0 if a request can be made now
+        """
+        return self.rate_limiter.time_until_available()
+    
+    def _acquire_request_budget(self, window: ContextWindow) -> Optional[Reservation]:
+        """
+        Claim the circuit breaker and the rate limits for one request.
         
-        # Check token limit
-        if self.usage.total_tokens >= self.usage_limits['daily_token_limit']:
-            self.logger.warning("OpenAI daily token limit reached")
-            return False
+        Returns:
+            Reservation pre-debited with the prompt tokens, or None if the
+            request must not be made now
+        """
+        if not self.breaker.allow_request():
+            self.logger.debug("OpenAI circuit breaker open, skipping request")
+            return None
         
-        return True
+        reservation = self.rate_limiter.acquire(window.prompt_tokens)
+        if reservation is None:
+            self.breaker.release()
+            self.logger.info(
+                f"OpenAI rate limit reached, next request in {self.rate_limiter.time_until_available():.0f}s"
+            )
+        return reservation
     
-    async def get_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    async def get_response(self, prompt: str, context: Optional[Dict[str, Any]] = None,
+                           refresh: bool = False, source: str = "api",
+                           ttl_seconds: Optional[float] = None) -> Optional[str]:
         """
         Get response from OpenAI.
         
         Args:
             prompt: User prompt
             context: Optional context
+            refresh: Skip the cached answer and replace it
+            source: Origin recorded with the cached answer
+            ttl_seconds: Lifetime of the cached answer, the cache default if None
             
         Returns:
             Response text or None if failed
@@ -244,22 +445,34 @@ class OpenAIProvider:
         if not self.enabled or not self.is_initialized:
             return None
         
+        reservation = None
+        used_tokens = 0
+        
         try:
             # Check cache
             cache_key = self._get_cache_key(prompt, context)
-            cached_response = self._get_cached_response(cache_key)
+            cached_response = None if refresh else self._get_cached_response(cache_key)
             if cached_response:
                 return cached_response
             
-            # Prepare messages
-            messages = self._prepare_messages(prompt, context)
+            client = await self._get_client()
+            if client is None:
+                return None
+            
+            # Fit the prompt and history into the token budget
+            window = self._build_context_window(prompt, context)
+            
+            reservation = self._acquire_request_budget(window)
+            if reservation is None:
+                return None
             
             # Make API call with timeout
+            request_start = time.time()
             response = await asyncio.wait_for(
-                self.client.chat.completions.create(
+                client.chat.completions.create(
                     model=self.models['chat'],
-                    messages=messages,
-                    max_tokens=self.usage_limits['max_tokens_per_request'],
+                    messages=window.messages,
+                    max_tokens=window.max_tokens,
                     temperature=0.7,
                     presence_penalty=0.1,
                     frequency_penalty=0.1
@@ -269,92 +482,310 @@ class OpenAIProvider:
             
             # Extract response
             response_text = response.choices[0].message.content
+            self.breaker.record_success()
+            self._record_latency(time.time() - request_start)
             
             # Update usage
             if response.usage:
-                self.usage.prompt_tokens += response.usage.prompt_tokens
-                self.usage.completion_tokens += response.usage.completion_tokens
-                self.usage.total_tokens += response.usage.total_tokens
-            self.usage.requests += 1
+                prompt_tokens = response.usage.prompt_tokens
+                completion_tokens = response.usage.completion_tokens
+            else:
+                prompt_tokens = window.prompt_tokens
+                completion_tokens = self.token_counter.count(response_text or '')
+            self._record_usage(prompt_tokens, completion_tokens)
+            used_tokens = prompt_tokens + completion_tokens
             
             # Cache response
-            self._cache_response(cache_key, response_text)
+            self._cache_response(cache_key, prompt, response_text, time.time() - request_start, source, ttl_seconds)
             
             return response_text
             
-        except asyncio.TimeoutError:
+        except asyncio.TimeoutError as e:
             self.logger.error("OpenAI API timeout")
+            self._record_request_failure(e)
             raise TimeoutError("OpenAI API timeout", operation="chat_completion")
         except Exception as e:
             self.logger.error(f"OpenAI API error: {e}")
+            self._record_request_failure(e)
             raise NetworkError(f"OpenAI API error: {e}")
+        except asyncio.CancelledError:
+            # Abandoned, e.g. by hedged routing: give back a half-open trial slot
+            self.breaker.release()
+            raise
+        finally:
+            if reservation is not None:
+                # Failed and abandoned requests get their estimated tokens back
+                self.rate_limiter.reconcile(reservation, used_tokens)
     
-    def _prepare_messages(self, prompt: str, context: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    async def stream_response(self, prompt: str,
+                              context: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
         """
-        Prepare messages for OpenAI API.
+        Stream a response from OpenAI as text deltas.
+        
+        The API timeout applies to the first token and to every gap
+        between tokens, not to the whole completion.
         
         Args:
             prompt: User prompt
             context: Optional context
             
-        Returns:
-            List of messages
+        Yields:
+            Text deltas in order; nothing if the provider is unavailable
         """
-        messages = []
+        if not self.enabled or not self.is_initialized:
+            return
+        
+        cache_key = self._get_cache_key(prompt, context)
+        cached_response = self._get_cached_response(cache_key)
+        if cached_response:
+            yield cached_response
+            return
+        
+        client = await self._get_client()
+        if client is None:
+            return
+        
+        window = self._build_context_window(prompt, context)
+        reservation = self._acquire_request_budget(window)
+        if reservation is None:
+            return
         
-        # System message
-        system_prompt = "You are Athina, an elegant and sophisticated voice assistant."
-        if context and context.get('persona_traits'):
-            traits = context['persona_traits']
-            system_prompt += f" Your personality traits: {', '.join(traits)}."
+        timeout = self.fallback_config['api_timeout']
+        request_start = time.time()
+        stream = None
+        pieces = []
+        completion_tokens = None
+        finished = False
         
-        messages.append({"role": "system", "content": system_prompt})
+        try:
+            stream = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=self.models['chat'],
+                    messages=window.messages,
+                    max_tokens=window.max_tokens,
+                    temperature=0.7,
+                    presence_penalty=0.1,
+                    frequency_penalty=0.1,
+                    stream=True
+                ),
+                timeout=timeout
+            )
+            
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                
+                # Only sent by servers that report usage on streams
+                usage = getattr(chunk, 'usage', None)
+                if usage:
+                    completion_tokens = usage.completion_tokens
+                
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if not pieces:
+                        self._record_time_to_first_token(time.time() - request_start)
+                        self.breaker.record_success()
+                    pieces.append(delta)
+                    yield delta
+            
+            finished = True
+            
+        except asyncio.TimeoutError as e:
+            self.logger.error("OpenAI API stream timeout")
+            self._record_request_failure(e)
+            raise TimeoutError("OpenAI API stream timeout", operation="chat_completion_stream")
+        except Exception as e:
+            self.logger.error(f"OpenAI API stream error: {e}")
+            self._record_request_failure(e)
+            raise NetworkError(f"OpenAI API stream error: {e}")
+        except (asyncio.CancelledError, GeneratorExit):
+            # Abandoned before an outcome: give back a half-open trial slot
+            if not pieces:
+                self.breaker.release()
+            raise
+        finally:
+            if stream is not None and not finished:
+                # Stop generating tokens nobody will read
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    try:
+                        await close()
+                    except Exception:
+                        pass
+            
+            used_tokens = 0
+            if stream is not None:
+                response_text = ''.join(pieces)
+                if completion_tokens is None:
+                    completion_tokens = self.token_counter.count(response_text)
+                self._record_usage(window.prompt_tokens, completion_tokens)
+                used_tokens = window.prompt_tokens + completion_tokens
+                
+                if finished and response_text:
+                    self._cache_response(cache_key, prompt, response_text, time.time() - request_start)
+            
+            self.rate_limiter.reconcile(reservation, used_tokens)
+    
+    def _record_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Count one request and its tokens in the usage statistics."""
+        self.usage.prompt_tokens += prompt_tokens
+        self.usage.completion_tokens += completion_tokens
+        self.usage.total_tokens += prompt_tokens + completion_tokens
+        self.usage.requests += 1
+    
+    def _record_time_to_first_token(self, latency: float) -> None:
+        """Record the delay between a streaming request and its first text delta."""
+        self.streamed_responses += 1
+        self.last_time_to_first_token = latency
+        self._record_latency(latency)
+        self.average_time_to_first_token += (
+            (latency - self.average_time_to_first_token) / self.streamed_responses
+        )
+        self.logger.debug(f"Time to first token: {latency:.3f}s")
+    
+    async def get_conversational_response(self, user_input: str,
+                                          conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                          persona_context: Optional[Dict[str, Any]] = None,
+                                          conversation: Optional[ConversationContext] = None) -> Optional[str]:
+        """
+        Get a conversational reply in the persona's voice.
         
-        # Add conversation history if available
-        if context and context.get('conversation_history'):
-            for entry in context['conversation_history'][-5:]:  # Last 5 exchanges
-                messages.append({"role": entry['role'], "content": entry['content']})
+        Args:
+            user_input: User's spoken text
+            conversation_history: Recent turns, used when no conversation context is given
+            persona_context: Persona name and personality traits
+            conversation: Token-budgeted conversation context of the persona engine
+            
+        Returns:
+            Response text or None if failed
+        """
+        context = self._conversation_request_context(conversation_history, persona_context, conversation)
+        return await self.get_response(user_input, context)
+    
+    async def stream_conversational_response(self, user_input: str,
+                                             conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                             persona_context: Optional[Dict[str, Any]] = None,
+                                             conversation: Optional[ConversationContext] = None
+                                             ) -> AsyncIterator[str]:
+        """
+        Stream a conversational reply in the persona's voice.
         
-        # Add current prompt
-        messages.append({"role": "user", "content": prompt})
+        Args:
+            user_input: User's spoken text
+            conversation_history: Recent turns, used when no conversation context is given
+            persona_context: Persona name and personality traits
+            conversation: Token-budgeted conversation context of the persona engine
+            
+        Yields:
+            Text deltas in order
+        """
+        context = self._conversation_request_context(conversation_history, persona_context, conversation)
+        async for delta in self.stream_response(user_input, context):
+            yield delta
+    
+    @staticmethod
+    def _conversation_request_context(conversation_history: Optional[List[Dict[str, Any]]],
+                                      persona_context: Optional[Dict[str, Any]],
+                                      conversation: Optional[ConversationContext]) -> Dict[str, Any]:
+        """Request context for a conversational reply."""
+        persona_context = persona_context or {}
+        return {
+            'conversation_history': conversation_history or [],
+            'conversation': conversation,
+            'persona_traits': persona_context.get('personality_traits', [])
+        }
+    
+    def _build_context_window(self, prompt: str, context: Optional[Dict[str, Any]]) -> ContextWindow:
+        """
+        Prepare messages for OpenAI API within the token budget.
         
-        return messages
+        Args:
+            prompt: User prompt
+            context: Optional context
+            
+        Returns:
+            ContextWindow with the messages and max_tokens for the request
+        """
+        system_prompt = build_system_prompt(context.get('persona_traits') if context else None)
+        
+        conversation = context.get('conversation') if context else None
+        if conversation is None:
+            conversation = ConversationContext.from_config(self.config, counter=self.token_counter)
+            if context and context.get('conversation_history'):
+                conversation.extend(context['conversation_history'])
+        
+        window = conversation.build(system_prompt, prompt)
+        self.logger.debug(
+            f"Context window: {window.prompt_tokens} prompt tokens, {window.turns_included} turns, "
+            f"{window.turns_summarized} summarized, max_tokens {window.max_tokens}"
+        )
+        return window
     
     def _get_cache_key(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
         """Generate cache key for response."""
-        key_data = {
-            'prompt': prompt,
-            'context': context.get('conversation_history', [])[-2:] if context else []
-        }
-        return json.dumps(key_data, sort_keys=True)
+        if context and context.get('conversation') is not None:
+            recent = context['conversation'].recent(2)
+        else:
+            recent = context.get('conversation_history', [])[-2:] if context else []
+        return ResponseCache.make_key(
+            prompt,
+            [(entry['role'], entry['content']) for entry in recent],
+            self.models['chat']
+        )
     
     def _get_cached_response(self, cache_key: str) -> Optional[str]:
         """Get cached response if available."""
-        if cache_key in self.response_cache:
-            cached_item = self.response_cache[cache_key]
-            if time.time() - cached_item['timestamp'] < self.cache_ttl:
-                self.logger.debug("Using cached OpenAI response")
-                return cached_item['response']
-            else:
-                del self.response_cache[cache_key]
-        return None
-    
-    def _cache_response(self, cache_key: str, response: str) -> None:
-        """Cache response."""
-        self.response_cache[cache_key] = {
-            'response': response,
-            'timestamp': time.time()
-        }
+        if self.response_cache is None:
+            return None
         
-        # Limit cache size
-        if len(self.response_cache) > 100:
-            # Remove oldest entries
-            sorted_items = sorted(
-                self.response_cache.items(),
-                key=lambda x: x[1]['timestamp']
-            )
-            for key, _ in sorted_items[:20]:
-                del self.response_cache[key]
+        entry = self.response_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        self.logger.debug(f"Using cached OpenAI response ({entry.source}, saved {entry.latency:.2f}s)")
+        return entry.response
+    
+    def _cache_response(self, cache_key: str, prompt: str, response: str, latency: float,
+                        source: str = "api", ttl_seconds: Optional[float] = None) -> None:
+        """Cache response with the time the request took."""
+        if self.response_cache is not None:
+            self.response_cache.put(cache_key, response, query=prompt, latency=latency,
+                                    ttl_seconds=ttl_seconds, source=source)
+    
+    def peek_context_free_answer(self, query: str) -> Optional[CachedResponse]:
+        """Cached answer to the query asked without conversation context, fresh or not, for the prefetcher."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.peek(self._get_cache_key(query, None))
+    
+    def get_context_free_answer(self, query: str) -> Optional[str]:
+        """
+        Fresh cached answer to the query asked without conversation context.
+        
+        Used when the cloud cannot answer in time: a prefetched or earlier
+        first-turn answer beats the canned local one. Never touches the
+        network.
+        
+        Args:
+            query: User query
+            
+        Returns:
+            Cached answer text, or None
+        """
+        if self.response_cache is None:
+            return None
+        
+        entry = self.response_cache.get(self._get_cache_key(query, None))
+        if entry is None:
+            return None
+        
+        if entry.source == "prefetch" and self.prefetcher is not None:
+            self.prefetcher.served += 1
+        self.logger.debug(f"Using cached answer ({entry.source}, {time.time() - entry.created:.0f}s old)")
+        return entry.response
     
     async def enhance_response(self, local_response: str, original_query: str) -> str:
         """
@@ -396,15 +827,21 @@ class OpenAIProvider:
         return {
             'enabled': self.enabled,
             'is_initialized': self.is_initialized,
+            'client_created': self.client is not None,
+            'warmed_up': self.warmed_up,
             'total_requests': self.usage.requests,
             'total_tokens': self.usage.total_tokens,
             'prompt_tokens': self.usage.prompt_tokens,
             'completion_tokens': self.usage.completion_tokens,
-            'cache_size': len(self.response_cache),
-            'rate_limit_status': {
-                'requests_remaining': max(0, self.usage_limits['max_requests_per_hour'] - self.usage.requests),
-                'tokens_remaining': max(0, self.usage_limits['daily_token_limit'] - self.usage.total_tokens)
-            }
+            'streamed_responses': self.streamed_responses,
+            'average_time_to_first_token': self.average_time_to_first_token,
+            'last_time_to_first_token': self.last_time_to_first_token,
+            'expected_latency': self.latency_estimate,
+            'response_cache': self.response_cache.get_statistics() if self.response_cache else None,
+            'circuit_breaker': self.breaker.get_statistics(),
+            'connectivity': self.connectivity.get_statistics(),
+            'rate_limit_status': self.rate_limiter.get_statistics(),
+            'prefetch': self.prefetcher.get_statistics() if self.prefetcher else None
         }
     
     async def shutdown(self) -> None:
@@ -413,8 +850,16 @@ class OpenAIProvider:
             self.logger.info("Shutting down OpenAI provider...")
             
             self.is_initialized = False
-            self.client = None
-            self.response_cache.clear()
+            await self.connectivity.stop()
+            if self.prefetcher is not None:
+                await self.prefetcher.stop()
+            self.rate_limiter.save()
+            if self.client is not None:
+                # Close pooled keep-alive connections
+                await self.client.close()
+                self.client = None
+            if self.response_cache is not None:
+                self.response_cache.close()
             
             self.logger.info("OpenAI provider shutdown complete")
             
@@ -0,0 +1,237 @@
+"""
+Offline Answer Prefetching for Athina
+
+While the network is good and the assistant is idle, spare API quota is
+spent refreshing cloud answers to the questions asked most often
+recently that no skill answers. The answers go to the persistent
+response cache under a context-free key with source "prefetch", so when
+the cloud is unreachable, rate limited or late they are served from disk
+in milliseconds instead of the canned fallback text.
+
+Prefetch requests go through the provider's rate limiter like any other
+request, and additionally draw on their own daily request and token
+budget, saved across restarts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from .connectivity import NETWORK_ONLINE
+from .rate_limiter import RateLimiter
+from .response_cache import normalize_query, depends_on_conversation
+
+
+class AnswerPrefetcher:
+    """
+    Background refresh of cached answers to frequent recent questions.
+
+    The provider reports every routed question with ``record_query`` and
+    every other interaction with ``note_activity``; the prefetcher only
+    makes requests once no interaction happened for ``idle_seconds``.
+    """
+
+    def __init__(self, provider, config: Dict[str, Any], state_dir: Path):
+        """
+        Initialize AnswerPrefetcher.
+
+        Args:
+            provider: OpenAIProvider whose cache, limiter and connectivity are used
+            config: OpenAI prefetch settings
+            state_dir: Directory for the query history and the daily budget
+        """
+        self.logger = logging.getLogger(__name__)
+        self.provider = provider
+        self.idle_seconds = config.get('idle_seconds', 60.0)
+        self.check_interval = config.get('check_interval', 30.0)
+        self.min_occurrences = config.get('min_occurrences', 2)
+        self.ttl_seconds = config.get('ttl_seconds', 86400.0)
+        self.refresh_before_expiry = config.get('refresh_before_expiry', 3600.0)
+
+        # Daily prefetch budget, on top of the provider's own rate limits
+        self.budget = RateLimiter(
+            {
+                'max_requests_per_day': config.get('daily_requests', 50),
+                'daily_token_limit': config.get('daily_tokens', 20000)
+            },
+            state_path=Path(state_dir) / "prefetch_budget.json"
+        )
+
+        # Recent routed questions, oldest first, as (normalized, original) pairs
+        self.history_path = Path(state_dir) / "prefetch_queries.json"
+        self.history: "deque[Tuple[str, str]]" = deque(maxlen=config.get('history_size', 200))
+        self._load_history()
+
+        self.last_activity = time.time()
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.prefetched = 0
+        self.failed = 0
+        self.served = 0
+        self.last_prefetch_time = 0.0
+
+    def record_query(self, query: str, first_turn: bool = False) -> None:
+        """
+        Count a question no skill answered.
+
+        Follow-ups ("tell me more", "how old is he") are not counted: their
+        answers depend on the conversation, so a context-free one is wrong.
+
+        Args:
+            query: The question as asked
+            first_turn: Whether the question opened a conversation
+        """
+        self.note_activity()
+        if not first_turn and depends_on_conversation(query):
+            return
+        normalized = normalize_query(query)
+        if normalized:
+            self.history.append((normalized, query))
+
+    def note_activity(self) -> None:
+        """Mark the assistant busy, postponing prefetching."""
+        self.last_activity = time.time()
+
+    def is_idle(self) -> bool:
+        """Whether nothing happened for the idle period."""
+        return time.time() - self.last_activity >= self.idle_seconds
+
+    def candidates(self) -> List[str]:
+        """
+        Questions worth prefetching, most frequent first.
+
+        Returns:
+            The latest phrasing of each question asked at least
+            ``min_occurrences`` times whose cached answer is missing or
+            expires soon
+        """
+        counts = Counter(normalized for normalized, _ in self.history)
+        latest = {normalized: query for normalized, query in self.history}
+        refresh_after = time.time() + self.refresh_before_expiry
+
+        queries = []
+        for normalized, count in counts.most_common():
+            if count < self.min_occurrences:
+                break
+            entry = self.provider.peek_context_free_answer(latest[normalized])
+            if entry is None or entry.expires <= refresh_after:
+                queries.append(latest[normalized])
+        return queries
+
+    def start(self) -> None:
+        """Start prefetching in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop prefetching and save the query history."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._save_history()
+        self.budget.save()
+
+    async def _run(self) -> None:
+        """Prefetch one answer per check while conditions allow."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                if self._should_prefetch():
+                    queries = self.candidates()
+                    if queries:
+                        await self.prefetch(queries[0])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Answer prefetch failed: {e}")
+
+    def _should_prefetch(self) -> bool:
+        """Idle, online with a confirmed probe, and within both budgets."""
+        provider = self.provider
+        return (
+            self.is_idle()
+            and provider.connectivity.is_online is True
+            and provider.network_state() == NETWORK_ONLINE
+            and provider.is_available()
+            and provider.time_until_request_allowed() == 0
+            and self.budget.time_until_available() == 0
+        )
+
+    async def prefetch(self, query: str) -> bool:
+        """
+        Fetch and cache a fresh answer to one question.
+
+        Args:
+            query: The question as last asked
+
+        Returns:
+            True if an answer was cached
+        """
+        reservation = self.budget.acquire()
+        if reservation is None:
+            return False
+
+        tokens_before = self.provider.usage.total_tokens
+        try:
+            response = await self.provider.get_response(
+                query, refresh=True, source="prefetch", ttl_seconds=self.ttl_seconds
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.debug(f"Prefetch of '{query}' failed: {e}")
+            response = None
+        finally:
+            self.budget.reconcile(reservation, self.provider.usage.total_tokens - tokens_before)
+
+        if response:
+            self.prefetched += 1
+            self.last_prefetch_time = time.time()
+            self.logger.info(f"Prefetched answer for '{query}'")
+            return True
+
+        self.failed += 1
+        return False
+
+    def _load_history(self) -> None:
+        """Restore the query history saved by a previous run."""
+        if not self.history_path.exists():
+            return
+        try:
+            for query in json.loads(self.history_path.read_text()):
+                normalized = normalize_query(query)
+                if normalized:
+                    self.history.append((normalized, query))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable prefetch history {self.history_path}: {e}")
+
+    def _save_history(self) -> None:
+        """Write the query history."""
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.history_path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps([query for _, query in self.history]))
+            os.replace(temp_path, self.history_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save prefetch history: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get prefetcher statistics."""
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'idle': self.is_idle(),
+            'history_size': len(self.history),
+            'distinct_queries': len({normalized for normalized, _ in self.history}),
+            'prefetched': self.prefetched,
+            'failed': self.failed,
+            'served': self.served,
+            'seconds_since_prefetch': time.time() - self.last_prefetch_time if self.prefetched else None,
+            'budget': self.budget.get_statistics()
+        }
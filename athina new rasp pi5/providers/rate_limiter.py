@@ -0,0 +1,251 @@
+"""
+Rate Limiting for Athina Providers
+
+Multi-window token-bucket limiter for API budgets. Each configured limit
+(requests per minute and per hour, tokens per day, ...) is a bucket that
+refills continuously over its window. A request is admitted only when
+every bucket can cover it, and otherwise the limiter reports how long
+until it could be, so routing can answer locally instead of waiting.
+
+Token buckets are debited with the estimated prompt size before a call
+and reconciled with the reported usage afterwards. Bucket levels are
+saved to a small JSON file, so budgets survive restarts.
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# usage_limits keys that define request buckets, with their window in seconds
+REQUEST_WINDOWS = {
+    'max_requests_per_minute': 60.0,
+    'max_requests_per_hour': 3600.0,
+    'max_requests_per_day': 86400.0,
+}
+
+# usage_limits keys that define token buckets, with their window in seconds
+TOKEN_WINDOWS = {
+    'max_tokens_per_minute': 60.0,
+    'daily_token_limit': 86400.0,
+}
+
+
+class TokenBucket:
+    """Bucket of ``capacity`` units refilled evenly over ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float, level: Optional[float] = None,
+                 updated: Optional[float] = None):
+        """
+        Initialize TokenBucket.
+
+        Args:
+            capacity: Units available at most
+            period: Seconds to refill from empty to full
+            level: Starting level; full if omitted
+            updated: Wall-clock time of ``level``; now if omitted
+        """
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.level = self.capacity if level is None else min(float(level), self.capacity)
+        self.updated = time.time() if updated is None else updated
+
+    def _refill(self, now: float) -> None:
+        """Add what flowed in since the last update."""
+        elapsed = max(0.0, now - self.updated)  # Tolerate the clock stepping back
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+        self.updated = now
+
+    def available(self, now: float) -> float:
+        """Units available now (negative after an overdraft)."""
+        self._refill(now)
+        return self.level
+
+    def time_until(self, amount: float, now: float) -> float:
+        """
+        Seconds until ``amount`` units are available.
+
+        An amount larger than the capacity waits for a full bucket, so an
+        oversized request is admitted on its own rather than never.
+        """
+        needed = min(amount, self.capacity) - self.available(now)
+        return max(0.0, needed / self.rate)
+
+    def debit(self, amount: float, now: float) -> None:
+        """Take units, possibly overdrawing the bucket."""
+        self._refill(now)
+        self.level -= amount
+
+    def credit(self, amount: float, now: float) -> None:
+        """Return units, up to the capacity."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    """Budget taken for one request, to be reconciled with its actual usage."""
+    estimated_tokens: int
+    created: float
+
+
+class RateLimiter:
+    """
+    Admits API requests against every configured request and token bucket.
+
+    ``acquire`` never blocks: it either debits all buckets and returns a
+    Reservation, or debits nothing and returns None, with
+    ``time_until_available`` telling the caller how long the wait would be.
+    """
+
+    def __init__(self, usage_limits: Dict[str, Any], state_path: Optional[Path] = None):
+        """
+        Initialize RateLimiter.
+
+        Args:
+            usage_limits: OpenAI usage_limits; a limit of 0 disables its bucket
+            state_path: JSON file for bucket levels, or None to keep them in memory
+        """
+        self.logger = logging.getLogger(__name__)
+        self.state_path = Path(state_path) if state_path is not None else None
+
+        self.request_buckets: Dict[str, TokenBucket] = {
+            key: TokenBucket(usage_limits[key], period)
+            for key, period in REQUEST_WINDOWS.items() if usage_limits.get(key, 0) > 0
+        }
+        self.token_buckets: Dict[str, TokenBucket] = {
+            key: TokenBucket(usage_limits[key], period)
+            for key, period in TOKEN_WINDOWS.items() if usage_limits.get(key, 0) > 0
+        }
+
+        self._load()
+
+        # Statistics
+        self.admitted = 0
+        self.rejected = 0
+        self.reconciled = 0
+        self.estimate_error_tokens = 0.0  # Mean of actual minus estimated tokens
+
+    def _buckets(self):
+        """All buckets by name."""
+        return {**self.request_buckets, **self.token_buckets}
+
+    def time_until_available(self, estimated_tokens: int = 0) -> float:
+        """
+        Seconds until a request of this size would be admitted.
+
+        Args:
+            estimated_tokens: Tokens the request is expected to use
+
+        Returns:
+            0.0 if it would be admitted now
+        """
+        now = time.time()
+        waits = [bucket.time_until(1, now) for bucket in self.request_buckets.values()]
+        waits += [bucket.time_until(estimated_tokens, now) for bucket in self.token_buckets.values()]
+        return max(waits, default=0.0)
+
+    def acquire(self, estimated_tokens: int = 0) -> Optional[Reservation]:
+        """
+        Debit one request and its estimated tokens if every bucket allows it.
+
+        Args:
+            estimated_tokens: Tokens debited now and reconciled later
+
+        Returns:
+            Reservation, or None if any bucket is short
+        """
+        wait = self.time_until_available(estimated_tokens)
+        if wait > 0:
+            self.rejected += 1
+            self.logger.debug(f"OpenAI rate limit: next request in {wait:.1f}s")
+            return None
+
+        now = time.time()
+        for bucket in self.request_buckets.values():
+            bucket.debit(1, now)
+        for bucket in self.token_buckets.values():
+            bucket.debit(estimated_tokens, now)
+
+        self.admitted += 1
+        self.save()
+        return Reservation(estimated_tokens, now)
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """
+        Correct token buckets once a request's real usage is known.
+
+        Args:
+            reservation: Result of ``acquire``
+            actual_tokens: Tokens the request used; 0 refunds the estimate
+        """
+        difference = actual_tokens - reservation.estimated_tokens
+        now = time.time()
+        for bucket in self.token_buckets.values():
+            if difference > 0:
+                bucket.debit(difference, now)
+            elif difference < 0:
+                bucket.credit(-difference, now)
+
+        if actual_tokens:
+            self.reconciled += 1
+            self.estimate_error_tokens += (difference - self.estimate_error_tokens) / self.reconciled
+        self.save()
+
+    def _load(self) -> None:
+        """Restore bucket levels saved by a previous run."""
+        if self.state_path is None or not self.state_path.exists():
+            return
+
+        try:
+            state = json.loads(self.state_path.read_text())
+            for name, bucket in self._buckets().items():
+                saved = state.get(name)
+                if saved:
+                    bucket.level = min(float(saved['level']), bucket.capacity)
+                    bucket.updated = float(saved['updated'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable rate limit state {self.state_path}: {e}")
+
+    def save(self) -> None:
+        """Write bucket levels to the state file."""
+        if self.state_path is None:
+            return
+
+        state = {
+            name: {'level': bucket.level, 'updated': bucket.updated}
+            for name, bucket in self._buckets().items()
+        }
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_suffix('.tmp')
+            temp_path.write_text(json.dumps(state))
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save rate limit state: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get rate limiter statistics."""
+        now = time.time()
+        buckets = {}
+        for name, bucket in self._buckets().items():
+            available = bucket.available(now)
+            buckets[name] = {
+                'capacity': bucket.capacity,
+                'available': max(0, math.floor(available)),
+                'seconds_until_full': (bucket.capacity - available) / bucket.rate
+            }
+
+        return {
+            'buckets': buckets,
+            'seconds_until_available': self.time_until_available(),
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'average_estimate_error_tokens': self.estimate_error_tokens,
+            'persistent': self.state_path is not None
+        }
@@ -0,0 +1,374 @@
+"""
+Response Cache for Athina Providers
+
+Caches language model answers keyed by the normalized query, the recent
+conversation and the model. The memory tier is an LRU (an OrderedDict,
+so lookups, inserts and evictions are O(1)) with a time-to-live and
+entry and byte budgets; an optional SQLite tier keeps answers across
+restarts.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+# Disfluencies and politeness that change how a request is phrased but
+# not what is asked. Words such as "like", "just" or "well" can carry
+# meaning ("what is it like", "is it just") and are kept.
+FILLER_WORDS = {'um', 'umm', 'uh', 'uhh', 'er', 'erm', 'hmm', 'hmmm', 'please'}
+
+# Addressing the assistant by name at the start of a request
+ADDRESS_PREFIX = re.compile(r"^(?:hey )?athina\b ?")
+
+# Leading request phrasings that do not change the question
+REQUEST_PREFIX = re.compile(
+    r"^(?:(?:can|could|would|will) you (?:tell me |explain |let me know )?"
+    r"|(?:tell me|i want to know|i would like to know|do you know) )"
+)
+
+# Words and openings that refer back to earlier turns ("tell me more",
+# "how old is he", "and in winter?"); answers to such queries depend on
+# the conversation
+FOLLOW_UP_WORDS = {
+    'it', 'its', 'that', 'this', 'these', 'those', 'they', 'them', 'their',
+    'he', 'she', 'him', 'her', 'his', 'hers', 'there', 'then', 'more', 'else',
+    'again', 'another', 'same', 'one', 'ones', 'also', 'too', 'former', 'latter'
+}
+FOLLOW_UP_PREFIX = re.compile(r"^(?:and|but|or|what about|how about)\b")
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Reduce a query to the form used in cache keys.
+
+    Case, punctuation, disfluencies, addressing the assistant and polite
+    request phrasing are dropped, so "Hey Athina, um, could you tell me
+    what photosynthesis is?" and "what photosynthesis is" share an entry.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Normalized query
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    words = _NON_WORD.sub('', text).split()
+    normalized = ' '.join(word for word in words if word not in FILLER_WORDS) or ' '.join(words)
+    stripped = REQUEST_PREFIX.sub('', ADDRESS_PREFIX.sub('', normalized))
+    return stripped or normalized
+
+
+def depends_on_conversation(text: str) -> bool:
+    """
+    Whether a query reads as a follow-up to earlier turns.
+
+    Such queries must not share an answer cached without conversation
+    context, however they normalize ("Can you tell me more?" is "more").
+
+    Args:
+        text: Query text
+
+    Returns:
+        True if the query has a pronoun, a deictic word or a follow-up opening
+    """
+    words = _NON_WORD.sub('', unicodedata.normalize('NFKC', text).lower()).split()
+    return any(word in FOLLOW_UP_WORDS for word in words) or bool(FOLLOW_UP_PREFIX.match(' '.join(words)))
+
+
+@dataclass
+class CachedResponse:
+    """A cached answer with its freshness and cost metadata."""
+    response: str
+    created: float  # time.time() when the answer was produced
+    expires: float  # time.time() after which it is stale
+    latency: float = 0.0  # Seconds the original request took
+    hits: int = 0
+    source: str = "api"
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the answer text."""
+        return len(self.response.encode('utf-8'))
+
+
+class ResponseCache:
+    """
+    LRU + TTL response cache with an optional SQLite tier.
+
+    Memory entries are evicted least recently used first once either
+    budget is exceeded. Persisted entries are promoted to memory when
+    read and pruned least recently used first beyond ``max_disk_entries``.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 500,
+                 max_bytes: int = 512 * 1024, db_path: Optional[Path] = None,
+                 max_disk_entries: int = 5000):
+        """
+        Initialize ResponseCache.
+
+        Args:
+            ttl_seconds: Default lifetime of an answer
+            max_entries: Maximum answers held in memory
+            max_bytes: Maximum answer bytes held in memory
+            db_path: SQLite file for the persistent tier, or None for memory only
+            max_disk_entries: Maximum answers kept on disk (0 = unbounded)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            self._open_db(Path(db_path))
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.latency_saved = 0.0
+
+    def _open_db(self, db_path: Path) -> None:
+        """Open (and create if needed) the persistent tier."""
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path))
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, query TEXT, response TEXT NOT NULL,"
+                " created REAL, expires REAL, latency REAL, hits INTEGER,"
+                " last_used REAL, source TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent response cache unavailable ({db_path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def make_key(query: str, context: List[Tuple[str, str]] = (), model: str = "") -> str:
+        """
+        Build a cache key.
+
+        Args:
+            query: User query
+            context: Recent (role, content) turns the answer depends on
+            model: Model that produces the answer
+
+        Returns:
+            Hex digest identifying the answer
+        """
+        material = json.dumps(
+            [model, normalize_query(query), [(role, ' '.join(content.split())) for role, content in context]]
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a fresh answer.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            The cached entry, or None on a miss or if it expired
+        """
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry.expires <= now:
+                self._forget(key)
+                self.expirations += 1
+            else:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._hit(key, entry, now)
+
+        entry = self._read_disk(key, now)
+        if entry is not None:
+            self._remember(key, entry)
+            self.disk_hits += 1
+            return self._hit(key, entry, now)
+
+        self.misses += 1
+        return None
+
+    def peek(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up an entry, fresh or not, without counting a lookup or touching its recency.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            The entry from either tier, or None
+        """
+        entry = self._memory.get(key)
+        if entry is not None or self._db is None:
+            return entry
+
+        cursor = self._execute(
+            "SELECT response, created, expires, latency, hits, source FROM responses WHERE key = ?", (key,)
+        )
+        row = cursor.fetchone() if cursor is not None else None
+        return CachedResponse(*row) if row is not None else None
+
+    def _hit(self, key: str, entry: CachedResponse, now: float) -> CachedResponse:
+        """Count a hit and the request time it saved."""
+        entry.hits += 1
+        self.latency_saved += entry.latency
+        if self._db is not None:
+            self._execute("UPDATE responses SET hits = ?, last_used = ? WHERE key = ?", (entry.hits, now, key))
+        return entry
+
+    def put(self, key: str, response: str, query: str = "", latency: float = 0.0,
+            ttl_seconds: Optional[float] = None, source: str = "api") -> None:
+        """
+        Store an answer in both tiers.
+
+        Args:
+            key: Key from ``make_key``
+            response: Answer text
+            query: Original query, kept on disk for inspection and prefetching
+            latency: Seconds the request for this answer took
+            ttl_seconds: Lifetime override for this answer
+            source: Where the answer came from (e.g. "api", "prefetch")
+        """
+        if not response:
+            return
+
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = CachedResponse(response, now, now + ttl, latency, 0, source)
+        self._remember(key, entry)
+
+        if self._db is not None:
+            self._execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, query, response, created, expires, latency, hits, last_used, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                (key, query, response, entry.created, entry.expires, latency, now, source)
+            )
+            if self.max_disk_entries:
+                self._prune_disk()
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Insert into the memory LRU, evicting least recently used entries."""
+        if entry.size > self.max_bytes:
+            return
+
+        self._forget(key)
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        """Drop a memory entry if present."""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+
+    def _read_disk(self, key: str, now: float) -> Optional[CachedResponse]:
+        """Read a fresh persisted entry."""
+        if self._db is None:
+            return None
+
+        row = self._execute(
+            "SELECT response, created, expires, latency, hits, source FROM responses WHERE key = ?", (key,)
+        )
+        row = row.fetchone() if row is not None else None
+        if row is None:
+            return None
+
+        entry = CachedResponse(*row)
+        if entry.expires <= now:
+            self._execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.expirations += 1
+            return None
+        return entry
+
+    def _prune_disk(self) -> None:
+        """Delete expired and least recently used persisted entries beyond the budget."""
+        self._execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        self._execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Cursor]:
+        """Run a statement on the persistent tier, disabling it on failure."""
+        try:
+            cursor = self._db.execute(sql, params)
+            if not sql.startswith("SELECT"):
+                self._db.commit()
+            return cursor
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent response cache disabled after error: {e}")
+            self.close()
+            return None
+
+    def disk_entries(self) -> int:
+        """Number of persisted answers."""
+        if self._db is None:
+            return 0
+        cursor = self._execute("SELECT COUNT(*) FROM responses")
+        return cursor.fetchone()[0] if cursor is not None else 0
+
+    def clear(self) -> None:
+        """Drop the memory tier (persisted entries are kept)."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+            self._db = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+
+        return {
+            'entries_in_memory': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'persistent': self._db is not None,
+            'entries_on_disk': self.disk_entries(),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (hits / lookups) * 100 if lookups else 0.0,
+            'latency_saved_seconds': self.latency_saved,
+            'expirations': self.expirations,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,209 @@
+"""
+Adaptive Routing Policy for Athina
+
+Keeps rolling latency and success estimates for every route (skills, the
+canned local answer, the local model and the cloud) separately for each
+network state, and picks the route with the highest expected utility:
+the quality an answer is expected to add over the canned local answer,
+minus what the expected wait costs. A query therefore goes to the cloud
+only while the cloud is measured to be fast and reliable enough for that
+query to be worth it.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+
+from .providers.base import ROUTE_CLOUD, ROUTE_LOCAL_LLM, ROUTE_LOCAL
+
+DEFAULT_POLICY = {
+    'enabled': True,
+    'latency_cost_per_second': 0.2,  # Quality units one second of waiting costs
+    'cloud_gain_complex': 1.0,  # Gain of a cloud answer to a complex query
+    'cloud_gain_simple': 0.2,  # Gain of a cloud answer to any other query
+    'local_llm_gain': 0.5,  # Gain of a local model answer
+    'smoothing': 0.2,  # Weight of the newest sample in the rolling estimates
+    'prior_success': 0.9,  # Success rate assumed before a route is measured
+    'estimate_half_life': 600.0,  # Seconds for an unused route's estimates to drift halfway back to the prior
+}
+
+
+@dataclass
+class RouteEstimate:
+    """Rolling latency and success estimates of one route in one network state."""
+    latency: float  # Seconds to the first answer text when the route succeeds
+    failure_latency: float  # Seconds lost before the route is given up on
+    success_rate: float
+    samples: int = 0
+    updated: float = 0.0
+
+    def record(self, latency: float, success: bool, smoothing: float) -> None:
+        """Fold one outcome into the estimates, counting the prior as one earlier sample."""
+        weight = max(smoothing, 1.0 / (self.samples + 2))
+        if success:
+            self.latency += weight * (latency - self.latency)
+        else:
+            self.failure_latency += weight * (latency - self.failure_latency)
+        self.success_rate += weight * ((1.0 if success else 0.0) - self.success_rate)
+        self.samples += 1
+        self.updated = time.time()
+
+    def expected_latency(self) -> float:
+        """Mean seconds to an answer, counting the time lost on failures."""
+        return self.success_rate * self.latency + (1.0 - self.success_rate) * self.failure_latency
+
+    def decayed(self, prior_latency: float, prior_success: float, half_life: float,
+                now: float) -> 'RouteEstimate':
+        """
+        Copy of the estimates drifted back toward the prior by their age.
+
+        A route that stopped being chosen after a bad spell is never
+        measured again; without the drift it would never be retried.
+        """
+        if not self.samples or half_life <= 0:
+            return self
+        keep = 0.5 ** (max(0.0, now - self.updated) / half_life)
+        return RouteEstimate(
+            latency=prior_latency + keep * (self.latency - prior_latency),
+            failure_latency=prior_latency + keep * (self.failure_latency - prior_latency),
+            success_rate=prior_success + keep * (self.success_rate - prior_success),
+            samples=self.samples,
+            updated=self.updated
+        )
+
+
+class RoutingPolicy:
+    """
+    Expected-utility route choice from measured per-route performance.
+
+    Utility of a route = expected gain - latency_cost_per_second * expected
+    latency. A failed cloud request is followed by the fallback answer,
+    computed alongside it, so its gain is the fallback's and its cost is
+    the time lost plus whatever of the fallback is still left to run.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize RoutingPolicy.
+
+        Args:
+            config: Policy parameters overriding DEFAULT_POLICY
+        """
+        self.logger = logging.getLogger(__name__)
+        self.parameters = {**DEFAULT_POLICY, **(config or {})}
+        self.enabled = bool(self.parameters['enabled'])
+
+        self.estimates: Dict[Tuple[str, str], RouteEstimate] = {}
+
+        # Statistics
+        self.decisions: Dict[str, int] = {}
+
+    def estimate(self, route: str, network_state: str, prior_latency: float) -> RouteEstimate:
+        """
+        Estimates of a route, created from a prior until it is measured.
+
+        Args:
+            route: Route constant
+            network_state: Network state (providers.connectivity NETWORK_*)
+            prior_latency: Latency assumed until the route is measured
+
+        Returns:
+            The route's estimate in this network state
+        """
+        key = (route, network_state)
+        estimate = self.estimates.get(key)
+        if estimate is None:
+            estimate = RouteEstimate(prior_latency, prior_latency, self.parameters['prior_success'])
+            self.estimates[key] = estimate
+        return estimate
+
+    def record(self, route: str, network_state: str, latency: float, success: bool = True) -> None:
+        """
+        Record the outcome of a routed query.
+
+        Args:
+            route: Route that answered (or failed to)
+            network_state: Network state at routing time
+            latency: Seconds to the first answer text, or until the route was given up on
+            success: Whether the route's answer was used
+        """
+        self.estimate(route, network_state, latency).record(latency, success, self.parameters['smoothing'])
+
+    def _current(self, route: str, network_state: str, prior_latency: float, now: float) -> RouteEstimate:
+        """Estimates of a route as they stand now, drifted toward the prior by their age."""
+        return self.estimate(route, network_state, prior_latency).decayed(
+            prior_latency, self.parameters['prior_success'], self.parameters['estimate_half_life'], now
+        )
+
+    def _latency(self, route: str, network_state: str, prior_latency: Optional[float]) -> float:
+        """Expected latency of a route, from its estimate or the prior."""
+        if prior_latency is None and (route, network_state) not in self.estimates:
+            return 0.0
+        return self.estimate(route, network_state, prior_latency or 0.0).expected_latency()
+
+    def choose(self, network_state: str, complex_query: bool,
+               cloud_latency: Optional[float], local_llm_latency: Optional[float]
+               ) -> Tuple[str, Dict[str, float], str]:
+        """
+        Pick the route with the highest expected utility.
+
+        Args:
+            network_state: Current network state
+            complex_query: Whether the query is expected to benefit most from the cloud
+            cloud_latency: Provider's latency estimate, None if the cloud is unavailable
+            local_llm_latency: Local model's latency estimate, None if it is not loaded
+
+        Returns:
+            Tuple of (route, utility per candidate route, explanation)
+        """
+        params = self.parameters
+        cost = params['latency_cost_per_second']
+        now = time.time()
+
+        local_latency = self._latency(ROUTE_LOCAL, network_state, None)
+        utilities = {ROUTE_LOCAL: -cost * local_latency}
+        fallback_gain, fallback_latency = 0.0, local_latency
+
+        if local_llm_latency is not None:
+            llm = self._current(ROUTE_LOCAL_LLM, network_state, local_llm_latency, now)
+            utilities[ROUTE_LOCAL_LLM] = llm.success_rate * params['local_llm_gain'] - cost * (
+                llm.expected_latency() + (1.0 - llm.success_rate) * local_latency
+            )
+            fallback_gain, fallback_latency = params['local_llm_gain'] * llm.success_rate, llm.latency
+
+        if cloud_latency is not None:
+            cloud = self._current(ROUTE_CLOUD, network_state, cloud_latency, now)
+            gain = params['cloud_gain_complex'] if complex_query else params['cloud_gain_simple']
+            failure = 1.0 - cloud.success_rate
+            utilities[ROUTE_CLOUD] = (
+                cloud.success_rate * gain + failure * fallback_gain
+                - cost * (cloud.expected_latency() + failure * max(0.0, fallback_latency - cloud.failure_latency))
+            )
+
+        route = max(utilities, key=utilities.get)
+        self.decisions[route] = self.decisions.get(route, 0) + 1
+
+        explanation = ", ".join(f"{name} {value:+.2f}" for name, value in
+                                sorted(utilities.items(), key=lambda item: -item[1]))
+        return route, utilities, f"expected utility {explanation} ({network_state})"
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get policy parameters, live estimates and decision counts."""
+        estimates: Dict[str, Dict[str, Any]] = {}
+        for (route, network_state), estimate in self.estimates.items():
+            estimates.setdefault(network_state, {})[route] = {
+                'latency': estimate.latency,
+                'failure_latency': estimate.failure_latency,
+                'success_rate': estimate.success_rate,
+                'expected_latency': estimate.expected_latency(),
+                'samples': estimate.samples,
+                'seconds_since_update': time.time() - estimate.updated if estimate.samples else None
+            }
+
+        return {
+            'parameters': dict(self.parameters),
+            'estimates': estimates,
+            'decisions': dict(self.decisions)
+        }
+
@@ -0,0 +1,381 @@
+"""
+Athina Skill Index
+
+Compiles the regex patterns of every registered skill into a matcher that
+does not slow down linearly as skills are added. Literal keywords that a
+pattern cannot match without are extracted from its parse tree and loaded
+into an Aho-Corasick automaton; one scan of the utterance yields the
+candidate patterns, which are then checked together by a single combined
+regex with one named group per pattern. Every matching skill is returned
+with a score instead of only the first hit.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Set, Tuple, FrozenSet
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+# Parse tree opcodes that repeat their operand
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+# Maximum number of combined regexes kept for distinct candidate sets
+COMBINED_CACHE_SIZE = 256
+
+# Numbered or named backreferences change meaning once a pattern is embedded
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# A pattern's own named groups would clash with the combined regex's p<index> groups
+NAMED_GROUP = re.compile(r"\(\?P<")
+
+
+def analyze_pattern(pattern: str, flags: int = 0) -> Tuple[Optional[Set[str]], int]:
+    """
+    Find the literal keywords and minimum width of a pattern.
+
+    Args:
+        pattern: Regex source
+        flags: Regex flags the pattern is compiled with
+
+    Returns:
+        Tuple of (lower-cased keywords at least one of which occurs in any
+        string the pattern matches, or None if no such set can be derived;
+        minimum number of characters any match spans)
+    """
+    try:
+        tree = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None, 0
+    return _necessary(tree), tree.getwidth()[0]
+
+
+def _necessary(items) -> Optional[Set[str]]:
+    """Most selective necessary keyword set of a parsed sequence."""
+    candidates: List[Set[str]] = []
+    run: List[str] = []
+
+    def flush() -> None:
+        if run:
+            candidates.append({''.join(run).lower()})
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            found = _necessary(av[-1])
+        elif op is sre_constants.BRANCH:
+            branches = [_necessary(branch) for branch in av[1]]
+            found = set().union(*branches) if all(branches) else None
+        elif op in _REPEATS:
+            found = _necessary(av[2]) if av[0] >= 1 else None
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            found = _necessary(av)
+        else:
+            found = None
+
+        if found:
+            candidates.append(found)
+
+    flush()
+    if not candidates:
+        return None
+
+    # Longer keywords are rarer; among equals prefer fewer alternatives
+    return max(candidates, key=lambda keywords: (min(len(k) for k in keywords), -len(keywords)))
+
+
+class AhoCorasick:
+    """Multi-keyword matcher that reports every keyword found in one pass."""
+
+    def __init__(self, keywords: List[str]):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Keywords to search for; their list index is the id reported
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = next_state
+            self._out[state].add(keyword_id)
+
+        # Breadth-first failure links
+        frontier = list(self._goto[0].values())
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                for char, child in self._goto[state].items():
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    target = self._goto[fallback].get(char, 0)
+                    self._fail[child] = target if target != child else 0
+                    self._out[child] |= self._out[self._fail[child]]
+                    next_frontier.append(child)
+            frontier = next_frontier
+
+    def search(self, text: str) -> Set[int]:
+        """
+        Find the keywords occurring in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Ids of the keywords found
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+@dataclass
+class IndexedPattern:
+    """A skill pattern with its prefilter keywords."""
+    skill: str
+    source: str
+    regex: re.Pattern
+    keywords: Optional[Set[str]]
+    min_width: int
+
+
+@dataclass
+class SkillMatch:
+    """A skill whose pattern matched an utterance."""
+    skill: str
+    score: float
+    pattern: str
+    span: Tuple[int, int]
+
+
+class SkillIndex:
+    """
+    Keyword-prefiltered, combined-regex matcher over skill patterns.
+
+    Patterns are added per skill at registration time; the automaton is
+    rebuilt on the first match after a registration, so registering many
+    skills in a row costs one build.
+    """
+
+    def __init__(self, flags: int = re.IGNORECASE):
+        """
+        Initialize SkillIndex.
+
+        Args:
+            flags: Regex flags for all patterns
+        """
+        self.logger = logging.getLogger(__name__)
+        self.flags = flags
+
+        self._patterns: List[IndexedPattern] = []
+        self._skill_order: Dict[str, int] = {}
+
+        self._automaton: Optional[AhoCorasick] = None
+        self._keyword_patterns: List[List[int]] = []
+        self._unfiltered: List[int] = []
+        self._combined: Dict[FrozenSet[int], Optional[re.Pattern]] = {}
+        self._dirty = False
+
+        # Statistics
+        self.total_matches = 0
+        self.total_candidates = 0
+        self.average_match_time = 0.0
+
+    def add(self, skill: str, patterns: List[str]) -> None:
+        """
+        Add (or replace) the patterns of a skill.
+
+        Args:
+            skill: Skill name
+            patterns: Regex patterns
+
+        Raises:
+            re.error: If a pattern does not compile
+        """
+        compiled = [(p, re.compile(p, self.flags)) for p in patterns]
+
+        if skill in self._skill_order:
+            self._patterns = [entry for entry in self._patterns if entry.skill != skill]
+        else:
+            self._skill_order[skill] = len(self._skill_order)
+
+        for source, regex in compiled:
+            keywords, min_width = analyze_pattern(source, self.flags)
+            self._patterns.append(IndexedPattern(skill, source, regex, keywords, min_width))
+
+        self._dirty = True
+
+    def build(self) -> None:
+        """Rebuild the keyword automaton after patterns changed."""
+        keywords: List[str] = []
+        keyword_ids: Dict[str, int] = {}
+        self._keyword_patterns = []
+        self._unfiltered = []
+
+        for index, entry in enumerate(self._patterns):
+            if not entry.keywords:
+                self._unfiltered.append(index)
+                continue
+            for keyword in entry.keywords:
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(keywords)
+                    keywords.append(keyword)
+                    self._keyword_patterns.append([])
+                self._keyword_patterns[keyword_ids[keyword]].append(index)
+
+        self._automaton = AhoCorasick(keywords)
+        self._combined.clear()
+        self._dirty = False
+
+        self.logger.debug(
+            f"Skill index built: {len(self._patterns)} patterns, {len(keywords)} keywords, "
+            f"{len(self._unfiltered)} unfiltered"
+        )
+
+    def match(self, text: str) -> List[SkillMatch]:
+        """
+        Find every skill matching an utterance.
+
+        Args:
+            text: User utterance
+
+        Returns:
+            Best match per skill, highest score first (registration order
+            breaks ties)
+        """
+        if self._dirty or self._automaton is None:
+            self.build()
+
+        start_time = time.perf_counter()
+        lowered = text.lower()
+
+        candidates = set(self._unfiltered)
+        for keyword_id in self._automaton.search(lowered):
+            candidates.update(self._keyword_patterns[keyword_id])
+
+        best: Dict[str, SkillMatch] = {}
+        if candidates:
+            for index, span in self._search(frozenset(candidates), text):
+                entry = self._patterns[index]
+                score = self._score(entry, lowered, span)
+                if entry.skill not in best or score > best[entry.skill].score:
+                    best[entry.skill] = SkillMatch(entry.skill, score, entry.source, span)
+
+        matches = sorted(best.values(), key=lambda m: (-m.score, self._skill_order[m.skill]))
+
+        self.total_matches += 1
+        self.total_candidates += len(candidates)
+        elapsed = time.perf_counter() - start_time
+        self.average_match_time += (elapsed - self.average_match_time) / self.total_matches
+
+        return matches
+
+    @staticmethod
+    def _score(entry: IndexedPattern, lowered: str, span: Tuple[int, int]) -> float:
+        """
+        Score a match by how much of the utterance the pattern pins down.
+
+        Wildcards such as ``.*`` can stretch a match over the whole
+        utterance, so the evidence counted is the pattern's minimum width,
+        or its longest keyword found in the match if that is longer.
+        """
+        matched = lowered[span[0]:span[1]]
+        evidence = max([entry.min_width] + [len(k) for k in entry.keywords or () if k in matched])
+        return min(1.0, evidence / max(len(lowered.strip()), 1))
+
+    def _search(self, candidates: FrozenSet[int], text: str) -> List[Tuple[int, Tuple[int, int]]]:
+        """Run the candidate patterns over the text, returning (pattern index, span) hits."""
+        embeddable = frozenset(
+            i for i in candidates
+            if not BACKREFERENCE.search(self._patterns[i].source) and not NAMED_GROUP.search(self._patterns[i].source)
+        )
+        combined = self._combined_regex(embeddable) if embeddable else None
+
+        hits = []
+        if combined is not None:
+            found = combined.match(text)
+            hits = [
+                (int(name[1:]), found.span(name))
+                for name, value in found.groupdict().items()
+                if value is not None
+            ]
+            remaining = candidates - embeddable
+        else:
+            remaining = candidates
+
+        # Patterns that cannot be embedded (backreferences, named groups, inline flags) run one by one
+        for index in sorted(remaining):
+            found = self._patterns[index].regex.search(text)
+            if found:
+                hits.append((index, found.span()))
+
+        return hits
+
+    def _combined_regex(self, candidates: FrozenSet[int]) -> Optional[re.Pattern]:
+        """
+        One regex checking every candidate pattern in a single call.
+
+        Each pattern sits in an optional lookahead anchored at the start of
+        the text, so the regex always matches and each named group records
+        where (and whether) its pattern first matches.
+        """
+        if candidates in self._combined:
+            return self._combined[candidates]
+
+        source = ''.join(
+            rf"(?:(?=[\s\S]*?(?P<p{index}>{self._patterns[index].source})))?"
+            for index in sorted(candidates)
+        )
+        try:
+            combined = re.compile(source, self.flags)
+        except re.error:
+            combined = None
+
+        if len(self._combined) >= COMBINED_CACHE_SIZE:
+            self._combined.pop(next(iter(self._combined)))
+        self._combined[candidates] = combined
+        return combined
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            'skills': len(self._skill_order),
+            'patterns': len(self._patterns),
+            'unfiltered_patterns': len(self._unfiltered),
+            'total_matches': self.total_matches,
+            'average_candidates': self.total_candidates / max(self.total_matches, 1),
+            'average_match_time_ms': self.average_match_time * 1000,
+            'cached_combined_regexes': len(self._combined)
+        }
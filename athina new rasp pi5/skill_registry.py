@@ -0,0 +1,353 @@
+"""
+Athina Skill Registry
+
+Holds the skills the persona engine can dispatch to, whether built in or
+provided by plugins. Plugins are discovered through the ``athina.skills``
+entry point group, and a skill's handler module is imported only when the
+skill is first executed. Handlers run with a per-skill timeout, and each
+skill keeps a latency histogram. A coroutine handler that exceeds its
+timeout is cancelled; a synchronous one runs on the registry's own small
+thread pool, where it cannot be stopped, so the skill is skipped until
+the overrunning call returns.
+
+A plugin package declares its skills in a lightweight module, for example::
+
+    # setup.py
+    entry_points={"athina.skills": ["vehicle = athina_vehicle.manifest:SKILLS"]}
+
+    # athina_vehicle/manifest.py
+    SKILLS = [SkillSpec(
+        name="vehicle",
+        patterns=[r"\\b(fuel|tyre|tire) (level|pressure)\\b"],
+        examples=["how much fuel is left", "check the tyre pressure"],
+        handler="athina_vehicle.obd:handle",  # imported on first use
+        timeout=8.0,
+    )]
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable, Union
+
+from .lazy_imports import load
+
+ENTRY_POINT_GROUP = "athina.skills"
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class SkillSpec:
+    """
+    Declaration of a skill.
+
+    ``handler`` is either an async callable taking the user input, or a
+    ``"module:attribute"`` reference resolved on first execution.
+    Synchronous callables are run on the registry's thread pool.
+    """
+    name: str
+    patterns: List[str]
+    handler: Union[Callable, str]
+    examples: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None  # None uses the registry default
+    description: str = ""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        """
+        Initialize LatencyHistogram.
+
+        Args:
+            bounds_ms: Ascending bucket upper bounds in milliseconds
+        """
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)  # Last bucket is overflow
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation."""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket containing the given percentile, in milliseconds."""
+        if not self.total:
+            return 0.0
+        rank = pct / 100.0 * self.total
+        seen = 0
+        for bound, count in zip(self.bounds_ms + (self.max_ms,), self.counts):
+            seen += count
+            if seen >= rank:
+                return float(min(bound, self.max_ms))
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Histogram summary."""
+        labels = [f"<={b}ms" for b in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            'count': self.total,
+            'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': self.max_ms,
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class _RegisteredSkill:
+    """Registry entry: spec, resolved handler and statistics."""
+
+    def __init__(self, spec: SkillSpec, source: str):
+        self.spec = spec
+        self.source = source
+        self.handler: Optional[Callable] = spec.handler if callable(spec.handler) else None
+        self.load_error: Optional[str] = None
+        self.executions = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.skipped = 0
+        self.overrunning = False  # A timed-out synchronous call is still running
+        self.latency = LatencyHistogram()
+
+
+class SkillRegistry:
+    """
+    Registry of built-in and plugin skills.
+
+    Registration only records a skill's declaration; handler modules are
+    imported on the first execution of the skill.
+    """
+
+    def __init__(self, default_timeout: float = 5.0, timeouts: Optional[Dict[str, float]] = None,
+                 disabled: Optional[List[str]] = None, max_workers: int = 2):
+        """
+        Initialize SkillRegistry.
+
+        Args:
+            default_timeout: Handler timeout in seconds for skills without their own
+            timeouts: Per-skill timeout overrides
+            disabled: Skills that are ignored when registered
+            max_workers: Threads for synchronous handlers, kept apart from the
+                default executor that audio playback and synthesis use
+        """
+        self.logger = logging.getLogger(__name__)
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        self.disabled = set(disabled or [])
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="skill")
+
+        self._skills: Dict[str, _RegisteredSkill] = {}
+        self.plugin_errors: Dict[str, str] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._skills
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    @property
+    def specs(self) -> List[SkillSpec]:
+        """Registered skill declarations in registration order."""
+        return [entry.spec for entry in self._skills.values()]
+
+    def register(self, spec: SkillSpec, source: str = "builtin") -> bool:
+        """
+        Register (or replace) a skill.
+
+        Args:
+            spec: Skill declaration
+            source: Where the skill came from, for statistics
+
+        Returns:
+            True if registered, False if the skill is disabled
+
+        Raises:
+            ValueError: If a pattern is not a string or does not compile; an
+                existing skill of the same name is kept
+        """
+        if spec.name in self.disabled:
+            self.logger.info(f"Skill '{spec.name}' is disabled")
+            return False
+
+        for pattern in spec.patterns:
+            try:
+                re.compile(pattern)
+            except (re.error, TypeError) as e:
+                raise ValueError(f"Skill '{spec.name}' has an invalid pattern {pattern!r}: {e}") from e
+
+        if spec.name in self._skills:
+            self.logger.warning(f"Skill '{spec.name}' from {source} replaces an existing skill")
+
+        self._skills[spec.name] = _RegisteredSkill(spec, source)
+        return True
+
+    def discover(self, group: str = ENTRY_POINT_GROUP) -> List[SkillSpec]:
+        """
+        Register skills declared by installed plugins.
+
+        Each entry point may resolve to a SkillSpec, a list of them, or a
+        callable returning either. Plugins that fail to load and skills
+        with invalid patterns are skipped and recorded in ``plugin_errors``.
+
+        Args:
+            group: Entry point group to scan
+
+        Returns:
+            Newly registered skill declarations
+        """
+        from importlib import metadata
+
+        try:
+            entry_points = metadata.entry_points()
+            if hasattr(entry_points, 'select'):
+                entry_points = entry_points.select(group=group)
+            else:  # Python < 3.10
+                entry_points = entry_points.get(group, [])
+        except Exception as e:
+            self.logger.warning(f"Skill plugin discovery failed: {e}")
+            return []
+
+        registered = []
+        for entry_point in entry_points:
+            try:
+                declared = entry_point.load()
+                if callable(declared) and not isinstance(declared, SkillSpec):
+                    declared = declared()
+                if isinstance(declared, SkillSpec):
+                    declared = [declared]
+
+                for spec in declared:
+                    try:
+                        if self.register(spec, source=f"plugin:{entry_point.name}"):
+                            registered.append(spec)
+                    except ValueError as e:
+                        self.plugin_errors[f"{entry_point.name}:{spec.name}"] = str(e)
+                        self.logger.error(f"Skipping skill from plugin '{entry_point.name}': {e}")
+
+            except Exception as e:
+                self.plugin_errors[entry_point.name] = str(e)
+                self.logger.error(f"Failed to load skill plugin '{entry_point.name}': {e}")
+
+        if registered:
+            self.logger.info(f"Discovered {len(registered)} plugin skill(s)")
+        return registered
+
+    def timeout_for(self, name: str) -> float:
+        """Effective handler timeout for a skill."""
+        if name in self.timeouts:
+            return self.timeouts[name]
+        spec_timeout = self._skills[name].spec.timeout
+        return spec_timeout if spec_timeout is not None else self.default_timeout
+
+    def _resolve(self, entry: _RegisteredSkill) -> Optional[Callable]:
+        """Import a skill's handler on first use."""
+        if entry.handler is not None or entry.load_error is not None:
+            return entry.handler
+
+        reference = entry.spec.handler
+        try:
+            module_name, _, attribute = reference.partition(':')
+            handler = load(module_name, f"skill:{entry.spec.name}")
+            for part in attribute.split('.') if attribute else []:
+                handler = getattr(handler, part)
+            if not callable(handler):
+                raise TypeError(f"{reference} is not callable")
+            entry.handler = handler
+        except Exception as e:
+            entry.load_error = str(e)
+            self.logger.error(f"Failed to load handler for skill '{entry.spec.name}': {e}")
+
+        return entry.handler
+
+    async def execute(self, name: str, user_input: str) -> Optional[str]:
+        """
+        Run a skill handler with its timeout.
+
+        Args:
+            name: Skill name
+            user_input: User's spoken text
+
+        Returns:
+            The handler's response, or None if it failed, timed out,
+            returned nothing or is still running past an earlier timeout
+        """
+        entry = self._skills[name]
+        handler = self._resolve(entry)
+        if handler is None:
+            entry.failures += 1
+            return None
+
+        is_coroutine = asyncio.iscoroutinefunction(handler)
+        if not is_coroutine and entry.overrunning:
+            entry.skipped += 1
+            self.logger.warning(f"Skill '{name}' skipped, its last timed-out call is still running")
+            return None
+
+        timeout = self.timeout_for(name)
+        start_time = time.perf_counter()
+
+        try:
+            if is_coroutine:
+                pending = handler(user_input)
+            else:
+                thread_call = self._executor.submit(handler, user_input)
+                pending = asyncio.wrap_future(thread_call)
+
+            response = await asyncio.wait_for(pending, timeout=timeout)
+            entry.executions += 1
+            return response
+
+        except asyncio.TimeoutError:
+            entry.timeouts += 1
+            if is_coroutine:
+                self.logger.warning(f"Skill '{name}' timed out after {timeout:.1f}s and was cancelled")
+            else:
+                # The thread cannot be stopped; skip the skill until it returns
+                entry.overrunning = True
+                thread_call.add_done_callback(lambda _: setattr(entry, 'overrunning', False))
+                self.logger.warning(f"Skill '{name}' timed out after {timeout:.1f}s (still running)")
+            return None
+
+        except Exception as e:
+            entry.failures += 1
+            self.logger.error(f"Skill '{name}' execution failed: {e}")
+            return None
+
+        finally:
+            entry.latency.record(time.perf_counter() - start_time)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Per-skill execution statistics and latency histograms."""
+        return {
+            name: {
+                'source': entry.source,
+                'loaded': entry.handler is not None,
+                'load_error': entry.load_error,
+                'timeout': self.timeout_for(name),
+                'executions': entry.executions,
+                'timeouts': entry.timeouts,
+                'failures': entry.failures,
+                'skipped': entry.skipped,
+                'overrunning': entry.overrunning,
+                'latency': entry.latency.to_dict()
+            }
+            for name, entry in self._skills.items()
+        }
+
+    def shutdown(self) -> None:
+        """Stop the handler thread pool without waiting for overrunning handlers."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
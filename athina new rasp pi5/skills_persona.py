@@ -9,8 +9,7 @@ import asyncio
 import logging
 import time
 import random
-import re
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Union, Tuple, AsyncIterator
 from pathlib import Path
 import yaml
 import json
@@ -19,6 +18,35 @@ from datetime import datetime
 from .errors import PersonaError, InitializationError
 from .logging_cfg import PerformanceTimer
 from .nlp_router import NLPRouter
+from .skill_index import SkillIndex
+from .intent_classifier import IntentClassifier, IntentPrediction
+from .skill_registry import SkillRegistry, SkillSpec
+from .conversation_context import ConversationContext
+
+
+TIME_GREETINGS = ["Good morning", "Good afternoon", "Good evening"]
+
+GREETING_TEMPLATES = [
+    "{time_greeting}! How can I help you today?",
+    "Hello! {catchphrase}",
+    "{time_greeting}! What can I do for you?",
+    "Hello there! Ready to assist you."
+]
+
+FAREWELL_RESPONSES = [
+    "Goodbye! Have a wonderful day!",
+    "See you later! Don't hesitate to call if you need anything.",
+    "Farewell! It was a pleasure helping you.",
+    "Take care! I'll be here whenever you need me."
+]
+
+WARM_PREFIX = "I'm happy to help!"
+
+WITTY_ADDITIONS = [
+    "Hope that brightens your day!",
+    "Pretty cool, right?",
+    "Knowledge is power, as they say!"
+]
 
 
 class SkillsPersonaEngine:
@@ -47,16 +75,29 @@ class SkillsPersonaEngine:
         self.catchphrases = config.persona.catchphrases
         self.greeting_messages = config.persona.greeting_messages
         self.error_messages = config.persona.error_messages
+        self.acknowledgement_messages = config.persona.acknowledgement_messages
         
         # NLP Router for enhanced responses
         self.nlp_router = None
         
-        # Skills registry
-        self.skills = {}
-        self.skill_patterns = []
+        # Skills registry (built-in and plugin skills) and the index over their patterns
+        self.skills = SkillRegistry(
+            default_timeout=config.skills.default_timeout,
+            timeouts=config.skills.timeouts,
+            disabled=config.skills.disabled,
+            max_workers=config.skills.max_workers
+        )
+        self.skill_index = SkillIndex()
+        
+        # Offline intent model trained from skill examples; its confidence
+        # decides whether a query can stay local
+        self.intent_classifier = IntentClassifier()
+        self._intent_model_stale = False
+        self.local_confidence_threshold = config.openai.fallback.get('local_confidence_threshold', 0.7)
+        self.intent_dispatches = 0
         
-        # Conversation state
-        self.conversation_history = []
+        # Conversation state, token-counted as turns are added
+        self.conversation = ConversationContext.from_config(config.openai)
         self.user_context = {}
         self.session_start_time = None
         
@@ -75,11 +116,15 @@ class SkillsPersonaEngine:
             # Load persona configuration
             await self._load_persona_config()
             
-            # Initialize built-in skills
+            # Initialize built-in skills, then plugin skills (handlers load on first use)
             await self._initialize_builtin_skills()
+            if self.config.skills.load_plugins:
+                for spec in self.skills.discover():
+                    self._index_skill(spec)
+            self._train_intent_model()
             
-            # Initialize NLP router if OpenAI is enabled
-            if self.config.openai.enabled:
+            # Initialize NLP router if the cloud or the local model is enabled
+            if self.config.openai.enabled or self.config.local_llm.enabled:
                 await self._initialize_nlp_router()
             
             # Set session start time
@@ -128,7 +173,11 @@ class SkillsPersonaEngine:
                 r"\b(what|tell me|what's|whats).*(time|date|day)\b",
                 r"\b(time|date|day)\s*(is it|today)\b"
             ],
-            handler=self._datetime_skill
+            handler=self._datetime_skill,
+            examples=[
+                "what time is it", "what's the date today", "tell me the time",
+                "what day is it today", "do you know the time", "which day of the week is it"
+            ]
         )
         
         # Weather skill (mock)
@@ -138,7 +187,11 @@ class SkillsPersonaEngine:
                 r"\b(what|how|tell me).*(weather|temperature|forecast)\b",
                 r"\b(weather|temperature|forecast)\s*(like|today|tomorrow)\b"
             ],
-            handler=self._weather_skill
+            handler=self._weather_skill,
+            examples=[
+                "what's the weather like", "is it going to rain today", "how hot is it outside",
+                "weather forecast for tomorrow", "do I need an umbrella", "what's the temperature"
+            ]
         )
         
         # System info skill
@@ -148,7 +201,11 @@ class SkillsPersonaEngine:
                 r"\b(system|status|health|performance)\s*(info|information|check)\b",
                 r"\bhow are you\s*(doing|feeling)\b"
             ],
-            handler=self._system_skill
+            handler=self._system_skill,
+            examples=[
+                "system status check", "how are you doing", "run a health check",
+                "how is your performance", "are all systems working", "system information"
+            ]
         )
         
         # Personal info skill
@@ -158,7 +215,11 @@ class SkillsPersonaEngine:
                 r"\b(who|what|tell me).*(you are|your name|about yourself)\b",
                 r"\byour\s*(name|purpose|creator)\b"
             ],
-            handler=self._personal_skill
+            handler=self._personal_skill,
+            examples=[
+                "who are you", "what's your name", "tell me about yourself",
+                "what is your purpose", "who created you", "introduce yourself"
+            ]
         )
         
         # Greeting skill
@@ -168,7 +229,10 @@ class SkillsPersonaEngine:
                 r"\b(hello|hi|hey|greetings|good\s*(morning|afternoon|evening))\b",
                 r"\bhow\s*do\s*you\s*do\b"
             ],
-            handler=self._greeting_skill
+            handler=self._greeting_skill,
+            examples=[
+                "hello", "hi there", "hey athina", "good morning", "good evening", "how do you do"
+            ]
         )
         
         # Farewell skill
@@ -178,23 +242,33 @@ class SkillsPersonaEngine:
                 r"\b(goodbye|bye|farewell|see you|good\s*night)\b",
                 r"\b(exit|quit|stop|shutdown)\b"
             ],
-            handler=self._farewell_skill
+            handler=self._farewell_skill,
+            examples=[
+                "goodbye", "bye for now", "see you later", "good night", "that's all for now", "talk to you later"
+            ]
         )
     
     async def _initialize_nlp_router(self) -> None:
         """Initialize NLP router for enhanced responses."""
         try:
-            # Import OpenAI provider
+            # Import providers
             from .providers.openai_provider import OpenAIProvider
+            from .providers.local_llm_provider import LocalLLMProvider
             
-            # Create OpenAI provider
-            openai_provider = OpenAIProvider(self.config.openai)
-            await openai_provider.initialize()
+            # Create OpenAI provider; without it the local model still answers offline
+            openai_provider = None
+            if self.config.openai.enabled:
+                openai_provider = OpenAIProvider(self.config)
+                await openai_provider.initialize()
+            
+            # The local model is loaded in the background by warm_up()
+            local_provider = LocalLLMProvider(self.config) if self.config.local_llm.enabled else None
             
             # Create NLP router
             self.nlp_router = NLPRouter(
                 config=self.config.openai,
-                openai_provider=openai_provider
+                openai_provider=openai_provider,
+                local_provider=local_provider
             )
             
             self.logger.info("NLP router initialized for enhanced responses")
@@ -203,29 +277,42 @@ class SkillsPersonaEngine:
             self.logger.warning(f"NLP router initialization failed: {e}")
             self.nlp_router = None
     
-    def register_skill(self, name: str, patterns: List[str], handler: Callable) -> None:
+    def register_skill(self, name: str, patterns: List[str], handler: Union[Callable, str],
+                       examples: Optional[List[str]] = None, timeout: Optional[float] = None) -> None:
         """
         Register a skill with the persona engine.
         
         Args:
             name: Skill name
             patterns: List of regex patterns to match
-            handler: Async function to handle the skill
+            handler: Async function to handle the skill, or a "module:attribute"
+                reference imported on first use
+            examples: Optional example utterances for the intent classifier
+            timeout: Optional handler timeout in seconds
+        
+        Raises:
+            ValueError: If a pattern does not compile
         """
-        self.skills[name] = {
-            'patterns': [re.compile(p, re.IGNORECASE) for p in patterns],
-            'handler': handler,
-            'executions': 0
-        }
+        spec = SkillSpec(name=name, patterns=patterns, handler=handler,
+                         examples=list(examples or []), timeout=timeout)
+        if self.skills.register(spec):
+            self._index_skill(spec)
+    
+    def _index_skill(self, spec: SkillSpec) -> None:
+        """Add a registered skill to the pattern index and intent model."""
+        self.skill_index.add(spec.name, spec.patterns)
+        self._intent_model_stale = True
         
-        self.logger.debug(f"Registered skill: {name}")
+        self.logger.debug(f"Registered skill: {spec.name}")
     
-    async def process_input(self, user_input: str) -> str:
+    async def process_input(self, user_input: str, skill_name: Optional[str] = None) -> str:
         """
         Process user input and generate response.
         
         Args:
             user_input: User's spoken text
+            skill_name: Optional skill to dispatch to directly, bypassing
+                pattern matching (used by command spotting)
             
         Returns:
             Response text
@@ -236,21 +323,17 @@ class SkillsPersonaEngine:
         try:
             with PerformanceTimer("persona_processing", self.logger):
                 # Add to conversation history
-                self.conversation_history.append({
-                    'role': 'user',
-                    'content': user_input,
-                    'timestamp': datetime.now()
-                })
+                self.conversation.append('user', user_input)
                 
                 # Try skill-based response first
-                skill_response = await self._match_and_execute_skill(user_input)
+                skill_response, intent = await self._run_skills(user_input, skill_name)
                 
                 if skill_response:
                     response = skill_response
                 else:
                     # Use NLP router for complex queries
                     if self.nlp_router:
-                        response = await self._get_nlp_response(user_input)
+                        response = await self._get_nlp_response(user_input, intent)
                     else:
                         # Fallback to simple responses
                         response = await self._fallback_response(user_input)
@@ -258,23 +341,11 @@ class SkillsPersonaEngine:
                 # Apply persona style
                 response = self._apply_persona_style(response)
                 
-                # Add to conversation history
-                self.conversation_history.append({
-                    'role': 'assistant',
-                    'content': response,
-                    'timestamp': datetime.now()
-                })
-                
-                # Trim conversation history
-                if len(self.conversation_history) > 20:
-                    self.conversation_history = self.conversation_history[-20:]
+                # Add to conversation history (older turns fold into its summary)
+                self.conversation.append('assistant', response)
                 
                 # Update statistics
-                response_time = time.time() - start_time
-                self.average_response_time = (
-                    (self.average_response_time * (self.total_interactions - 1) + response_time) /
-                    self.total_interactions
-                )
+                self._update_response_time(time.time() - start_time)
                 
                 return response
                 
@@ -282,40 +353,147 @@ class SkillsPersonaEngine:
             self.logger.error(f"Input processing failed: {e}")
             return random.choice(self.error_messages)
     
+    async def process_input_stream(self, user_input: str,
+                                   skill_name: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Process user input and stream the response as it is generated.
+        
+        Skill and local responses arrive as one piece; responses routed to
+        OpenAI arrive token by token, so speech can start with the first
+        sentence.
+        
+        Args:
+            user_input: User's spoken text
+            skill_name: Optional skill to dispatch to directly, bypassing
+                pattern matching (used by command spotting)
+            
+        Yields:
+            Response text pieces in order
+        """
+        start_time = time.time()
+        self.total_interactions += 1
+        pieces = []
+        
+        try:
+            self.conversation.append('user', user_input)
+            
+            skill_response, intent = await self._run_skills(user_input, skill_name)
+            
+            if skill_response:
+                deltas = self._style_stream(self._single(skill_response))
+            elif self.nlp_router:
+                deltas = self._style_stream(await self._get_nlp_stream(user_input, intent))
+            else:
+                deltas = self._style_stream(self._single(await self._fallback_response(user_input)))
+            
+            async for delta in deltas:
+                pieces.append(delta)
+                yield delta
+                
+        except Exception as e:
+            self.logger.error(f"Input processing failed: {e}")
+            if not pieces:
+                message = random.choice(self.error_messages)
+                pieces.append(message)
+                yield message
+        
+        finally:
+            # Record whatever was produced, even if the listener stopped early
+            self.conversation.append('assistant', ''.join(pieces))
+            self._update_response_time(time.time() - start_time)
+    
+    async def _run_skills(self, user_input: str,
+                          skill_name: Optional[str] = None) -> Tuple[Optional[str], Optional[IntentPrediction]]:
+        """
+        Answer with a skill, if one applies.
+        
+        Args:
+            user_input: User's spoken text
+            skill_name: Optional skill to dispatch to directly
+            
+        Returns:
+            Tuple of (skill response or None, intent prediction if one was made)
+        """
+        intent = None
+        start_time = time.time()
+        if skill_name in self.skills:
+            skill_response = await self._execute_skill(skill_name, user_input)
+            self._record_skill_latency(skill_response, start_time)
+            return skill_response, intent
+        
+        skill_response = await self._match_and_execute_skill(user_input)
+        
+        # No pattern matched: a confident intent prediction stays local
+        if not skill_response:
+            intent = self.classify_intent(user_input)
+            if intent.skill and intent.confidence >= self.local_confidence_threshold:
+                self.logger.debug(
+                    f"Intent '{intent.skill}' predicted (confidence: {intent.confidence:.2f})"
+                )
+                skill_response = await self._execute_skill(intent.skill, user_input)
+                if skill_response:
+                    self.intent_dispatches += 1
+        
+        self._record_skill_latency(skill_response, start_time)
+        return skill_response, intent
+    
+    def _record_skill_latency(self, skill_response: Optional[str], start_time: float) -> None:
+        """Feed a skill answer's latency to the router's per-route estimates."""
+        if skill_response and self.nlp_router:
+            self.nlp_router.record_skill_answer(time.time() - start_time)
+    
+    def _update_response_time(self, response_time: float) -> None:
+        """Fold one response time into the running average."""
+        self.average_response_time = (
+            (self.average_response_time * (self.total_interactions - 1) + response_time) /
+            self.total_interactions
+        )
+    
     async def _match_and_execute_skill(self, user_input: str) -> Optional[str]:
-        """Match user input to skills and execute."""
-        for skill_name, skill_info in self.skills.items():
-            for pattern in skill_info['patterns']:
-                if pattern.search(user_input):
-                    try:
-                        # Execute skill handler
-                        response = await skill_info['handler'](user_input)
-                        
-                        # Update statistics
-                        skill_info['executions'] += 1
-                        
-                        self.logger.debug(f"Executed skill: {skill_name}")
-                        return response
-                        
-                    except Exception as e:
-                        self.logger.error(f"Skill '{skill_name}' execution failed: {e}")
-                        return None
+        """Match user input to skills and execute the best-scoring one that responds."""
+        matches = self.skill_index.match(user_input)
+        
+        for match in matches:
+            self.logger.debug(f"Skill '{match.skill}' matched (score: {match.score:.2f})")
+            response = await self._execute_skill(match.skill, user_input)
+            if response:
+                return response
         
         return None
     
-    async def _get_nlp_response(self, user_input: str) -> str:
+    async def _execute_skill(self, skill_name: str, user_input: str) -> Optional[str]:
+        """Execute a registered skill handler within its timeout."""
+        response = await self.skills.execute(skill_name, user_input)
+        
+        if response:
+            self.logger.debug(f"Executed skill: {skill_name}")
+        return response
+    
+    def classify_intent(self, user_input: str) -> IntentPrediction:
+        """
+        Predict the skill for an utterance with the offline intent model.
+        
+        Args:
+            user_input: User's spoken text
+            
+        Returns:
+            IntentPrediction with a calibrated confidence
+        """
+        if self._intent_model_stale:
+            self._train_intent_model()
+        
+        return self.intent_classifier.predict(user_input)
+    
+    def _train_intent_model(self) -> None:
+        """Retrain the intent classifier from the registered skill examples."""
+        self.intent_classifier.fit({spec.name: spec.examples for spec in self.skills.specs})
+        self._intent_model_stale = False
+    
+    async def _get_nlp_response(self, user_input: str,
+                                intent: Optional[IntentPrediction] = None) -> str:
         """Get response using NLP router."""
         try:
-            # Prepare context
-            context = {
-                'conversation_history': self.conversation_history[-10:],  # Last 10 messages
-                'persona_context': {
-                    'name': self.name,
-                    'personality_traits': self.personality_traits,
-                    'voice_style': self.voice_style
-                },
-                'persona_manager': self  # For local fallback
-            }
+            context = self._nlp_context(user_input, intent)
             
             # Route query
             response, decision = await self.nlp_router.route_query(user_input, context)
@@ -328,6 +506,46 @@ class SkillsPersonaEngine:
             self.logger.error(f"NLP response generation failed: {e}")
             return await self._fallback_response(user_input)
     
+    async def _get_nlp_stream(self, user_input: str,
+                              intent: Optional[IntentPrediction] = None) -> AsyncIterator[str]:
+        """Get a streamed response using NLP router."""
+        try:
+            context = self._nlp_context(user_input, intent)
+            deltas, decision = await self.nlp_router.route_query_stream(user_input, context)
+            
+            self.logger.debug(f"NLP routing decision: {decision.reason}")
+            
+            return deltas
+            
+        except Exception as e:
+            self.logger.error(f"NLP response generation failed: {e}")
+            return self._single(await self._fallback_response(user_input))
+    
+    def _nlp_context(self, user_input: str, intent: Optional[IntentPrediction]) -> Dict[str, Any]:
+        """
+        Routing context for a query the skills did not answer.
+        
+        Out-of-domain and ambiguous transcripts are rejected by the intent
+        model with confidence 0, and a prediction below the local-confidence
+        threshold is not passed on as the local intent.
+        """
+        if intent is None:
+            intent = self.classify_intent(user_input)
+        confident = intent.skill is not None and intent.confidence >= self.local_confidence_threshold
+        
+        return {
+                'conversation_history': self.conversation.recent(10),  # For local processing
+                'conversation': self.conversation,  # Token-budgeted context for OpenAI
+                'persona_context': {
+                    'name': self.name,
+                    'personality_traits': self.personality_traits,
+                    'voice_style': self.voice_style
+                },
+                'persona_manager': self,  # For local fallback
+                'local_intent': intent.skill if confident else None,
+                'local_confidence': intent.confidence
+            }
+    
     async def _fallback_response(self, user_input: str) -> str:
         """Generate fallback response when other methods fail."""
         user_input_lower = user_input.lower()
@@ -360,23 +578,15 @@ class SkillsPersonaEngine:
     
     def _apply_persona_style(self, response: str) -> str:
         """Apply persona style to response."""
-        # Add personality based on traits
-        if self.personality_traits.get('warmth', 0) > 0.7:
-            # Add warm touches
-            if random.random() < 0.3:
-                response = f"I'm happy to help! {response}"
-        
-        if self.personality_traits.get('wit', 0) > 0.7:
-            # Occasionally add witty remarks
-            if random.random() < 0.2:
-                witty_additions = [
-                    " Hope that brightens your day!",
-                    " Pretty cool, right?",
-                    " Knowledge is power, as they say!"
-                ]
-                response += random.choice(witty_additions)
-        
-        if self.personality_traits.get('conciseness', 0) > 0.7:
+        prefix, suffix, concise = self._choose_persona_style()
+        
+        if prefix:
+            response = f"{prefix} {response}"
+        
+        if suffix:
+            response += " " + suffix
+        
+        if concise:
             # Keep responses brief
             sentences = response.split('. ')
             if len(sentences) > 3:
@@ -384,6 +594,55 @@ class SkillsPersonaEngine:
         
         return response
     
+    def _choose_persona_style(self) -> Tuple[Optional[str], Optional[str], bool]:
+        """
+        Decide how to style one response from the personality traits.
+        
+        Returns:
+            Tuple of (prefix or None, witty addition or None, whether to keep it brief)
+        """
+        prefix = suffix = None
+        
+        # Add warm touches
+        if self.personality_traits.get('warmth', 0) > 0.7 and random.random() < 0.3:
+            prefix = WARM_PREFIX
+        
+        # Occasionally add witty remarks
+        if self.personality_traits.get('wit', 0) > 0.7 and random.random() < 0.2:
+            suffix = random.choice(WITTY_ADDITIONS)
+        
+        concise = self.personality_traits.get('conciseness', 0) > 0.7
+        return prefix, suffix, concise
+    
+    async def _style_stream(self, deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Apply persona style to a streamed response without buffering it."""
+        prefix, suffix, concise = self._choose_persona_style()
+        
+        if prefix:
+            yield f"{prefix} "
+        
+        text = f"{prefix} " if prefix else ''
+        async for delta in deltas:
+            if concise:
+                # Stop after the third sentence, as for complete responses
+                sentences = (text + delta).split('. ')
+                if len(sentences) > 3:
+                    brief = '. '.join(sentences[:3]) + '.'
+                    if len(brief) > len(text):
+                        yield brief[len(text):]
+                    await deltas.aclose()
+                    return
+            text += delta
+            yield delta
+        
+        if suffix:
+            yield " " + suffix
+    
+    @staticmethod
+    async def _single(text: str) -> AsyncIterator[str]:
+        """Stream a complete response as one piece."""
+        yield text
+    
     # Built-in skill handlers
     
     async def _datetime_skill(self, user_input: str) -> str:
@@ -453,45 +712,84 @@ class SkillsPersonaEngine:
         hour = datetime.now().hour
         
         if hour < 12:
-            time_greeting = "Good morning"
+            time_greeting = TIME_GREETINGS[0]
         elif hour < 17:
-            time_greeting = "Good afternoon"
+            time_greeting = TIME_GREETINGS[1]
         else:
-            time_greeting = "Good evening"
+            time_greeting = TIME_GREETINGS[2]
         
-        greetings = [
-            f"{time_greeting}! How can I help you today?",
-            f"Hello! {random.choice(self.catchphrases)}",
-            f"{time_greeting}! What can I do for you?",
-            "Hello there! Ready to assist you."
-        ]
-        
-        return random.choice(greetings)
+        return random.choice(GREETING_TEMPLATES).format(
+            time_greeting=time_greeting,
+            catchphrase=random.choice(self.catchphrases)
+        )
     
     async def _farewell_skill(self, user_input: str) -> str:
         """Handle farewells."""
-        farewells = [
-            "Goodbye! Have a wonderful day!",
-            "See you later! Don't hesitate to call if you need anything.",
-            "Farewell! It was a pleasure helping you.",
-            "Take care! I'll be here whenever you need me."
-        ]
+        return random.choice(FAREWELL_RESPONSES)
+    
+    async def warm_up(self) -> None:
+        """Warm up network connections and load local models and tokenizers; run in the background once listening."""
+        warm_ups = [self.conversation.counter.warm_up()]
+        if self.nlp_router:
+            warm_ups.append(self.nlp_router.warm_up())
+        await asyncio.gather(*warm_ups)
+    
+    def get_fixed_phrases(self) -> List[str]:
+        """
+        Collect responses whose wording never changes.
+        
+        Used to pre-synthesize speech for greetings, farewells, error
+        messages and catchphrases.
         
-        return random.choice(farewells)
+        Returns:
+            Unique phrases in a stable order
+        """
+        phrases = []
+        
+        def collect(value) -> None:
+            # persona.yaml groups some messages by situation
+            if isinstance(value, str):
+                phrases.append(value)
+            elif isinstance(value, dict):
+                for item in value.values():
+                    collect(item)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    collect(item)
+        
+        collect(self.greeting_messages)
+        collect(self.error_messages)
+        collect(getattr(self.config.persona, 'farewell_messages', []))
+        collect(self.catchphrases)
+        collect(self.acknowledgement_messages)
+        collect(FAREWELL_RESPONSES)
+        collect(WARM_PREFIX)
+        collect(WITTY_ADDITIONS)
+        
+        for template in GREETING_TEMPLATES:
+            for time_greeting in TIME_GREETINGS:
+                for catchphrase in self.catchphrases:
+                    collect(template.format(time_greeting=time_greeting, catchphrase=catchphrase))
+        
+        return list(dict.fromkeys(phrases))
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get persona engine statistics."""
-        skill_stats = {}
-        for name, info in self.skills.items():
-            skill_stats[name] = info['executions']
+        skill_stats = self.skills.get_statistics()
         
         return {
             'is_initialized': self.is_initialized,
             'persona_name': self.name,
             'total_interactions': self.total_interactions,
             'average_response_time': self.average_response_time,
-            'conversation_length': len(self.conversation_history),
-            'skill_executions': skill_stats,
+            'conversation_length': len(self.conversation),
+            'conversation_context': self.conversation.get_statistics(),
+            'skill_executions': {name: stats['executions'] for name, stats in skill_stats.items()},
+            'skills': skill_stats,
+            'skill_plugin_errors': dict(self.skills.plugin_errors),
+            'skill_index': self.skill_index.get_statistics(),
+            'intent_classifier': self.intent_classifier.get_statistics(),
+            'intent_dispatches': self.intent_dispatches,
             'nlp_router_available': self.nlp_router is not None,
             'session_duration': str(datetime.now() - self.session_start_time) if self.session_start_time else None
         }
@@ -502,12 +800,14 @@ class SkillsPersonaEngine:
             self.is_initialized = False
             
             # Clear conversation history
-            self.conversation_history.clear()
+            self.conversation.clear()
             
             # Shutdown NLP router if available
             if self.nlp_router and hasattr(self.nlp_router, 'shutdown'):
                 await self.nlp_router.shutdown()
             
+            self.skills.shutdown()
+            
             self.logger.info("Persona engine shutdown complete")
             
         except Exception as e:
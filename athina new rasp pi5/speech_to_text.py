@@ -7,28 +7,26 @@ whisper.cpp and OpenAI Whisper for offline transcription.
 
 import asyncio
 import logging
+import os
 import time
 import tempfile
 import wave
-import io
 from typing import Optional, Dict, Any, Union
 from pathlib import Path
 import numpy as np
 
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+from .errors import STTError, InitializationError, ModelError
+from .logging_cfg import PerformanceTimer, STARTUP_PROFILER
+from .lazy_imports import is_available, load
+from .stt_models import ModelManifest, parse_model_name, select_model, tier_for, download_model
+from .audio_frame import AudioFrame
 
-try:
-    from whispercpp import Whisper
-    WHISPERCPP_AVAILABLE = True
-except ImportError:
-    WHISPERCPP_AVAILABLE = False
+# Whisper models expect 16 kHz mono input
+WHISPER_SAMPLE_RATE = 16000
 
-from .errors import STTError, InitializationError, ModelError
-from .logging_cfg import PerformanceTimer
+# Backends are imported lazily in initialize(); openai-whisper pulls in torch
+WHISPER_AVAILABLE = is_available('whisper')
+WHISPERCPP_AVAILABLE = is_available('whispercpp')
 
 
 class SpeechToTextEngine:
@@ -67,6 +65,18 @@ class SpeechToTextEngine:
         self.logprob_threshold = config.stt.logprob_threshold
         self.no_speech_threshold = config.stt.no_speech_threshold
         self.mock_mode = config.stt.mock_mode
+        self.requested_backend = config.stt.backend
+        self.n_threads = config.stt.n_threads or config.system.cpu_threads or os.cpu_count() or 1
+        self.accuracy_tier = config.stt.accuracy_tier
+        self.model_sha256 = config.stt.model_sha256
+        self.verify_model_checksum = config.stt.verify_model_checksum
+        
+        # Downloaded ggml models and their recorded checksums
+        self.models_dir = Path(config.system.model_cache_dir) / "whisper"
+        self.manifest = ModelManifest(self.models_dir)
+        
+        # Raw PCM input is assumed to be in the capture format
+        self.sample_rate = config.audio.sample_rate
         
         # Model and backend
         self.model = None
@@ -78,6 +88,7 @@ class SpeechToTextEngine:
         self.failed_transcriptions = 0
         self.average_transcription_time = 0.0
         self.total_audio_seconds = 0.0
+        self.total_transcription_time = 0.0
         
         self.logger.info("STT engine initialized")
     
@@ -90,8 +101,18 @@ class SpeechToTextEngine:
                 self.is_initialized = True
                 return
             
+            if self.requested_backend == 'whispercpp':
+                if not WHISPERCPP_AVAILABLE:
+                    raise InitializationError("whisper.cpp backend requested but whispercpp is not installed")
+                await self._initialize_whispercpp()
+                
+            elif self.requested_backend == 'whisper':
+                if not WHISPER_AVAILABLE:
+                    raise InitializationError("Whisper backend requested but openai-whisper is not installed")
+                await self._initialize_whisper()
+                
             # Try whisper.cpp first for better performance
-            if WHISPERCPP_AVAILABLE:
+            elif WHISPERCPP_AVAILABLE:
                 await self._initialize_whispercpp()
                 
             elif WHISPER_AVAILABLE:
@@ -116,24 +137,35 @@ class SpeechToTextEngine:
             if self.model_path:
                 model_file = Path(self.model_path)
             else:
+                self._select_resident_model()
                 model_file = self._get_model_path()
             
             if not model_file.exists():
                 await self._download_model(model_file)
+            else:
+                self._verify_model(model_file)
             
-            # Load model
-            self.model = Whisper.from_pretrained(
-                model_name=self.model_name,
-                basedir=str(model_file.parent)
-            )
+            Whisper = load('whispercpp', 'stt').Whisper
+            
+            # Load the resolved file: by name, whispercpp only knows its built-in
+            # model list, which has neither the quantized models nor model_path
+            with STARTUP_PROFILER.measure('stt', 'load model'):
+                self.model = Whisper.from_pretrained(str(model_file))
+            
+            # whisper.cpp defaults to 4 threads regardless of the hardware
+            params = getattr(self.model, 'params', None)
+            if params is not None and hasattr(params, 'with_num_threads'):
+                params.with_num_threads(self.n_threads)
             
             self.backend = 'whispercpp'
-            self.logger.info(f"Loaded whisper.cpp model: {self.model_name}")
+            self.logger.info(f"Loaded whisper.cpp model: {self.model_name} ({self.n_threads} threads)")
             
         except Exception as e:
-            self.logger.warning(f"whisper.cpp initialization failed: {e}")
-            if WHISPER_AVAILABLE:
-                self.logger.info("Falling back to OpenAI Whisper")
+            self.logger.error(f"whisper.cpp initialization failed: {e}")
+            if WHISPER_AVAILABLE and self.requested_backend != 'whispercpp':
+                self.logger.error(
+                    f"Falling back to OpenAI Whisper: model {self.model_name} runs unquantized and slower"
+                )
                 await self._initialize_whisper()
             else:
                 raise
@@ -141,8 +173,18 @@ class SpeechToTextEngine:
     async def _initialize_whisper(self) -> None:
         """Initialize OpenAI Whisper backend."""
         try:
+            whisper = load('whisper', 'stt')
+            
+            # Torch is already imported by whisper at this point
+            load('torch', 'stt').set_num_threads(self.n_threads)
+            
+            # openai-whisper has no ggml quantized weights; use the base model
+            info = parse_model_name(self.model_name)
+            model_name = info.base_name if info else self.model_name
+            
             # Load model
-            self.model = whisper.load_model(self.model_name)
+            with STARTUP_PROFILER.measure('stt', 'load model'):
+                self.model = whisper.load_model(model_name)
             self.backend = 'whisper'
             
             # Move to GPU if available and fp16 is enabled
@@ -153,64 +195,67 @@ class SpeechToTextEngine:
                 except:
                     self.logger.info("GPU not available, using CPU")
             
-            self.logger.info(f"Loaded Whisper model: {self.model_name}")
+            self.logger.info(f"Loaded Whisper model: {model_name}")
             
         except Exception as e:
             raise ModelError(f"Failed to load Whisper model: {e}")
     
+    def _select_resident_model(self) -> None:
+        """Switch to the fastest downloaded model meeting the configured accuracy tier."""
+        if not self.accuracy_tier:
+            return
+        
+        english_only_ok = self.language == 'en'
+        choice = select_model(self.manifest.resident_models(), tier_for(self.accuracy_tier), english_only_ok)
+        if choice is None:
+            self.logger.info(
+                f"No downloaded model meets accuracy tier '{self.accuracy_tier}', using {self.model_name}"
+            )
+            return
+        
+        if choice.name != self.model_name:
+            self.logger.info(f"Selected resident model {choice.name} for accuracy tier '{self.accuracy_tier}'")
+            self.model_name = choice.name
+    
     def _get_model_path(self) -> Path:
         """Get path for model storage."""
-        models_dir = Path(self.config.system.model_cache_dir) / "whisper"
-        models_dir.mkdir(parents=True, exist_ok=True)
+        self.models_dir.mkdir(parents=True, exist_ok=True)
         
         model_filename = f"ggml-{self.model_name}.bin"
-        return models_dir / model_filename
+        return self.models_dir / model_filename
+    
+    def _verify_model(self, model_file: Path) -> None:
+        """Check a resident model file against the manifest."""
+        info = parse_model_name(self.model_name)
+        if info is None:
+            return
+        
+        if not self.manifest.verify(info, model_file, full_checksum=self.verify_model_checksum):
+            raise ModelError(
+                f"Model file does not match manifest (corrupt or partial download): {model_file}",
+                model_path=str(model_file), model_type="stt"
+            )
     
     async def _download_model(self, model_path: Path) -> None:
         """Download Whisper model if not present."""
-        self.logger.info(f"Downloading Whisper model: {self.model_name}")
-        
-        # Model download URLs (whisper.cpp format)
-        model_urls = {
-            "tiny": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-tiny.bin",
-            "tiny.en": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-tiny.en.bin",
-            "base": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-base.bin",
-            "base.en": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-base.en.bin",
-            "small": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-small.bin",
-            "small.en": "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-small.en.bin"
-        }
-        
-        url = model_urls.get(self.model_name)
-        if not url:
+        info = parse_model_name(self.model_name)
+        if info is None:
             raise ModelError(f"Unknown model: {self.model_name}")
         
-        try:
-            import requests
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            with open(model_path, 'wb') as f:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        self.logger.debug(f"Download progress: {progress:.1f}%")
-            
-            self.logger.info(f"Model downloaded: {model_path}")
-            
-        except Exception as e:
-            raise ModelError(f"Failed to download model: {e}")
+        self.logger.info(f"Downloading Whisper model: {self.model_name} (~{info.approx_size_mb:.0f} MB)")
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, download_model, info, model_path, self.manifest, self.model_sha256
+        )
     
-    async def transcribe(self, audio_data: Union[bytes, np.ndarray]) -> Optional[str]:
+    async def transcribe(self, audio: Union[AudioFrame, bytes, np.ndarray]) -> Optional[str]:
         """
         Transcribe audio to text.
         
         Args:
-            audio_data: Audio data as WAV bytes or numpy array
+            audio: AudioFrame from the pipeline; WAV bytes, raw PCM bytes at the
+                configured rate and 16 kHz arrays are also accepted
             
         Returns:
             Transcribed text or None
@@ -223,11 +268,14 @@ class SpeechToTextEngine:
             return "This is a mock transcription for testing"
         
         start_time = time.time()
+        frame = self._as_frame(audio)
+        audio_seconds = frame.duration
+        audio_file = None
         
         try:
             with PerformanceTimer("stt_transcription", self.logger):
                 # Convert audio to appropriate format
-                audio_file = await self._prepare_audio(audio_data)
+                audio_file = await self._prepare_audio(frame)
                 
                 # Transcribe based on backend
                 if self.backend == 'whispercpp':
@@ -237,37 +285,50 @@ class SpeechToTextEngine:
                 
                 # Update statistics
                 transcription_time = time.time() - start_time
-                self._update_statistics(True, transcription_time, audio_file)
-                
-                # Clean up
-                if isinstance(audio_file, Path) and audio_file.exists():
-                    audio_file.unlink()
+                self._update_statistics(True, transcription_time, audio_seconds)
                 
                 return result
                 
         except Exception as e:
             self.logger.error(f"Transcription failed: {e}")
-            self._update_statistics(False, time.time() - start_time, None)
+            self._update_statistics(False, time.time() - start_time, audio_seconds)
             return None
+        
+        finally:
+            # Clean up
+            if isinstance(audio_file, Path) and audio_file.exists():
+                audio_file.unlink()
     
-    async def _prepare_audio(self, audio_data: Union[bytes, np.ndarray]) -> Union[Path, np.ndarray]:
-        """Prepare audio for transcription."""
-        if isinstance(audio_data, bytes):
-            # Save to temporary file for whisper.cpp
-            if self.backend == 'whispercpp':
-                temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                temp_file.write(audio_data)
-                temp_file.close()
-                return Path(temp_file.name)
-            else:
-                # Load audio for OpenAI Whisper
-                buffer = io.BytesIO(audio_data)
-                with wave.open(buffer, 'rb') as wav_file:
-                    frames = wav_file.readframes(wav_file.getnframes())
-                    audio_array = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-                return audio_array
-        else:
-            return audio_data
+    def _as_frame(self, audio: Union[AudioFrame, bytes, np.ndarray]) -> AudioFrame:
+        """Wrap WAV bytes, raw PCM bytes or a 16 kHz array as an AudioFrame."""
+        if isinstance(audio, AudioFrame):
+            return audio
+        
+        if isinstance(audio, (bytes, bytearray)):
+            if audio[:4] == b'RIFF':
+                try:
+                    return AudioFrame.from_wav_bytes(bytes(audio))
+                except wave.Error:
+                    pass
+            return AudioFrame.from_bytes(bytes(audio), self.sample_rate)
+        
+        if audio.dtype == np.int16:
+            return AudioFrame(audio.reshape(-1), WHISPER_SAMPLE_RATE)
+        return AudioFrame.from_float(audio, WHISPER_SAMPLE_RATE)
+    
+    async def _prepare_audio(self, frame: AudioFrame) -> Union[Path, np.ndarray]:
+        """Convert a frame to the format the active backend consumes."""
+        frame = frame.to_mono().resampled(WHISPER_SAMPLE_RATE)
+        
+        if self.backend == 'whispercpp':
+            # whisper.cpp reads audio from a WAV file
+            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+            temp_file.close()
+            frame.write_wav(temp_file.name)
+            return Path(temp_file.name)
+        
+        # OpenAI Whisper takes float32 samples
+        return frame.to_float32()
     
     async def _transcribe_whispercpp(self, audio_file: Path) -> Optional[str]:
         """Transcribe using whisper.cpp."""
@@ -336,7 +397,7 @@ class SpeechToTextEngine:
             return None
     
     def _update_statistics(self, success: bool, transcription_time: float, 
-                          audio_file: Optional[Path]) -> None:
+                          audio_seconds: float) -> None:
         """Update transcription statistics."""
         self.total_transcriptions += 1
         
@@ -349,16 +410,10 @@ class SpeechToTextEngine:
             self.total_transcriptions
         )
         
-        # Estimate audio duration
-        if audio_file and audio_file.exists():
-            try:
-                with wave.open(str(audio_file), 'rb') as wav:
-                    frames = wav.getnframes()
-                    rate = wav.getframerate()
-                    duration = frames / float(rate)
-                    self.total_audio_seconds += duration
-            except:
-                pass
+        # Real-time factor is only meaningful over transcriptions that completed
+        if success:
+            self.total_audio_seconds += audio_seconds
+            self.total_transcription_time += transcription_time
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get STT engine statistics."""
@@ -367,19 +422,23 @@ class SpeechToTextEngine:
             success_rate = ((self.total_transcriptions - self.failed_transcriptions) / 
                           self.total_transcriptions) * 100
         
+        info = parse_model_name(self.model_name)
+        
         return {
             'is_initialized': self.is_initialized,
             'backend': self.backend,
             'model_name': self.model_name,
+            'quantization': info.quantization if info else None,
+            'accuracy_tier': self.accuracy_tier,
             'language': self.language,
             'total_transcriptions': self.total_transcriptions,
             'failed_transcriptions': self.failed_transcriptions,
             'success_rate': success_rate,
             'average_time_seconds': self.average_transcription_time,
             'total_audio_hours': self.total_audio_seconds / 3600,
-            'real_time_factor': (self.average_transcription_time / 
-                               (self.total_audio_seconds / self.total_transcriptions) 
-                               if self.total_transcriptions > 0 else 0)
+            'n_threads': self.n_threads,
+            'real_time_factor': (self.total_transcription_time / self.total_audio_seconds
+                               if self.total_audio_seconds > 0 else 0)
         }
     
     async def shutdown(self) -> None:
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Athina Speech-to-Text Benchmark
+
+Runs a labelled corpus through SpeechToTextEngine under a matrix of
+backend, model, beam size and thread settings, and reports word error
+rate, real-time factor, latency percentiles and peak memory. Each
+configuration runs in a fresh subprocess, so its peak memory does not
+include models loaded by earlier configurations.
+
+Usage:
+    python -m athina.stt_benchmark --corpus corpus/manifest.jsonl \\
+        --backends whispercpp whisper --models tiny.en base.en \\
+        --beam-sizes 1 5 --threads 2 4 --output results.json
+
+    # Fail (exit code 1) if a run regressed against a saved baseline
+    python -m athina.stt_benchmark --corpus corpus/manifest.jsonl \\
+        --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import copy
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import re
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from .config import Config
+from .errors import ConfigurationError
+from .speech_to_text import SpeechToTextEngine
+from .audio_frame import AudioFrame
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorpusSample:
+    """A labelled audio sample."""
+    audio_path: Path
+    reference: str
+    audio: Optional[AudioFrame] = None
+    duration: float = 0.0
+
+
+@dataclass
+class BenchmarkResult:
+    """Metrics for one benchmark configuration."""
+    backend: str
+    model_name: str
+    beam_size: int
+    n_threads: int
+    samples: int = 0
+    failures: int = 0
+    wer: float = 0.0
+    real_time_factor: float = 0.0
+    latency_p50: float = 0.0
+    latency_p95: float = 0.0
+    model_load_seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    error: Optional[str] = None
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match runs against a baseline."""
+        return f"{self.backend}/{self.model_name}/beam{self.beam_size}/t{self.n_threads}"
+
+
+def normalize_text(text: str) -> List[str]:
+    """Lowercase, strip punctuation and split into words."""
+    text = re.sub(r"[^\w\s']", " ", (text or "").lower())
+    return text.split()
+
+
+def word_error_rate(references: List[str], hypotheses: List[str]) -> float:
+    """
+    Compute corpus-level word error rate.
+
+    Args:
+        references: Reference transcripts
+        hypotheses: Recognized transcripts
+
+    Returns:
+        Total word edits divided by total reference words
+    """
+    edits = 0
+    words = 0
+
+    for reference, hypothesis in zip(references, hypotheses):
+        ref = normalize_text(reference)
+        hyp = normalize_text(hypothesis)
+        words += len(ref)
+
+        # Levenshtein distance over words, one row at a time
+        previous = list(range(len(hyp) + 1))
+        for i, ref_word in enumerate(ref, 1):
+            current = [i] + [0] * len(hyp)
+            for j, hyp_word in enumerate(hyp, 1):
+                current[j] = min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word)
+                )
+            previous = current
+        edits += previous[-1]
+
+    return edits / max(words, 1)
+
+
+def load_corpus(manifest: Path, sample_rate: int = 16000) -> List[CorpusSample]:
+    """
+    Load a labelled corpus.
+
+    The manifest is either JSONL with ``audio`` and ``text`` fields, or a
+    CSV with ``audio,text`` columns. Audio paths are relative to the
+    manifest. Audio must be 16-bit WAV; it is downmixed to mono and
+    resampled to the capture rate so every backend sees identical input.
+
+    Args:
+        manifest: Path to the corpus manifest
+        sample_rate: Target sample rate
+
+    Returns:
+        List of loaded samples
+    """
+    entries = []
+    with open(manifest, 'r', encoding='utf-8') as f:
+        if manifest.suffix.lower() == '.csv':
+            entries = [(row['audio'], row['text']) for row in csv.DictReader(f)]
+        else:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    entries.append((item['audio'], item['text']))
+
+    samples = []
+    for audio, text in entries:
+        path = (manifest.parent / audio).resolve()
+        with wave.open(str(path), 'rb') as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ConfigurationError(f"Only 16-bit WAV files are supported: {path}")
+            recording = AudioFrame.from_bytes(
+                wav_file.readframes(wav_file.getnframes()),
+                wav_file.getframerate(),
+                wav_file.getnchannels()
+            )
+
+        recording = recording.to_mono().resampled(sample_rate)
+        samples.append(CorpusSample(
+            audio_path=path,
+            reference=text,
+            audio=recording,
+            duration=recording.duration
+        ))
+
+    return samples
+
+
+class PeakRSSSampler:
+    """
+    Sample the process resident set size in the background and keep the peak.
+
+    Without psutil the peak is the process-wide ``ru_maxrss`` high-water
+    mark, which covers everything the process ever held; it only measures
+    one configuration when that configuration has the process to itself.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize PeakRSSSampler.
+
+        Args:
+            interval: Sampling interval in seconds
+        """
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+
+    def __enter__(self):
+        """Start sampling."""
+        if self._process is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        elif RESOURCE_AVAILABLE:
+            # Without psutil only the process-wide high-water mark is available (KB on Linux)
+            self.peak_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return False
+
+    def _run(self) -> None:
+        """Sampling loop."""
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile of a list, 0.0 when empty."""
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+async def run_configuration(base_config: Config, corpus: List[CorpusSample], backend: str,
+                            model_name: str, beam_size: int, n_threads: int,
+                            warmup: bool = True) -> BenchmarkResult:
+    """
+    Benchmark a single backend/model/beam/thread combination.
+
+    Args:
+        base_config: Configuration to copy STT settings from
+        corpus: Loaded corpus samples
+        backend: STT backend name
+        model_name: Whisper model name
+        beam_size: Beam size
+        n_threads: Inference thread count
+        warmup: Run one untimed transcription first
+
+    Returns:
+        BenchmarkResult for this configuration
+    """
+    config = copy.deepcopy(base_config)
+    config.stt.backend = backend
+    config.stt.model_name = model_name
+    config.stt.beam_size = beam_size
+    config.stt.n_threads = n_threads
+    config.stt.mock_mode = False
+
+    result = BenchmarkResult(backend=backend, model_name=model_name,
+                             beam_size=beam_size, n_threads=n_threads)
+    engine = SpeechToTextEngine(config)
+
+    with PeakRSSSampler() as sampler:
+        try:
+            load_start = time.perf_counter()
+            await engine.initialize()
+            result.model_load_seconds = time.perf_counter() - load_start
+
+            if engine.backend != backend:
+                raise ConfigurationError(f"Requested {backend} backend but got {engine.backend}")
+
+            if warmup and corpus:
+                await engine.transcribe(corpus[0].audio)
+
+            hypotheses = []
+            for sample in corpus:
+                start = time.perf_counter()
+                text = await engine.transcribe(sample.audio)
+                result.latencies.append(time.perf_counter() - start)
+
+                if text is None:
+                    result.failures += 1
+                hypotheses.append(text or "")
+
+            result.samples = len(corpus)
+            result.wer = word_error_rate([s.reference for s in corpus], hypotheses)
+            result.real_time_factor = sum(result.latencies) / max(sum(s.duration for s in corpus), 1e-9)
+            result.latency_p50 = percentile(result.latencies, 50)
+            result.latency_p95 = percentile(result.latencies, 95)
+
+        except Exception as e:
+            logger.error(f"Benchmark {result.key} failed: {e}")
+            result.error = str(e)
+
+        finally:
+            await engine.shutdown()
+
+    result.peak_rss_mb = sampler.peak_bytes / (1024 * 1024)
+    return result
+
+
+def _run_configuration_sync(*args, **kwargs) -> BenchmarkResult:
+    """Subprocess entry point for run_configuration."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return asyncio.run(run_configuration(*args, **kwargs))
+
+
+async def run_isolated(base_config: Config, corpus: List[CorpusSample], backend: str,
+                       model_name: str, beam_size: int, n_threads: int,
+                       warmup: bool = True) -> BenchmarkResult:
+    """
+    Run one configuration with run_configuration in a freshly spawned process.
+
+    Model memory from earlier configurations is then neither counted in
+    this configuration's peak RSS nor competing with it.
+
+    Returns:
+        BenchmarkResult for this configuration
+    """
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context('spawn')  # A forked child would share the parent's pages
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return await loop.run_in_executor(
+                executor, _run_configuration_sync,
+                base_config, corpus, backend, model_name, beam_size, n_threads, warmup
+            )
+        except Exception as e:
+            result = BenchmarkResult(backend=backend, model_name=model_name,
+                                     beam_size=beam_size, n_threads=n_threads)
+            logger.error(f"Benchmark {result.key} subprocess failed: {e}")
+            result.error = str(e)
+            return result
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any],
+                        wer_tolerance: float = 0.01,
+                        latency_tolerance: float = 0.10) -> List[str]:
+    """
+    Find regressions against a previous benchmark report.
+
+    Args:
+        results: Current results
+        baseline: Previously saved JSON report
+        wer_tolerance: Allowed absolute WER increase
+        latency_tolerance: Allowed relative increase in RTF and p95 latency
+
+    Returns:
+        Human-readable regression descriptions
+    """
+    previous = {run['key']: run for run in baseline.get('results', [])}
+    regressions = []
+
+    for result in results:
+        before = previous.get(result.key)
+        if before is None or result.error or before.get('error'):
+            continue
+
+        if result.wer > before['wer'] + wer_tolerance:
+            regressions.append(f"{result.key}: WER {before['wer']:.3f} -> {result.wer:.3f}")
+
+        for metric in ('real_time_factor', 'latency_p95'):
+            old, new = before[metric], getattr(result, metric)
+            if old > 0 and new > old * (1 + latency_tolerance):
+                regressions.append(f"{result.key}: {metric} {old:.3f} -> {new:.3f}")
+
+    return regressions
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """Format results as a plain-text table."""
+    header = (f"{'backend':<11} {'model':<14} {'beam':>4} {'thr':>3} {'WER':>7} "
+              f"{'RTF':>6} {'p50 (s)':>8} {'p95 (s)':>8} {'load (s)':>8} {'RSS (MB)':>9}")
+    lines = [header, "-" * len(header)]
+
+    for r in results:
+        if r.error:
+            lines.append(f"{r.backend:<11} {r.model_name:<14} {r.beam_size:>4} {r.n_threads:>3} "
+                         f"ERROR: {r.error}")
+            continue
+        lines.append(
+            f"{r.backend:<11} {r.model_name:<14} {r.beam_size:>4} {r.n_threads:>3} "
+            f"{r.wer:>7.3f} {r.real_time_factor:>6.3f} {r.latency_p50:>8.3f} "
+            f"{r.latency_p95:>8.3f} {r.model_load_seconds:>8.2f} {r.peak_rss_mb:>9.1f}"
+        )
+
+    return "\n".join(lines)
+
+
+def build_report(results: List[BenchmarkResult], corpus: List[CorpusSample],
+                 isolated: bool = True) -> Dict[str, Any]:
+    """Build the JSON report; ``isolated`` records whether peak RSS is per configuration."""
+    runs = []
+    for result in results:
+        run = asdict(result)
+        run.pop('latencies')
+        run['key'] = result.key
+        runs.append(run)
+
+    return {
+        'timestamp': time.time(),
+        'isolated': isolated,
+        'corpus_samples': len(corpus),
+        'corpus_seconds': sum(s.duration for s in corpus),
+        'results': runs
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> int:
+    """Run the benchmark matrix and report results."""
+    config = Config(args.config)
+    corpus = load_corpus(Path(args.corpus), config.audio.sample_rate)
+    if args.limit:
+        corpus = corpus[:args.limit]
+
+    logger.info(f"Loaded {len(corpus)} samples ({sum(s.duration for s in corpus):.1f}s of audio)")
+
+    if args.in_process:
+        logger.warning("Running in process: peak RSS includes every earlier configuration")
+    run = run_configuration if args.in_process else run_isolated
+
+    results = []
+    matrix = itertools.product(args.backends, args.models, args.beam_sizes, args.threads)
+    for backend, model_name, beam_size, n_threads in matrix:
+        logger.info(f"Running {backend}/{model_name} beam={beam_size} threads={n_threads}")
+        results.append(await run(
+            config, corpus, backend, model_name, beam_size, n_threads,
+            warmup=not args.no_warmup
+        ))
+
+    print(format_table(results))
+
+    report = build_report(results, corpus, isolated=not args.in_process)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(
+            results, baseline, args.wer_tolerance, args.latency_tolerance
+        )
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+
+    return 0
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark Athina speech-to-text backends")
+    parser.add_argument("--corpus", required=True,
+                        help="Corpus manifest (JSONL with audio/text fields, or CSV)")
+    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument("--backends", nargs="+", default=["whispercpp"],
+                        choices=["whispercpp", "whisper"])
+    parser.add_argument("--models", nargs="+", default=["tiny.en"])
+    parser.add_argument("--beam-sizes", nargs="+", type=int, default=[5])
+    parser.add_argument("--threads", nargs="+", type=int, default=[4])
+    parser.add_argument("--limit", type=int, help="Only use the first N samples")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="Do not run an untimed warm-up transcription")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every configuration in this process (peak RSS is then cumulative)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--wer-tolerance", type=float, default=0.01,
+                        help="Allowed absolute WER increase before flagging a regression")
+    parser.add_argument("--latency-tolerance", type=float, default=0.10,
+                        help="Allowed relative RTF/p95 increase before flagging a regression")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
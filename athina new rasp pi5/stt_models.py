@@ -0,0 +1,292 @@
+"""
+Athina Whisper Model Catalog
+
+Describes the whisper.cpp ggml models Athina can use, including quantized
+variants, keeps a local manifest of downloaded model files (size,
+quantization and checksum), and selects the fastest resident model that
+meets a configured accuracy tier.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from .errors import ModelError
+
+
+WHISPERCPP_BASE_URL = "https://huggingface.co/ggerganov/whisper.cpp/resolve/main"
+
+# Model size -> (approximate fp16 file size in MB, accuracy tier)
+MODEL_SIZES = {
+    'tiny': (75, 1),
+    'base': (142, 2),
+    'small': (466, 3),
+    'medium': (1500, 4),
+}
+
+# Quantization -> (file size relative to fp16, approximate speedup on ARM)
+QUANTIZATIONS = {
+    'f16': (1.0, 1.0),
+    'q8_0': (0.55, 1.5),
+    'q5_1': (0.40, 1.9),
+    'q5_0': (0.38, 2.0),
+}
+
+MODEL_NAME_PATTERN = re.compile(
+    r"^(?P<size>tiny|base|small|medium)(?P<english>\.en)?(?:-(?P<quant>q5_0|q5_1|q8_0))?$"
+)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+@dataclass
+class WhisperModelInfo:
+    """Static description of a whisper.cpp model variant."""
+    name: str
+    size: str
+    english_only: bool
+    quantization: str
+
+    @property
+    def base_name(self) -> str:
+        """Model name without the quantization suffix (as used by openai-whisper)."""
+        return f"{self.size}.en" if self.english_only else self.size
+
+    @property
+    def filename(self) -> str:
+        """ggml file name."""
+        return f"ggml-{self.name}.bin"
+
+    @property
+    def url(self) -> str:
+        """Download URL."""
+        return f"{WHISPERCPP_BASE_URL}/{self.filename}"
+
+    @property
+    def accuracy_tier(self) -> int:
+        """Accuracy tier; quantized variants share the tier of their base model."""
+        return MODEL_SIZES[self.size][1]
+
+    @property
+    def approx_size_mb(self) -> float:
+        """Approximate file size in MB."""
+        return MODEL_SIZES[self.size][0] * QUANTIZATIONS[self.quantization][0]
+
+    @property
+    def relative_cost(self) -> float:
+        """Estimated inference cost; lower is faster."""
+        return MODEL_SIZES[self.size][0] / QUANTIZATIONS[self.quantization][1]
+
+
+def parse_model_name(name: str) -> Optional[WhisperModelInfo]:
+    """
+    Parse a whisper.cpp model name such as ``base.en-q5_1``.
+
+    Args:
+        name: Model name
+
+    Returns:
+        WhisperModelInfo, or None if the name is not recognised
+    """
+    match = MODEL_NAME_PATTERN.match(name or "")
+    if not match:
+        return None
+
+    return WhisperModelInfo(
+        name=name,
+        size=match.group('size'),
+        english_only=bool(match.group('english')),
+        quantization=match.group('quant') or 'f16'
+    )
+
+
+def tier_for(name: str) -> Optional[int]:
+    """Accuracy tier for a model size name (``tiny``, ``base``, ...)."""
+    entry = MODEL_SIZES.get(name)
+    return entry[1] if entry else None
+
+
+class ModelManifest:
+    """
+    Local record of downloaded model files.
+
+    Stored as ``manifest.json`` next to the models so checksums are
+    computed once, at download time, rather than on every start.
+    """
+
+    def __init__(self, models_dir: Path):
+        """
+        Initialize ModelManifest.
+
+        Args:
+            models_dir: Directory holding the ggml model files
+        """
+        self.logger = logging.getLogger(__name__)
+        self.models_dir = Path(models_dir)
+        self.path = self.models_dir / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Load the manifest from disk."""
+        if not self.path.exists():
+            return
+
+        try:
+            self.entries = json.loads(self.path.read_text()).get('models', {})
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable model manifest {self.path}: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({'models': self.entries}, indent=2, sort_keys=True))
+
+    def record(self, info: WhisperModelInfo, model_file: Path, sha256: str) -> None:
+        """
+        Record a downloaded model file.
+
+        Args:
+            info: Model description
+            model_file: Path to the downloaded file
+            sha256: Hex SHA-256 of the file
+        """
+        self.entries[info.name] = {
+            'filename': model_file.name,
+            'size_bytes': model_file.stat().st_size,
+            'quantization': info.quantization,
+            'accuracy_tier': info.accuracy_tier,
+            'sha256': sha256,
+            'downloaded_at': time.time()
+        }
+        self.save()
+
+    def verify(self, info: WhisperModelInfo, model_file: Path, full_checksum: bool = False) -> bool:
+        """
+        Check a model file against its manifest entry.
+
+        Args:
+            info: Model description
+            model_file: Path to the model file
+            full_checksum: Re-hash the file instead of only comparing its size
+
+        Returns:
+            True if the file matches (or has no manifest entry to compare with)
+        """
+        entry = self.entries.get(info.name)
+        if entry is None:
+            return True
+
+        if model_file.stat().st_size != entry['size_bytes']:
+            return False
+
+        if full_checksum:
+            return sha256_file(model_file) == entry['sha256']
+
+        return True
+
+    def resident_models(self) -> List[WhisperModelInfo]:
+        """Models whose files are present in the models directory."""
+        resident = []
+        for model_file in self.models_dir.glob("ggml-*.bin"):
+            info = parse_model_name(model_file.stem[len("ggml-"):])
+            if info is not None:
+                resident.append(info)
+        return resident
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Manifest entries keyed by model name."""
+        return dict(self.entries)
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def select_model(candidates: List[WhisperModelInfo], min_tier: int,
+                 english_only_ok: bool = True) -> Optional[WhisperModelInfo]:
+    """
+    Pick the fastest model that meets an accuracy tier.
+
+    Args:
+        candidates: Available models
+        min_tier: Minimum accuracy tier
+        english_only_ok: Whether English-only models may be chosen
+
+    Returns:
+        The cheapest qualifying model, or None
+    """
+    qualifying = [
+        info for info in candidates
+        if info.accuracy_tier >= min_tier and (english_only_ok or not info.english_only)
+    ]
+    if not qualifying:
+        return None
+
+    # Prefer English-only models at equal cost; they are more accurate for English
+    return min(qualifying, key=lambda info: (info.relative_cost, not info.english_only))
+
+
+def download_model(info: WhisperModelInfo, model_file: Path, manifest: ModelManifest,
+                   expected_sha256: Optional[str] = None) -> None:
+    """
+    Download a model, hashing it on the fly and recording it in the manifest.
+
+    Args:
+        info: Model description
+        model_file: Destination path
+        manifest: Manifest to record the download in
+        expected_sha256: Optional checksum the download must match
+
+    Raises:
+        ModelError: If the download fails or the checksum does not match
+    """
+    logger = logging.getLogger(__name__)
+    partial_file = model_file.with_suffix(model_file.suffix + ".part")
+
+    try:
+        import requests
+        response = requests.get(info.url, stream=True, timeout=30)
+        response.raise_for_status()
+
+        digest = hashlib.sha256()
+        total_size = int(response.headers.get('content-length', 0))
+        downloaded = 0
+
+        with open(partial_file, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+                digest.update(chunk)
+                downloaded += len(chunk)
+                if total_size > 0:
+                    logger.debug(f"Download progress: {downloaded / total_size * 100:.1f}%")
+
+        sha256 = digest.hexdigest()
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            raise ModelError(
+                f"Checksum mismatch for {info.filename}: expected {expected_sha256}, got {sha256}",
+                model_path=str(model_file), model_type="stt"
+            )
+
+        partial_file.replace(model_file)
+        manifest.record(info, model_file, sha256)
+        logger.info(f"Model downloaded: {model_file} ({downloaded / 1e6:.1f} MB, sha256 {sha256[:12]})")
+
+    except ModelError:
+        raise
+    except Exception as e:
+        raise ModelError(f"Failed to download model: {e}", model_path=str(model_file), model_type="stt")
+    finally:
+        if partial_file.exists():
+            partial_file.unlink()
@@ -17,6 +17,7 @@ from wake_word import WakeWordDetector
 from speech_to_text import SpeechToTextEngine
 from text_to_speech import TextToSpeechEngine
 from skills_persona import SkillsPersonaEngine
+from skill_index import SkillIndex
 from nlp_router import NLPRouter
 
 # Setup logging
@@ -146,6 +147,25 @@ async def test_persona(config):
         return False
 
 
+async def test_skill_index():
+    """Test skill matching, including patterns with their own named groups."""
+    logger.info("Testing skill index...")
+    try:
+        index = SkillIndex()
+        index.add("weather", [r"weather in (?P<city>\w+)"])
+        index.add("datetime", [r"\bwhat time\b"])
+        
+        matches = index.match("weather in paris")
+        assert [m.skill for m in matches] == ["weather"], matches
+        assert [m.skill for m in index.match("what time is it")] == ["datetime"]
+        
+        logger.info("✓ Skill index working")
+        return True
+    except Exception as e:
+        logger.error(f"✗ Skill index failed: {e}")
+        return False
+
+
 async def test_full_pipeline():
     """Test all components."""
     logger.info("=" * 60)
@@ -166,7 +186,8 @@ async def test_full_pipeline():
         "Wake Word": await test_wake_word(config),
         "STT": await test_stt(config),
         "TTS": await test_tts(config),
-        "Persona": await test_persona(config)
+        "Persona": await test_persona(config),
+        "Skill Index": await test_skill_index()
     }
     
     # Summary
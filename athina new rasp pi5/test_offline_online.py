@@ -3,21 +3,31 @@
 """
 Test script for Athina's offline-first with OpenAI integration.
 
-Tests both offline and online modes to ensure graceful fallback.
+Tests both offline and online modes to ensure graceful fallback. The
+online tests run against the bundled mock OpenAI server
+(mock_openai_server.py), so they need neither network access nor an API
+key, and each scenario (healthy, slow, failing, rate limited, stalling)
+behaves the same on every run.
 """
 
 import asyncio
 import logging
 import os
 import sys
+import tempfile
+import time
+import json
+from dataclasses import replace
 from pathlib import Path
 
 # Add the athina package to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from athina.config import Config
-from athina.providers.openai_provider import OpenAIProvider
+from athina.mock_openai_server import MockOpenAIServer, ServerProfile, LatencyDistribution
+from athina.providers.openai_provider import OpenAIProvider, OPENAI_AVAILABLE
 from athina.nlp_router import NLPRouter
+from athina.providers.base import ROUTE_CLOUD
 from athina.skills_persona import SkillsPersonaEngine
 
 
@@ -40,75 +50,163 @@ async def test_configuration():
         return None
 
 
+# Mock server behaviour for each online scenario
+SCENARIOS = {
+    "healthy": ServerProfile(ttft=LatencyDistribution(0.3, 0.1, "normal"), tokens_per_second=40),
+    "slow": ServerProfile(ttft=LatencyDistribution(4.0, 0.5, "lognormal"), tokens_per_second=10),
+    "failing": ServerProfile(ttft=LatencyDistribution(0.1), error_rate=1.0),
+    "rate_limited": ServerProfile(ttft=LatencyDistribution(0.05), rate_limit_rate=1.0, retry_after=20),
+    "stalling": ServerProfile(ttft=LatencyDistribution(0.2), stall_rate=0.5, stall_seconds=10),
+}
+
+SCENARIO_QUERIES = [
+    "Explain the theory of relativity",
+    "How does machine learning work?",
+    "Can you analyze the economic implications of artificial intelligence?",
+    "Explain quantum physics in detail",
+]
+
+
+def make_test_config(base_url: str) -> Config:
+    """Configuration pointing at the mock server, with fresh state and no response cache."""
+    os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+    config = Config()
+    config.openai.enabled = True
+    config.openai.base_url = base_url
+    config.openai.max_retries = 0  # Let every failure reach the circuit breaker
+    config.openai.cache['enabled'] = False  # Measure every request
+    config.system.model_cache_dir = tempfile.mkdtemp(prefix="athina-test-")
+    return config
+
+
+async def raw_request(base_url: str, body: dict) -> tuple:
+    """POST to the mock server without the SDK; returns (status, body bytes, seconds to first event)."""
+    host_port = base_url.split('//', 1)[1].split('/', 1)[0]
+    host, port = host_port.split(':')
+    start_time = time.time()
+    reader, writer = await asyncio.open_connection(host, int(port))
+    data = json.dumps(body).encode('utf-8')
+    writer.write(
+        f"POST /v1/chat/completions HTTP/1.1\r\nHost: {host_port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+        f"Connection: close\r\n\r\n".encode('latin-1') + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    
+    # Time the first streamed event, or the error body
+    payload = b""
+    first_event_time = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        payload += line
+        if first_event_time is None and (line.startswith(b"data: ") or line.startswith(b"{")):
+            first_event_time = time.time() - start_time
+    writer.close()
+    return status, payload, first_event_time or time.time() - start_time
+
+
+async def test_mock_server():
+    """Check the mock server itself, independently of the OpenAI SDK."""
+    print("\n" + "=" * 60)
+    print("TESTING MOCK OPENAI SERVER")
+    print("=" * 60)
+    
+    try:
+        request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hello"}]}
+        for name, profile in SCENARIOS.items():
+            # Keep this check quick
+            async with MockOpenAIServer(replace(profile, stall_seconds=min(profile.stall_seconds, 1.0))) as server:
+                status, payload, elapsed = await raw_request(server.base_url, {**request, "stream": True})
+                events = payload.count(b"data: ")
+                print(f"  {name:12s} HTTP {status}  first event {elapsed:.2f}s  {events} stream events")
+        print(f"✓ Mock server test completed")
+    except Exception as e:
+        print(f"✗ Mock server test failed: {e}")
+
+
 async def test_openai_provider(config):
-    """Test OpenAI provider functionality."""
+    """Test OpenAI provider functionality against a healthy mock server."""
     print("\n" + "=" * 60)
     print("TESTING OPENAI PROVIDER")
     print("=" * 60)
     
     try:
-        provider = OpenAIProvider(config.openai.__dict__)
-        print(f"✓ OpenAI provider initialized")
-        print(f"  - Available: {provider.is_available()}")
-        print(f"  - Network connectivity: {provider._check_network_connectivity()}")
-        
-        # Test health check
-        health = await provider.health_check()
-        print(f"  - Health check: {'✓ Healthy' if health['healthy'] else '✗ Unhealthy'}")
-        
-        # Test simple query routing decision
-        test_queries = [
-            "Hello, how are you?",
-            "Explain quantum physics in detail",
-            "What's the weather like?",
-            "Can you analyze the economic implications of artificial intelligence?"
-        ]
-        
-        print(f"\n  Testing routing decisions:")
-        for query in test_queries:
-            should_use = provider.should_use_openai(query)
-            print(f"    '{query[:30]}...' -> {'OpenAI' if should_use else 'Local'}")
-        
-        return provider
+        async with MockOpenAIServer(SCENARIOS["healthy"]) as server:
+            provider = OpenAIProvider(make_test_config(server.base_url))
+            await provider.initialize()
+            print(f"✓ OpenAI provider initialized against {server.base_url}")
+            print(f"  - Available: {provider.is_available()}")
+            
+            await provider.warm_up()
+            print(f"  - Warmed up: {provider.warmed_up}")
+            
+            # Test health check
+            health = await provider.health_check()
+            print(f"  - Health check: {'✓ Healthy' if health['healthy'] else '✗ Unhealthy'}")
+            
+            # Test simple query routing decision
+            test_queries = [
+                "Hello, how are you?",
+                "Explain quantum physics in detail",
+                "What's the weather like?",
+                "Can you analyze the economic implications of artificial intelligence?"
+            ]
+            
+            print(f"\n  Testing routing decisions:")
+            for query in test_queries:
+                should_use = provider.should_use_openai(query, {})
+                print(f"    '{query[:30]}...' -> {'OpenAI' if should_use else 'Local'}")
+            
+            await provider.shutdown()
+            return provider
         
     except Exception as e:
         print(f"✗ OpenAI provider failed: {e}")
         return None
 
 
+async def run_scenario(name: str, profile: ServerProfile) -> None:
+    """Route streamed queries through NLPRouter against one mock server scenario."""
+    async with MockOpenAIServer(profile) as server:
+        config = make_test_config(server.base_url)
+        provider = OpenAIProvider(config)
+        await provider.initialize()
+        router = NLPRouter(config.openai, provider)
+        
+        print(f"\n  Scenario '{name}' (budget {router.latency_budget:.1f}s):")
+        for query in SCENARIO_QUERIES:
+            start_time = time.time()
+            deltas, decision = await router.route_query_stream(query)
+            response = "".join([delta async for delta in deltas])
+            print(f"    {decision.route:9s} first text {decision.time_to_first_token:.2f}s  "
+                  f"total {time.time() - start_time:.2f}s  breaker {provider.breaker.state:9s} "
+                  f"{decision.reason}")
+            if not response:
+                print(f"      ✗ Empty response for '{query}'")
+        
+        stats = router.get_statistics()
+        print(f"    Server outcomes: {server.get_statistics()['outcomes']}")
+        print(f"    Budget hits/misses/failures: {stats.get('budget_hits')}/"
+              f"{stats.get('budget_misses')}/{stats.get('cloud_failures')}")
+        await router.shutdown()
+
+
 async def test_nlp_router(config, provider):
-    """Test NLP router functionality."""
+    """Test NLP routing, the latency budget and the circuit breaker in each scenario."""
     print("\n" + "=" * 60)
     print("TESTING NLP ROUTER")
     print("=" * 60)
     
+    if not OPENAI_AVAILABLE:
+        print("  openai package not installed: every scenario routes locally")
+    
     try:
-        router = NLPRouter({}, provider)
-        print(f"✓ NLP router initialized")
-        
-        # Test queries with different complexity levels
-        test_cases = [
-            ("Hello", "Simple greeting"),
-            ("What time is it?", "Basic query"),
-            ("Explain the theory of relativity", "Complex query"),
-            ("How does machine learning work?", "Technical query")
-        ]
-        
-        print(f"\n  Testing query routing:")
-        for query, description in test_cases:
-            try:
-                response, decision = await router.route_query(query)
-                print(f"    {description}:")
-                print(f"      Query: '{query}'")
-                print(f"      Route: {'OpenAI' if decision.use_openai else 'Local'}")
-                print(f"      Reason: {decision.reason}")
-                print(f"      Response: '{response[:50]}...'")
-                print(f"      Time: {decision.processing_time:.2f}s")
-                print()
-            except Exception as e:
-                print(f"      ✗ Failed: {e}")
-        
-        return router
+        for name, profile in SCENARIOS.items():
+            await run_scenario(name, profile)
+        print(f"\n✓ NLP router scenarios completed")
         
     except Exception as e:
         print(f"✗ NLP router failed: {e}")
@@ -206,32 +304,36 @@ async def test_offline_mode():
 
 
 async def test_fallback_behavior():
-    """Test fallback behavior when OpenAI fails."""
+    """Test fallback behavior when the API endpoint cannot be reached."""
     print("\n" + "=" * 60)
     print("TESTING FALLBACK BEHAVIOR")
     print("=" * 60)
     
     try:
-        config = Config()
-        
-        # Create provider with invalid base URL to simulate API failure
-        openai_config = config.openai.__dict__.copy()
-        openai_config['base_url'] = 'https://invalid-url-for-testing.com'
+        # Start and stop a mock server so its port is known to refuse connections
+        server = MockOpenAIServer()
+        await server.start()
+        base_url = server.base_url
+        await server.stop()
         
-        provider = OpenAIProvider(openai_config)
-        router = NLPRouter({}, provider)
+        config = make_test_config(base_url)
+        provider = OpenAIProvider(config)
+        await provider.initialize()
+        router = NLPRouter(config.openai, provider)
         
-        print(f"✓ Test setup with invalid OpenAI URL")
+        print(f"✓ Test setup with unreachable OpenAI URL {base_url}")
         
         # Test fallback behavior
-        test_query = "Hello, how are you?"
+        test_query = "Explain the theory of relativity"
         response, decision = await router.route_query(test_query)
         
         print(f"  Query: '{test_query}'")
-        print(f"  Fallback triggered: {'Yes' if not decision.use_openai else 'No'}")
+        print(f"  Fallback triggered: {'Yes' if decision.route != ROUTE_CLOUD else 'No'}")
         print(f"  Response: '{response}'")
         print(f"  Reason: {decision.reason}")
+        print(f"  Circuit breaker: {provider.breaker.state}")
         
+        await router.shutdown()
         print(f"✓ Fallback behavior test completed")
         
     except Exception as e:
@@ -247,6 +349,7 @@ async def main():
     print("- OpenAI API integration")
     print("- Intelligent routing")
     print("- Graceful fallback")
+    print("(online tests use the local mock OpenAI server)")
     print()
     
     # Set up logging
@@ -258,6 +361,7 @@ async def main():
         print("Configuration test failed. Exiting.")
         return
     
+    await test_mock_server()
     provider = await test_openai_provider(config)
     router = await test_nlp_router(config, provider)
     persona = await test_persona_engine(config)
@@ -11,20 +11,28 @@ import time
 import tempfile
 import wave
 import json
-from typing import Optional, Dict, Any, List
+import re
+import shutil
+from typing import Optional, Dict, Any, List, Callable, Awaitable, AsyncIterable, AsyncIterator, Iterable
 from pathlib import Path
 import subprocess
 
-try:
-    import piper
-    PIPER_AVAILABLE = True
-except ImportError:
-    PIPER_AVAILABLE = False
-
 import numpy as np
 
 from .errors import TTSError, InitializationError, ModelError
-from .logging_cfg import PerformanceTimer
+from .logging_cfg import PerformanceTimer, STARTUP_PROFILER
+from .lazy_imports import is_available, load
+from .tts_cache import TTSCache
+from .audio_dsp import SpeechPostProcessor
+from .audio_frame import AudioFrame
+
+# The piper package is only imported once initialize() selects it
+PIPER_AVAILABLE = is_available('piper')
+
+# Sentence boundaries, and clause boundaries used to break up long sentences
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+CLAUSE_BOUNDARY = re.compile(r'(?<=[,;:])\s+')
+WORD_BOUNDARY = re.compile(r'\s+')
 
 
 class TextToSpeechEngine:
@@ -53,19 +61,45 @@ class TextToSpeechEngine:
         self.model_path = config.tts.model_path
         self.speaker_id = config.tts.speaker_id
         self.length_scale = config.tts.length_scale
+        self.speed_via_length_scale = config.tts.speed_via_length_scale
         self.noise_scale = config.tts.noise_scale
         self.noise_scale_w = config.tts.noise_scale_w
         self.streaming = config.tts.streaming
         self.mock_mode = config.tts.mock_mode
         self.sentence_silence = config.tts.sentence_silence
+        self.requested_backend = config.tts.backend
+        self.stream_queue_size = config.tts.stream_queue_size
+        self.max_chunk_chars = config.tts.max_chunk_chars
+        self.worker_timeout = config.tts.worker_timeout
+        
+        # Piper renders speed natively by scaling phoneme durations
+        self.synthesis_length_scale = (
+            self.length_scale / self.voice_speed if self.speed_via_length_scale else self.length_scale
+        )
+        self.post_processor = None
         
         # Audio parameters
         self.sample_rate = config.audio.sample_rate
+        self.voice_sample_rate = self.sample_rate  # Replaced by the voice's own rate on load
         
         # Model and synthesis
         self.model = None
         self.is_initialized = False
-        self.piper_process = None
+        self.synthesis_backend = None
+        self.voice = None  # In-process PiperVoice
+        self.piper_path = None  # Resolved once at load time
+        self.piper_process = None  # Long-lived piper CLI worker
+        self.worker_output_dir = Path(config.system.temp_dir) / "piper"
+        self._worker_lock = asyncio.Lock()
+        
+        # Synthesized speech cache
+        self.cache = None
+        if config.tts.cache_enabled:
+            self.cache = TTSCache(
+                memory_budget_bytes=config.tts.cache_memory_mb * 1024 * 1024,
+                cache_dir=Path(config.system.model_cache_dir) / "tts_cache" if config.tts.cache_persistent else None,
+                disk_budget_bytes=config.tts.cache_disk_mb * 1024 * 1024
+            )
         
         # Wake sound
         self.wake_sound_path = None
@@ -76,6 +110,10 @@ class TextToSpeechEngine:
         self.failed_synthesis = 0
         self.average_synthesis_time = 0.0
         self.total_characters = 0
+        self.total_first_audio = 0
+        self.average_time_to_first_audio = 0.0
+        self.last_time_to_first_audio = 0.0
+        self.last_first_audio_at = 0.0
         
         # Audio playback callback
         self.audio_manager = None
@@ -92,6 +130,7 @@ class TextToSpeechEngine:
             
             # Load TTS model
             await self._load_model()
+            self._build_post_processor()
             
             # Prepare wake sound
             await self._prepare_wake_sound()
@@ -116,21 +155,33 @@ class TextToSpeechEngine:
             if not model_file.exists():
                 raise ModelError(f"TTS model not found: {model_file}")
             
-            # Verify Piper is available
-            piper_path = await self._get_piper_path()
-            if not piper_path:
-                raise InitializationError("Piper TTS not found. Please install piper-tts")
-            
-            # Test model loading
-            await self._test_model(model_file)
-            
             self.model_path = model_file
-            self.logger.info(f"Loaded TTS model: {self.model_name}")
+            self.voice_sample_rate = self._read_voice_sample_rate(model_file)
+            
+            # Load the voice once; synthesis then only pays for inference
+            with STARTUP_PROFILER.measure('tts', 'load model'):
+                if PIPER_AVAILABLE and self.requested_backend in ('auto', 'python'):
+                    self._load_voice(model_file)
+                elif self.requested_backend in ('auto', 'worker'):
+                    await self._start_worker()
+                else:
+                    raise InitializationError("Piper Python package not installed (tts.backend: python)")
+                
+                await self._test_model(model_file)
+            
+            self.logger.info(
+                f"Loaded TTS model: {self.model_name} "
+                f"({self.synthesis_backend}, {self.voice_sample_rate} Hz)"
+            )
             
         except Exception as e:
             # Fallback to espeak for basic TTS
             self.logger.warning(f"Piper TTS loading failed, using espeak fallback: {e}")
+            await self._stop_worker()
+            self.voice = None
             self.model = 'espeak'
+            self.synthesis_backend = 'espeak'
+            self.voice_sample_rate = self.sample_rate
     
     async def _download_model(self) -> Path:
         """Download Piper model if not present."""
@@ -174,63 +225,94 @@ class TextToSpeechEngine:
         except Exception as e:
             raise ModelError(f"Failed to download TTS model: {e}")
     
+    def _read_voice_sample_rate(self, model_file: Path) -> int:
+        """Read the voice's output sample rate from its .onnx.json config."""
+        config_file = model_file.with_name(model_file.name + ".json")
+        try:
+            with open(config_file) as f:
+                return int(json.load(f)['audio']['sample_rate'])
+        except Exception as e:
+            self.logger.warning(f"Could not read voice sample rate from {config_file}: {e}")
+            return self.sample_rate
+    
+    def _load_voice(self, model_file: Path) -> None:
+        """Load the Piper voice in-process (one ONNX Runtime session)."""
+        PiperVoice = load('piper', 'tts').PiperVoice
+        self.voice = PiperVoice.load(str(model_file), config_path=str(model_file) + ".json")
+        self.synthesis_backend = 'piper-python'
+    
+    async def _start_worker(self) -> None:
+        """Start a long-lived piper process that keeps the voice loaded."""
+        if self.piper_path is None:
+            self.piper_path = await self._get_piper_path()
+        if not self.piper_path:
+            raise InitializationError("Piper TTS not found. Please install piper-tts")
+        
+        self.worker_output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # In --output_dir mode piper writes one WAV per input line and
+        # prints its path, which delimits utterances on the pipe
+        cmd = [
+            str(self.piper_path),
+            '--model', str(self.model_path),
+            '--output_dir', str(self.worker_output_dir),
+            '--length_scale', str(self.synthesis_length_scale),
+            '--noise_scale', str(self.noise_scale),
+            '--noise_w', str(self.noise_scale_w)
+        ]
+        
+        if self.speaker_id is not None:
+            cmd.extend(['--speaker', str(self.speaker_id)])
+        
+        self.piper_process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self.synthesis_backend = 'piper-worker'
+    
+    async def _stop_worker(self) -> None:
+        """Stop the piper worker process, if running."""
+        process, self.piper_process = self.piper_process, None
+        if process is None or process.returncode is not None:
+            return
+        
+        try:
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), timeout=2.0)
+        except Exception:
+            process.terminate()
+    
     async def _get_piper_path(self) -> Optional[Path]:
         """Find Piper executable path."""
+        if self.piper_path is not None:
+            return self.piper_path
+        
         # Try common locations
         piper_paths = [
             Path("/usr/local/bin/piper"),
             Path("/usr/bin/piper"),
             Path.home() / ".local/bin/piper",
-            Path("piper"),  # In PATH
         ]
         
         for path in piper_paths:
-            if path.exists() or await self._command_exists(str(path)):
+            if path.exists():
                 return path
         
         # Try to find in PATH
-        try:
-            result = subprocess.run(['which', 'piper'], capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
-                return Path(result.stdout.strip())
-        except:
-            pass
-        
-        return None
+        found = shutil.which('piper')
+        return Path(found) if found else None
     
     async def _command_exists(self, cmd: str) -> bool:
         """Check if command exists."""
-        try:
-            subprocess.run([cmd, '--version'], capture_output=True, check=False)
-            return True
-        except:
-            return False
+        return shutil.which(cmd) is not None
     
     async def _test_model(self, model_file: Path) -> None:
         """Test if model loads correctly."""
-        piper_path = await self._get_piper_path()
-        if not piper_path:
-            raise InitializationError("Piper executable not found")
-        
-        # Test synthesis
-        test_text = "Testing voice synthesis"
-        cmd = [
-            str(piper_path),
-            '--model', str(model_file),
-            '--output_raw'
-        ]
-        
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        stdout, stderr = process.communicate(test_text.encode())
-        
-        if process.returncode != 0:
-            raise ModelError(f"Model test failed: {stderr.decode()}")
+        # Also warms up the inference session before the first real reply
+        if not await self._synthesize_piper("Testing voice synthesis"):
+            raise ModelError(f"Model test failed: {model_file}", model_path=str(model_file), model_type="tts")
     
     async def _prepare_wake_sound(self) -> None:
         """Prepare wake sound for playback."""
@@ -246,19 +328,7 @@ class TextToSpeechEngine:
             envelope = np.exp(-t * 5)  # Exponential decay
             audio = np.sin(2 * np.pi * frequency * t) * envelope * 0.3
             
-            # Convert to int16
-            audio_int16 = (audio * 32767).astype(np.int16)
-            
-            # Save to memory
-            buffer = io.BytesIO()
-            with wave.open(buffer, 'wb') as wav:
-                wav.setnchannels(1)
-                wav.setsampwidth(2)
-                wav.setframerate(self.sample_rate)
-                wav.writeframes(audio_int16.tobytes())
-            
-            buffer.seek(0)
-            self.wake_sound_data = buffer.read()
+            self.wake_sound_data = AudioFrame.from_float(audio, self.sample_rate)
             
         except Exception as e:
             self.logger.warning(f"Failed to prepare wake sound: {e}")
@@ -267,12 +337,17 @@ class TextToSpeechEngine:
         """Set audio manager for playback."""
         self.audio_manager = audio_manager
     
-    async def speak(self, text: str) -> None:
+    async def speak(self, text: str, after: Optional[Awaitable] = None) -> None:
         """
         Synthesize and play speech.
         
+        With streaming enabled, the text is spoken sentence by sentence:
+        the next sentence is synthesized while the current one plays.
+        
         Args:
             text: Text to speak
+            after: Optional awaitable (e.g. speech already playing) that must
+                finish before playback starts; synthesis starts immediately
         """
         if not self.is_initialized:
             raise TTSError("TTS engine not initialized")
@@ -281,23 +356,19 @@ class TextToSpeechEngine:
             return
         
         if self.mock_mode:
+            if after is not None:
+                await after
             self.logger.info(f"Mock TTS: '{text}'")
+            self.last_first_audio_at = time.time()
             await asyncio.sleep(len(text) * 0.05)  # Simulate speaking time
             return
         
         start_time = time.time()
+        chunks = self.split_sentences(text) if self.streaming else [text.strip()]
         
         try:
             with PerformanceTimer("tts_synthesis", self.logger):
-                # Synthesize speech
-                audio_data = await self._synthesize(text)
-                
-                if audio_data and self.audio_manager:
-                    # Play audio
-                    await self.audio_manager.play_audio(audio_data)
-                
-                # Update statistics
-                synthesis_time = time.time() - start_time
+                synthesis_time = await self._speak_chunks(self._iterate(chunks), start_time, after)
                 self._update_statistics(True, synthesis_time, len(text))
                 
         except Exception as e:
@@ -307,57 +378,397 @@ class TextToSpeechEngine:
             # Try fallback
             await self._speak_fallback(text)
     
-    async def _synthesize(self, text: str) -> Optional[bytes]:
-        """Synthesize text to audio."""
-        if self.model == 'espeak':
-            return await self._synthesize_espeak(text)
+    async def speak_stream(self, deltas: AsyncIterable[str], after: Optional[Awaitable] = None) -> str:
+        """
+        Speak text while it is still being generated.
         
-        piper_path = await self._get_piper_path()
-        if not piper_path:
-            return None
+        Each sentence is synthesized as soon as it is complete, so the
+        first sentence plays while the rest of the text is still arriving.
+        Without streaming enabled the text is collected and spoken whole.
+        
+        Args:
+            deltas: Text pieces in order (e.g. tokens from a language model)
+            after: Optional awaitable that must finish before playback starts
+            
+        Returns:
+            The complete text received
+        """
+        if not self.is_initialized:
+            raise TTSError("TTS engine not initialized")
+        
+        received = []
+        
+        async def collect() -> AsyncIterator[str]:
+            async for delta in deltas:
+                received.append(delta)
+                yield delta
+        
+        if self.mock_mode or not self.streaming:
+            async for _ in collect():
+                pass
+            text = ''.join(received)
+            await self.speak(text, after=after)
+            return text
+        
+        start_time = time.time()
         
         try:
-            # Prepare Piper command
-            cmd = [
-                str(piper_path),
-                '--model', str(self.model_path),
-                '--output_raw',
-                '--length_scale', str(self.length_scale),
-                '--noise_scale', str(self.noise_scale),
-                '--noise_w', str(self.noise_scale_w)
-            ]
+            with PerformanceTimer("tts_synthesis", self.logger):
+                synthesis_time = await self._speak_chunks(self._stream_chunks(collect()), start_time, after)
+                self._update_statistics(True, synthesis_time, len(''.join(received)))
+                
+        except Exception as e:
+            self.logger.error(f"Streaming speech synthesis failed: {e}")
             
-            if self.speaker_id is not None:
-                cmd.extend(['--speaker', str(self.speaker_id)])
+            # Read the rest of the text so it can still be spoken
+            try:
+                async for _ in collect():
+                    pass
+            except Exception as drain_error:
+                self.logger.debug(f"Text stream ended with error: {drain_error}")
             
-            # Run synthesis
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            self._update_statistics(False, time.time() - start_time, len(''.join(received)))
+            
+            # Try fallback, unless part of the answer was already heard
+            if self.last_first_audio_at < start_time:
+                await self._speak_fallback(''.join(received))
+        
+        return ''.join(received)
+    
+    async def _stream_chunks(self, deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+        """
+        Cut streamed text into speakable chunks as soon as they are complete.
+        
+        A sentence is complete once the whitespace after its end punctuation
+        arrives. Text running past the chunk limit without a sentence end
+        is cut at the last clause (or word) boundary so speech can start.
+        """
+        buffer = ''
+        async for delta in deltas:
+            buffer += delta
+            
+            boundary = None
+            for boundary in SENTENCE_BOUNDARY.finditer(buffer):
+                pass
+            
+            if boundary is None and len(buffer) > self.max_chunk_chars:
+                for boundary in CLAUSE_BOUNDARY.finditer(buffer):
+                    pass
+                if boundary is None:
+                    for boundary in WORD_BOUNDARY.finditer(buffer.strip()):
+                        pass
+                    if boundary is not None:
+                        # Offsets refer to the stripped buffer
+                        buffer = buffer.strip()
+            
+            if boundary is not None:
+                for chunk in self.split_sentences(buffer[:boundary.start()]):
+                    yield chunk
+                buffer = buffer[boundary.end():]
+        
+        for chunk in self.split_sentences(buffer):
+            yield chunk
+    
+    @staticmethod
+    async def _iterate(chunks: Iterable[str]) -> AsyncIterator[str]:
+        """Feed already-known chunks to the streaming player."""
+        for chunk in chunks:
+            yield chunk
+    
+    def is_cached(self, text: str) -> bool:
+        """
+        Check whether speech for ``text`` can be played without synthesis.
+        
+        Args:
+            text: Text to check
             
-            # Send text and get audio
-            stdout, stderr = process.communicate(text.encode())
+        Returns:
+            True if every chunk of the text is in the cache
+        """
+        if self.mock_mode:
+            return True
+        
+        if self.cache is None or not self.is_initialized:
+            return False
+        
+        params = self._cache_params()
+        chunks = self.split_sentences(text) if self.streaming else [text.strip()]
+        return all(self.cache.contains(TTSCache.make_key(chunk, params)) for chunk in chunks)
+    
+    def split_sentences(self, text: str) -> List[str]:
+        """
+        Split text into sentences, breaking long sentences at clause boundaries.
+        
+        Args:
+            text: Text to split
             
-            if process.returncode != 0:
-                raise TTSError(f"Piper synthesis failed: {stderr.decode()}")
+        Returns:
+            Non-empty text chunks in speaking order
+        """
+        chunks = []
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if len(sentence) <= self.max_chunk_chars:
+                chunks.append(sentence)
+                continue
+            
+            # Greedily pack clauses up to the chunk limit
+            current = ''
+            for clause in CLAUSE_BOUNDARY.split(sentence):
+                if current and len(current) + len(clause) + 1 > self.max_chunk_chars:
+                    chunks.append(current)
+                    current = clause
+                else:
+                    current = f"{current} {clause}" if current else clause
+            chunks.append(current)
+        
+        return [chunk.strip() for chunk in chunks if chunk.strip()]
+    
+    async def _speak_chunks(self, chunks: AsyncIterable[str], start_time: float,
+                            after: Optional[Awaitable] = None) -> float:
+        """
+        Synthesize chunks in a producer task and play them as they become ready.
+        
+        Args:
+            chunks: Text chunks in speaking order, possibly still being produced
+            start_time: When the speak request started, for time-to-first-audio
+            after: Optional awaitable to finish before the first chunk plays
             
-            # Convert raw audio to WAV
-            audio_data = np.frombuffer(stdout, dtype=np.int16)
+        Returns:
+            Total time spent synthesizing
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_queue_size)
+        silence = AudioFrame.silence(self.sentence_silence, self.sample_rate)
+        synthesis_time = 0.0
+        
+        async def produce() -> None:
+            nonlocal synthesis_time
+            try:
+                index = 0
+                async for chunk in chunks:
+                    chunk_start = time.time()
+                    audio = await self._synthesize(chunk)
+                    synthesis_time += time.time() - chunk_start
+                    if audio is not None and len(audio):
+                        await queue.put((index, audio))
+                        index += 1
+            finally:
+                await queue.put(None)
+        
+        producer = asyncio.create_task(produce())
+        first_audio = True
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                
+                index, audio = item
+                
+                if first_audio:
+                    if after is not None:
+                        await after
+                    self._record_time_to_first_audio(time.time() - start_time)
+                    first_audio = False
+                
+                if self.audio_manager:
+                    # Pause between sentences; the end of the stream is not known in advance
+                    if index > 0:
+                        audio = AudioFrame.concatenate([silence, audio])
+                    await self.audio_manager.play_audio(audio)
             
-            # Apply speed adjustment if needed
-            if self.voice_speed != 1.0:
-                audio_data = self._adjust_speed(audio_data)
+            # Surface synthesis errors raised in the producer
+            await producer
             
-            # Convert to WAV format
-            return self._to_wav(audio_data)
+        finally:
+            if not producer.done():
+                producer.cancel()
+        
+        if first_audio:
+            raise TTSError("No audio was synthesized")
+        
+        return synthesis_time
+    
+    async def _synthesize(self, text: str) -> Optional[AudioFrame]:
+        """Synthesize text at the playback sample rate, using the cache."""
+        if self.cache is None:
+            return await self._synthesize_uncached(text)
+        
+        key = TTSCache.make_key(text, self._cache_params())
+        audio_data = self.cache.get(key)
+        if audio_data is not None:
+            return AudioFrame.from_bytes(audio_data, self.sample_rate)
+        
+        audio = await self._synthesize_uncached(text)
+        if audio is not None:
+            self.cache.put(key, audio.to_bytes())
+        
+        return audio
+    
+    def _cache_params(self) -> Dict[str, Any]:
+        """Voice and synthesis parameters that determine the synthesized audio."""
+        return {
+            'voice': 'espeak' if self.model == 'espeak' else self.model_name,
+            'speaker_id': self.speaker_id,
+            'length_scale': self.synthesis_length_scale,
+            'noise_scale': self.noise_scale,
+            'noise_w': self.noise_scale_w,
+            'voice_speed': self.voice_speed,
+            'voice_pitch': self.voice_pitch,
+            'voice_volume': self.voice_volume,
+            'sample_rate': self.sample_rate
+        }
+    
+    async def prewarm(self, phrases: List[str], idle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Synthesize fixed phrases into the cache ahead of time.
+        
+        Phrases are split exactly as ``speak`` splits them, so the cached
+        chunks match what is later looked up.
+        
+        Args:
+            phrases: Texts to pre-synthesize
+            idle: Optional callable; synthesis waits while it returns False
+            
+        Returns:
+            Number of chunks synthesized
+        """
+        if self.cache is None or self.mock_mode or not self.is_initialized:
+            return 0
+        
+        params = self._cache_params()
+        synthesized = 0
+        
+        for phrase in phrases:
+            chunks = self.split_sentences(phrase) if self.streaming else [phrase.strip()]
+            for chunk in chunks:
+                key = TTSCache.make_key(chunk, params)
+                if not chunk or self.cache.contains(key):
+                    continue
+                
+                while idle is not None and not idle():
+                    await asyncio.sleep(0.5)
+                
+                audio = await self._synthesize_uncached(chunk)
+                if audio is not None and len(audio):
+                    self.cache.put(key, audio.to_bytes())
+                    synthesized += 1
+        
+        self.logger.info(f"Pre-synthesized {synthesized} phrase chunks into the TTS cache")
+        return synthesized
+    
+    async def _synthesize_uncached(self, text: str) -> Optional[AudioFrame]:
+        """Synthesize text at the playback sample rate."""
+        try:
+            if self.model == 'espeak':
+                wav_data = await self._synthesize_espeak(text)
+                if not wav_data:
+                    return None
+                audio = AudioFrame.from_wav_bytes(wav_data)
+            else:
+                raw_audio = await self._synthesize_piper(text)
+                if not raw_audio:
+                    return None
+                audio = AudioFrame.from_bytes(raw_audio, self.voice_sample_rate)
+            
+            audio = audio.resampled(self.sample_rate)
+            
+            # Speed (when not rendered natively), pitch and volume
+            if self.post_processor is not None:
+                audio = audio.with_samples(self.post_processor.process_utterance(audio.samples))
+            
+            return audio
             
         except Exception as e:
             self.logger.error(f"Synthesis error: {e}")
             return None
     
+    async def _synthesize_piper(self, text: str) -> Optional[bytes]:
+        """Run the loaded voice and return raw 16-bit PCM at ``voice_sample_rate``."""
+        if self.voice is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._synthesize_in_process, text)
+        
+        if self.synthesis_backend == 'piper-worker':
+            return await self._synthesize_worker(text)
+        
+        return None
+    
+    def _synthesize_in_process(self, text: str) -> bytes:
+        """Synthesize with the in-process PiperVoice."""
+        if hasattr(self.voice, 'synthesize_stream_raw'):
+            # piper-tts 1.2
+            return b''.join(self.voice.synthesize_stream_raw(
+                text,
+                speaker_id=self.speaker_id,
+                length_scale=self.synthesis_length_scale,
+                noise_scale=self.noise_scale,
+                noise_w=self.noise_scale_w
+            ))
+        
+        # piper-tts 1.3+
+        SynthesisConfig = load('piper', 'tts').SynthesisConfig
+        syn_config = SynthesisConfig(
+            speaker_id=self.speaker_id,
+            length_scale=self.synthesis_length_scale,
+            noise_scale=self.noise_scale,
+            noise_w_scale=self.noise_scale_w
+        )
+        return b''.join(chunk.audio_int16_bytes for chunk in self.voice.synthesize(text, syn_config=syn_config))
+    
+    async def _synthesize_worker(self, text: str) -> Optional[bytes]:
+        """
+        Synthesize one line through the piper worker process.
+        
+        Requests and replies are paired only by order on the pipe, so a
+        request that is cancelled or times out before its reply is read
+        kills the worker; the next request starts a fresh one instead of
+        reading the stale reply as its own.
+        """
+        line = ' '.join(text.split())
+        if not line:
+            return None
+        
+        async with self._worker_lock:
+            if self.piper_process is None or self.piper_process.returncode is not None:
+                self.logger.warning("Piper worker not running, restarting")
+                await self._start_worker()
+            
+            process = self.piper_process
+            try:
+                wav_path = await asyncio.wait_for(self._worker_request(process, line), timeout=self.worker_timeout)
+            except asyncio.TimeoutError:
+                self._kill_worker()
+                raise TTSError(f"Piper worker timed out after {self.worker_timeout:.1f}s, restarting it")
+            except asyncio.CancelledError:
+                self._kill_worker()
+                raise
+            
+            if not wav_path:
+                raise TTSError("Piper worker exited during synthesis")
+        
+        try:
+            with wave.open(wav_path, 'rb') as wav:
+                return wav.readframes(wav.getnframes())
+        finally:
+            Path(wav_path).unlink(missing_ok=True)
+    
+    @staticmethod
+    async def _worker_request(process, line: str) -> str:
+        """Send one line to the piper worker and read back the WAV path it prints."""
+        process.stdin.write((line + '\n').encode())
+        await process.stdin.drain()
+        return (await process.stdout.readline()).decode().strip()
+    
+    def _kill_worker(self) -> None:
+        """Kill the piper worker at once, leaving the restart to the next request."""
+        process, self.piper_process = self.piper_process, None
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+    
     async def _synthesize_espeak(self, text: str) -> Optional[bytes]:
         """Synthesize using espeak as fallback."""
         try:
@@ -387,30 +798,21 @@ class TextToSpeechEngine:
         
         return None
     
-    def _adjust_speed(self, audio_data: np.ndarray) -> np.ndarray:
-        """Adjust audio playback speed."""
-        if self.voice_speed == 1.0:
-            return audio_data
-        
-        # Simple speed adjustment by resampling
-        target_length = int(len(audio_data) / self.voice_speed)
-        indices = np.linspace(0, len(audio_data) - 1, target_length)
-        
-        # Linear interpolation
-        return np.interp(indices, np.arange(len(audio_data)), audio_data).astype(np.int16)
-    
-    def _to_wav(self, audio_data: np.ndarray) -> bytes:
-        """Convert audio array to WAV format."""
-        buffer = io.BytesIO()
-        
-        with wave.open(buffer, 'wb') as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)
-            wav.setframerate(self.sample_rate)
-            wav.writeframes(audio_data.tobytes())
+    def _build_post_processor(self) -> None:
+        """Set up speed, pitch and volume post-processing for the loaded voice."""
+        # espeak applies speed through its words-per-minute rate, and Piper
+        # through length_scale unless configured otherwise
+        native_speed = self.model == 'espeak' or self.speed_via_length_scale
+        
+        self.post_processor = SpeechPostProcessor(
+            self.sample_rate,
+            speed=1.0 if native_speed else self.voice_speed,
+            semitones=self.voice_pitch,
+            gain=self.voice_volume
+        )
         
-        buffer.seek(0)
-        return buffer.read()
+        if self.post_processor.is_passthrough:
+            self.logger.debug("TTS post-processing disabled (no speed, pitch or volume change)")
     
     async def _speak_fallback(self, text: str) -> None:
         """Fallback speech method using system TTS."""
@@ -430,7 +832,7 @@ class TextToSpeechEngine:
     
     async def play_wake_sound(self) -> None:
         """Play wake word detection sound."""
-        if self.wake_sound_data and self.audio_manager:
+        if self.wake_sound_data is not None and self.audio_manager:
             try:
                 await self.audio_manager.play_audio(self.wake_sound_data)
             except Exception as e:
@@ -451,6 +853,16 @@ class TextToSpeechEngine:
         
         self.total_characters += text_length
     
+    def _record_time_to_first_audio(self, latency: float) -> None:
+        """Record the delay between a speak request and the start of playback."""
+        self.total_first_audio += 1
+        self.last_time_to_first_audio = latency
+        self.last_first_audio_at = time.time()
+        self.average_time_to_first_audio += (
+            (latency - self.average_time_to_first_audio) / self.total_first_audio
+        )
+        self.logger.debug(f"Time to first audio: {latency:.3f}s")
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get TTS engine statistics."""
         success_rate = 0.0
@@ -466,12 +878,19 @@ class TextToSpeechEngine:
         return {
             'is_initialized': self.is_initialized,
             'model_name': self.model_name,
+            'synthesis_backend': self.synthesis_backend,
+            'voice_sample_rate': self.voice_sample_rate,
             'total_synthesis': self.total_synthesis,
             'failed_synthesis': self.failed_synthesis,
             'success_rate': success_rate,
             'average_time_seconds': self.average_synthesis_time,
             'total_characters': self.total_characters,
             'characters_per_second': chars_per_second,
+            'streaming': self.streaming,
+            'average_time_to_first_audio_seconds': self.average_time_to_first_audio,
+            'last_time_to_first_audio_seconds': self.last_time_to_first_audio,
+            'cache': self.cache.get_statistics() if self.cache else None,
+            'post_processing': self.post_processor.get_statistics() if self.post_processor else None,
             'voice_speed': self.voice_speed
         }
     
@@ -480,10 +899,9 @@ class TextToSpeechEngine:
         try:
             self.is_initialized = False
             
-            # Stop any running Piper process
-            if self.piper_process:
-                self.piper_process.terminate()
-                self.piper_process = None
+            # Stop the Piper worker and release the in-process voice
+            await self._stop_worker()
+            self.voice = None
             
             self.logger.info("TTS engine shutdown complete")
             
@@ -0,0 +1,218 @@
+"""
+Athina Synthesized Speech Cache
+
+Content-addressed cache of synthesized PCM audio. Entries are keyed by
+voice, synthesis parameters and normalized text, held in an in-memory LRU
+bounded by a byte budget, and optionally persisted as headerless 16-bit
+PCM files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (Unicode NFC, collapsed whitespace)."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class TTSCache:
+    """
+    Two-tier cache of synthesized speech.
+
+    The memory tier is an LRU bounded by ``memory_budget_bytes``; the disk
+    tier stores one ``<key>.pcm`` file per entry under ``cache_dir`` and is
+    pruned oldest-first once it exceeds ``disk_budget_bytes``.
+    """
+
+    def __init__(self, memory_budget_bytes: int, cache_dir: Optional[Path] = None,
+                 disk_budget_bytes: int = 0):
+        """
+        Initialize TTSCache.
+
+        Args:
+            memory_budget_bytes: Maximum PCM bytes held in memory
+            cache_dir: Directory for persisted entries, or None for memory only
+            disk_budget_bytes: Maximum PCM bytes kept on disk (0 = unbounded)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        self.memory_budget_bytes = memory_budget_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.disk_budget_bytes = disk_budget_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(f.stat().st_size for f in self.cache_dir.glob("*.pcm"))
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, params: Dict[str, Any]) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            text: Text being synthesized
+            params: Voice and synthesis parameters that affect the audio
+
+        Returns:
+            Hex digest identifying the audio
+        """
+        material = json.dumps(params, sort_keys=True, default=str) + '\n' + normalize_text(text)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up cached audio.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            16-bit PCM audio, or None on a miss
+        """
+        audio_data = self._memory.get(key)
+        if audio_data is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            self.bytes_saved += len(audio_data)
+            return audio_data
+
+        audio_data = self._read_disk(key)
+        if audio_data is not None:
+            self._remember(key, audio_data)
+            self.disk_hits += 1
+            self.bytes_saved += len(audio_data)
+            return audio_data
+
+        self.misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Whether audio for ``key`` is cached, without touching statistics."""
+        return key in self._memory or (self.cache_dir is not None and self._disk_path(key).exists())
+
+    def put(self, key: str, audio_data: bytes) -> None:
+        """
+        Store synthesized audio in both tiers.
+
+        Args:
+            key: Key from ``make_key``
+            audio_data: 16-bit PCM audio
+        """
+        if not audio_data:
+            return
+
+        self._remember(key, audio_data)
+
+        if self.cache_dir is not None and not self._disk_path(key).exists():
+            self._write_disk(key, audio_data)
+
+    def _remember(self, key: str, audio_data: bytes) -> None:
+        """Insert into the memory LRU, evicting least recently used entries."""
+        if len(audio_data) > self.memory_budget_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = audio_data
+        self._memory_bytes += len(audio_data)
+
+        while self._memory_bytes > self.memory_budget_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """Path of the persisted entry for ``key``."""
+        return self.cache_dir / f"{key}.pcm"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """
+        Read a persisted entry.
+
+        The whole file is read: the entry is returned as bytes and kept in
+        the memory tier, so memory-mapping it would save nothing.
+        """
+        if self.cache_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            if not path.exists() or path.stat().st_size == 0:
+                return None
+            audio_data = path.read_bytes()
+            os.utime(path)  # Keep recently used entries out of pruning
+            return audio_data
+        except Exception as e:
+            self.logger.warning(f"Failed to read cached speech {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, audio_data: bytes) -> None:
+        """Persist an entry atomically and prune the disk tier if needed."""
+        path = self._disk_path(key)
+        partial = path.with_suffix('.tmp')
+        try:
+            partial.write_bytes(audio_data)
+            partial.replace(path)
+            self._disk_bytes += len(audio_data)
+        except Exception as e:
+            self.logger.warning(f"Failed to persist cached speech {path}: {e}")
+            return
+
+        if self.disk_budget_bytes and self._disk_bytes > self.disk_budget_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete least recently used persisted entries until under budget."""
+        files = sorted(self.cache_dir.glob("*.pcm"), key=lambda f: f.stat().st_mtime)
+        for path in files:
+            if self._disk_bytes <= self.disk_budget_bytes:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._disk_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Drop the memory tier (persisted entries are kept)."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+
+        return {
+            'entries_in_memory': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'disk_bytes': self._disk_bytes,
+            'persistent': self.cache_dir is not None,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (hits / lookups) * 100 if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'evictions': self.evictions
+        }
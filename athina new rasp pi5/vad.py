@@ -0,0 +1,270 @@
+"""
+Athina Voice Activity Segmentation
+
+Trims leading and trailing non-speech from recorded utterances and splits
+long captures at pauses before they are handed to speech-to-text, so the
+recognizer only spends time on audio that actually contains speech.
+"""
+
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+from .lazy_imports import is_available, load
+from .audio_frame import AudioFrame
+
+WEBRTCVAD_AVAILABLE = is_available('webrtcvad')
+
+
+# Sample rates and frame lengths accepted by WebRTC VAD
+WEBRTCVAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+WEBRTCVAD_FRAME_MS = (10, 20, 30)
+
+
+class SpeechSegmenter:
+    """
+    Frame-level voice activity segmentation for captured utterances.
+
+    Audio is classified in fixed-size frames as it is captured (see
+    ``start_capture``/``feed``), and the resulting speech flags are used
+    to cut the finished recording into padded speech segments.
+    """
+
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 2,
+                 frame_ms: int = 30, padding_ms: int = 200,
+                 min_speech_ms: int = 120, split_pause_ms: int = 1000,
+                 max_segment_seconds: float = 15.0,
+                 volume_threshold: float = 0.01):
+        """
+        Initialize SpeechSegmenter.
+
+        Args:
+            sample_rate: Sample rate of the 16-bit mono audio in Hz
+            aggressiveness: WebRTC VAD aggressiveness (0-3)
+            frame_ms: VAD frame length in milliseconds (10, 20 or 30)
+            padding_ms: Audio kept before and after each speech region
+            min_speech_ms: Speech runs shorter than this are treated as noise
+            split_pause_ms: Pause length that splits a capture into segments
+            max_segment_seconds: Segments longer than this are split at their longest pause
+            volume_threshold: RMS threshold (0-1) used when WebRTC VAD is unavailable
+        """
+        self.logger = logging.getLogger(__name__)
+
+        self.sample_rate = sample_rate
+        self.aggressiveness = min(3, max(0, aggressiveness))
+        self.frame_ms = frame_ms if frame_ms in WEBRTCVAD_FRAME_MS else 30
+        self.volume_threshold = volume_threshold
+
+        self.frame_samples = int(sample_rate * self.frame_ms / 1000)
+        self.frame_bytes = self.frame_samples * 2  # 16-bit samples
+
+        # Durations expressed in frames
+        self.padding_frames = int(round(padding_ms / self.frame_ms))
+        self.min_speech_frames = max(1, int(round(min_speech_ms / self.frame_ms)))
+        self.split_pause_frames = max(1, int(round(split_pause_ms / self.frame_ms)))
+        self.max_segment_frames = max(1, int(max_segment_seconds * 1000 / self.frame_ms))
+
+        # WebRTC VAD, with an energy gate as fallback
+        self.vad = None
+        if WEBRTCVAD_AVAILABLE and sample_rate in WEBRTCVAD_SAMPLE_RATES:
+            try:
+                self.vad = load('webrtcvad', 'audio').Vad(self.aggressiveness)
+            except Exception as e:
+                self.logger.warning(f"WebRTC VAD unavailable, using energy gate: {e}")
+
+        # Streaming capture state
+        self._pending = b''
+        self._flags: List[bool] = []
+
+        # Statistics
+        self.total_turns = 0
+        self.empty_turns = 0
+        self.total_segments = 0
+        self.total_input_seconds = 0.0
+        self.total_speech_seconds = 0.0
+        self.last_trimmed_seconds = 0.0
+
+    @property
+    def backend(self) -> str:
+        """Name of the active speech classifier."""
+        return 'webrtcvad' if self.vad is not None else 'energy'
+
+    def is_speech(self, frame: bytes) -> bool:
+        """
+        Classify a single VAD frame.
+
+        Args:
+            frame: Exactly ``frame_bytes`` of 16-bit PCM audio
+
+        Returns:
+            True if the frame contains speech
+        """
+        if self.vad is not None:
+            try:
+                return self.vad.is_speech(frame, self.sample_rate)
+            except Exception as e:
+                self.logger.debug(f"VAD frame classification failed: {e}")
+
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples)) if samples.size else 0.0
+        return rms > self.volume_threshold * 32768
+
+    def classify(self, audio_data: bytes) -> List[bool]:
+        """
+        Classify every complete frame of a buffer.
+
+        Args:
+            audio_data: 16-bit PCM audio
+
+        Returns:
+            Speech flag per frame (a trailing partial frame is ignored)
+        """
+        return [
+            self.is_speech(audio_data[i:i + self.frame_bytes])
+            for i in range(0, len(audio_data) - self.frame_bytes + 1, self.frame_bytes)
+        ]
+
+    def start_capture(self) -> None:
+        """Reset streaming state at the start of a recording."""
+        self._pending = b''
+        self._flags = []
+
+    def feed(self, frame: AudioFrame) -> None:
+        """
+        Classify a captured chunk, carrying partial frames to the next call.
+
+        Args:
+            frame: Next chunk of the recording
+        """
+        # WebRTC VAD consumes bytes, so this is the one conversion per chunk
+        data = self._pending + frame.to_bytes()
+        usable = len(data) - (len(data) % self.frame_bytes)
+        if usable:
+            self._flags.extend(self.classify(data[:usable]))
+        self._pending = data[usable:]
+
+    @property
+    def capture_flags(self) -> List[bool]:
+        """Speech flags computed so far for the current capture."""
+        return list(self._flags)
+
+    def segment(self, recording: AudioFrame, flags: Optional[List[bool]] = None) -> List[AudioFrame]:
+        """
+        Cut a recording into padded speech segments.
+
+        Args:
+            recording: Mono recording
+            flags: Optional per-frame speech flags computed during capture;
+                recomputed when missing or not aligned with the audio
+
+        Returns:
+            Speech segments (views into the recording), empty if it has no speech
+        """
+        n_frames = len(recording) // self.frame_samples
+        if flags is None or len(flags) < n_frames:
+            flags = self.classify(recording.to_bytes())
+        flags = flags[:n_frames]
+
+        bounds = self._find_segments(flags)
+        segments = []
+        for start, end in bounds:
+            # Include the trailing partial frame if the last segment reaches it
+            end_sample = len(recording) if end >= n_frames else end * self.frame_samples
+            segments.append(recording.slice(start * self.frame_samples, end_sample))
+
+        self._update_statistics(recording.duration, segments)
+        return segments
+
+    def _find_segments(self, flags: List[bool]) -> List[Tuple[int, int]]:
+        """Turn per-frame speech flags into padded (start, end) frame ranges."""
+        # Collect speech runs, dropping ones too short to be speech
+        runs = []
+        run_start = None
+        for i, flag in enumerate(flags + [False]):
+            if flag and run_start is None:
+                run_start = i
+            elif not flag and run_start is not None:
+                if i - run_start >= self.min_speech_frames:
+                    runs.append((run_start, i))
+                run_start = None
+
+        if not runs:
+            return []
+
+        # Merge runs separated by pauses shorter than the split threshold
+        regions = [list(runs[0])]
+        for start, end in runs[1:]:
+            if start - regions[-1][1] < self.split_pause_frames:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+
+        # Split over-long regions at their longest internal pause
+        bounded = []
+        for start, end in regions:
+            bounded.extend(self._split_long_region(start, end, runs))
+
+        # Pad each region, never overlapping its neighbours
+        n_frames = len(flags)
+        padded = []
+        for i, (start, end) in enumerate(bounded):
+            lower = padded[-1][1] if padded else 0
+            upper = bounded[i + 1][0] if i + 1 < len(bounded) else n_frames
+            padded.append((max(lower, start - self.padding_frames),
+                           min(upper, end + self.padding_frames)))
+
+        return padded
+
+    def _split_long_region(self, start: int, end: int,
+                           runs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Recursively split a region longer than ``max_segment_frames``."""
+        if end - start <= self.max_segment_frames:
+            return [(start, end)]
+
+        inner = [r for r in runs if r[0] >= start and r[1] <= end]
+        gaps = [(inner[i + 1][0] - inner[i][1], inner[i][1], inner[i + 1][0])
+                for i in range(len(inner) - 1)]
+
+        if gaps:
+            _, gap_start, gap_end = max(gaps)
+            return (self._split_long_region(start, gap_start, runs) +
+                    self._split_long_region(gap_end, end, runs))
+
+        # Continuous speech: hard cut at the maximum length
+        cut = start + self.max_segment_frames
+        return [(start, cut)] + self._split_long_region(cut, end, [(cut, end)])
+
+    def _update_statistics(self, input_seconds: float, segments: List[AudioFrame]) -> None:
+        """Update trimming statistics for one turn."""
+        speech_seconds = sum(s.duration for s in segments)
+
+        self.total_turns += 1
+        self.total_segments += len(segments)
+        if not segments:
+            self.empty_turns += 1
+
+        self.total_input_seconds += input_seconds
+        self.total_speech_seconds += speech_seconds
+        self.last_trimmed_seconds = input_seconds - speech_seconds
+
+        self.logger.debug(
+            f"VAD kept {speech_seconds:.2f}s of {input_seconds:.2f}s "
+            f"in {len(segments)} segment(s)"
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get segmentation statistics."""
+        trimmed = self.total_input_seconds - self.total_speech_seconds
+
+        return {
+            'backend': self.backend,
+            'total_turns': self.total_turns,
+            'turns_without_speech': self.empty_turns,
+            'total_segments': self.total_segments,
+            'total_input_seconds': self.total_input_seconds,
+            'total_speech_seconds': self.total_speech_seconds,
+            'total_trimmed_seconds': trimmed,
+            'average_trimmed_seconds_per_turn': trimmed / max(self.total_turns, 1),
+            'last_trimmed_seconds': self.last_trimmed_seconds
+        }
@@ -14,21 +14,14 @@ from typing import Optional, Callable, Dict, Any, List
 import collections
 import threading
 
-try:
-    import openwakeword
-    from openwakeword.model import Model
-    OPENWAKEWORD_AVAILABLE = True
-except ImportError:
-    OPENWAKEWORD_AVAILABLE = False
-
-try:
-    import webrtcvad
-    WEBRTCVAD_AVAILABLE = True
-except ImportError:
-    WEBRTCVAD_AVAILABLE = False
-
 from .errors import WakeWordError, ModelError, InitializationError
-from .logging_cfg import PerformanceTimer, PERFORMANCE_MONITORS
+from .logging_cfg import PerformanceTimer, PERFORMANCE_MONITORS, STARTUP_PROFILER
+from .lazy_imports import is_available, load
+from .audio_frame import AudioFrame
+
+# openWakeWord (and its onnxruntime/tflite dependencies) is imported in initialize()
+OPENWAKEWORD_AVAILABLE = is_available('openwakeword')
+WEBRTCVAD_AVAILABLE = is_available('webrtcvad')
 
 
 class WakeWordDetector:
@@ -120,6 +113,7 @@ class WakeWordDetector:
             # Initialize WebRTC VAD with aggressiveness level (0-3)
             # Higher values are more aggressive about filtering out non-speech
             aggressiveness = min(3, max(0, self.trigger_level))
+            webrtcvad = load('webrtcvad', 'wake_word')
             self.vad = webrtcvad.Vad(aggressiveness)
             self.logger.info(f"VAD initialized with aggressiveness level {aggressiveness}")
             
@@ -153,7 +147,9 @@ class WakeWordDetector:
             
             # Create model instance
             if model_path:
-                self.model = Model(**model_params)
+                Model = load('openwakeword.model', 'wake_word').Model
+                with STARTUP_PROFILER.measure('wake_word', 'load model'):
+                    self.model = Model(**model_params)
             else:
                 # Use default "hey athina" or similar
                 self.model = self._create_default_model()
@@ -207,16 +203,17 @@ class WakeWordDetector:
         # In production, this would create a basic "hey athina" detector
         self.logger.warning("Using mock wake word model for testing")
         
+        model_name = self.model_name
+        
         class MockModel:
-            def predict(self, audio_data):
+            def predict(self, samples):
                 # Simple energy-based detection for testing
-                audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                energy = np.sqrt(np.mean(audio_array ** 2))
+                energy = AudioFrame(samples, 16000).rms * 32768
                 
                 # Mock detection based on energy threshold
                 if energy > 1000:
-                    return {self.model_name: np.random.random() * 0.5 + 0.5}
-                return {self.model_name: 0.0}
+                    return {model_name: np.random.random() * 0.5 + 0.5}
+                return {model_name: 0.0}
         
         return MockModel()
     
@@ -229,12 +226,12 @@ class WakeWordDetector:
         """
         self.detection_callback = callback
     
-    async def detect(self, audio_data: bytes) -> bool:
+    async def detect(self, frame: AudioFrame) -> bool:
         """
         Process audio data for wake word detection.
         
         Args:
-            audio_data: Audio data chunk to process
+            frame: Captured mono audio chunk (resampled to 16 kHz if needed)
             
         Returns:
             True if wake word detected, False otherwise
@@ -244,16 +241,18 @@ class WakeWordDetector:
         
         try:
             with PerformanceTimer("wake_word_detection") as timer:
+                frame = frame.to_mono().resampled(16000)
+                
                 # Add to audio buffer
-                self._update_audio_buffer(audio_data)
+                self._update_audio_buffer(frame)
                 
                 # Check VAD if enabled
                 if self.vad_enabled and self.vad:
-                    if not self._check_vad(audio_data):
+                    if not self._check_vad(frame):
                         return False
                 
                 # Get predictions from model
-                predictions = self._get_predictions(audio_data)
+                predictions = self._get_predictions(frame)
                 
                 # Check for wake word detection
                 detected = self._check_detection(predictions)
@@ -267,20 +266,16 @@ class WakeWordDetector:
             self.logger.error(f"Wake word detection error: {e}")
             return False
     
-    def _update_audio_buffer(self, audio_data: bytes) -> None:
+    def _update_audio_buffer(self, frame: AudioFrame) -> None:
         """Update the audio buffer with new data."""
-        # Convert bytes to int16 array
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        
-        # Add to buffer
-        self.audio_buffer.extend(audio_array)
+        self.audio_buffer.extend(frame.samples)
     
-    def _check_vad(self, audio_data: bytes) -> bool:
+    def _check_vad(self, frame: AudioFrame) -> bool:
         """
         Check if audio contains speech using VAD.
         
         Args:
-            audio_data: Audio data to check
+            frame: 16 kHz mono audio to check
             
         Returns:
             True if speech detected, False otherwise
@@ -291,11 +286,13 @@ class WakeWordDetector:
             frame_duration_ms = 20
             frame_size = int(16000 * frame_duration_ms / 1000) * 2  # 2 bytes per sample
             
+            # WebRTC VAD consumes bytes
+            audio_data = frame.to_bytes()
+            
             # Process in frames
             has_speech = False
             for i in range(0, len(audio_data) - frame_size + 1, frame_size):
-                frame = audio_data[i:i + frame_size]
-                if self.vad.is_speech(frame, 16000):
+                if self.vad.is_speech(audio_data[i:i + frame_size], 16000):
                     has_speech = True
                     break
             
@@ -305,12 +302,12 @@ class WakeWordDetector:
             self.logger.warning(f"VAD check failed: {e}")
             return True  # Default to processing if VAD fails
     
-    def _get_predictions(self, audio_data: bytes) -> Dict[str, float]:
+    def _get_predictions(self, frame: AudioFrame) -> Dict[str, float]:
         """
         Get wake word predictions from the model.
         
         Args:
-            audio_data: Audio data to process
+            frame: 16 kHz mono audio to process
             
         Returns:
             Dictionary of wake word predictions {word: confidence}
@@ -319,13 +316,8 @@ class WakeWordDetector:
             if self.model is None:
                 return {}
             
-            # Prepare audio for model
-            # openWakeWord expects float32 audio normalized to [-1, 1]
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            audio_float = audio_array.astype(np.float32) / 32768.0
-            
-            # Get predictions
-            predictions = self.model.predict(audio_float)
+            # openWakeWord takes 16-bit PCM samples as-is
+            predictions = self.model.predict(frame.samples)
             
             return predictions
             
@@ -446,15 +438,18 @@ class WakeWordDetector:
             
             # Load audio file
             with wave.open(audio_file, 'rb') as wav_file:
-                frames = wav_file.readframes(wav_file.getnframes())
+                recording = AudioFrame.from_bytes(
+                    wav_file.readframes(wav_file.getnframes()),
+                    wav_file.getframerate(),
+                    wav_file.getnchannels()
+                )
             
             # Process in chunks
-            chunk_size = 1024 * 2  # 1024 samples * 2 bytes
+            chunk_size = 1024  # samples
             detected = False
             
-            for i in range(0, len(frames), chunk_size):
-                chunk = frames[i:i + chunk_size]
-                if await self.detect(chunk):
+            for i in range(0, len(recording), chunk_size):
+                if await self.detect(recording.slice(i, i + chunk_size)):
                     detected = True
                     break
             